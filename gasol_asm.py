@@ -2,31 +2,152 @@
 
 import argparse
 import collections
+import glob
+import importlib.util
 import json
+import multiprocessing
 import os
 import sys
 import shutil
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.dirname(os.path.realpath(__file__))+"/smt_encoding")
 sys.path.append(os.path.dirname(os.path.realpath(__file__))+"/sfs_generator/")
 sys.path.append(os.path.dirname(os.path.realpath(__file__))+"/solution_generation")
 sys.path.append(os.path.dirname(os.path.realpath(__file__))+"/verification")
 
-from parser_asm import parse_asm
-import ir_block
-from gasol_optimization import get_sfs_dict
-from gasol_encoder import execute_syrup_backend, generate_theta_dict_from_sequence, execute_syrup_backend_combined
+from parser_asm import parse_asm, parse_asm_incrementally
+from gasol_optimization import SFSBuilder
+from gasol_encoder import execute_syrup_backend, execute_syrup_backend_combined, \
+    execute_syrup_backend_z3
+from default_encoding import infer_gas_lower_bound, infer_size_relation, infer_length_upper_bound, \
+    extract_sfs_features
 from solver_output_generation import obtain_solver_output
-from disasm_generation import generate_info_from_solution, generate_disasm_sol_from_output, \
-    read_initial_dicts_from_files, generate_sub_block_asm_representation_from_log, obtain_log_representation_from_solution,\
-    generate_sub_block_asm_representation_from_output
-from solver_solution_verify import check_solver_output_is_correct, generate_solution_dict
+from disasm_generation import generate_info_from_sequence, generate_disasm_sol_from_log, \
+    generate_sub_block_asm_representation_from_log
+from solver_solution_verify import SolverResult, parse_solver_output, generate_solution_dict, set_optimality
 from global_params.paths import *
+from global_params import profiler
 from utils import isYulInstruction, compute_stack_size
-from copy import deepcopy
-from rebuild_asm import rebuild_asm
-from verification.sfs_verify import verify_block_from_list_of_sfs
-from sfs_generator.utils import compute_number_of_instructions_in_asm_json_per_file
+from opcodes import get_opcode
+from rebuild_asm import rebuild_asm, write_asm_incrementally
+from verification.sfs_verify import verify_block_from_list_of_sfs, have_same_terms, are_equals
+from sfs_generator.utils import compute_number_of_instructions_in_asm_contract
+from solution_cache import SolutionCache
+from solver_pool import SolverPool
+from batch_results import BatchResults
+from greedy_scheduler import generate_greedy_solution
+from solver_portfolio import solve_with_portfolio, store_portfolio_winner
+from block_predictor import BlockPredictor, train_block_predictor
+from block_context import sfs_block_context
+
+# Cache that stores the solutions found for each sub block. None if the cache is disabled
+solution_cache = None
+
+# Sub blocks that have not been sent to the solver because their gas lower bound is not smaller than their current
+# cost, and the solver time that would have been assigned to them
+lower_bound_stats = {'skipped_sub_blocks': 0, 'saved_time': 0}
+
+# Sub blocks that have not been sent to the solver because the block predictor considers they cannot be improved,
+# and the solver time saved by them and by the timeouts given by the predictor
+predictor_stats = {'skipped_sub_blocks': 0, 'saved_time': 0}
+
+# Sub blocks of the output of a previous execution (see load_baseline), or None if there is no baseline. Their
+# solutions are reused for the sub blocks that have not changed since then
+baseline_sub_blocks = None
+
+# Sub blocks whose solution has been reused from the baseline, and reused solutions that could not be verified
+baseline_stats = {'reused_sub_blocks': 0, 'rejected_solutions': 0}
+
+# Options that determine how each sub block is optimized. As sub blocks can be optimized by the workers of
+# a process pool, they are passed to each worker when it is created (see set_optimization_options).
+# - artifacts: intermediate files stored in gasol_path. With "none", no file is stored. With "debug", the
+#   encodings and the theta maps are stored in smt_encoding_path instead of being passed to the solver
+#   directly. With "all", the rbr, the input json and the disasm of each block are stored as well
+# - solver_pool: number of long-lived solver processes used by each process. If 0, a new solver process
+#   is executed for each sub block
+# - iterative_deepening: solve each sub block several times, increasing the maximum length of the sequence
+#   (see solve_sub_block_with_iterative_deepening)
+# - backend: with "smtlib", the encoding is written as a SMT-LIB script and passed to a solver process. With
+#   "z3-api", the constraints are built and solved using the z3 Python API instead (see execute_syrup_backend_z3)
+# - symmetry_breaking: add the constraints that forbid sequences with a cheaper equivalent one (see
+#   forbid_redundant_stack_patterns and order_independent_instructions)
+# - greedy: bound the gas cost of the solutions by the one found by the greedy scheduler, which is returned instead
+#   if the solver does not find a cheaper one (see greedy_sub_block_solution)
+# - portfolio: configurations of the solvers that are run at the same time on each sub block, as tuples (name, solver,
+#   encoding flags). If empty, only OMS is run (see solve_sub_block_with_portfolio)
+# - predictor: BlockPredictor that decides the timeout and the encoding flags of each sub block, and which sub blocks
+#   are not solved. None if the timeout is the same for every sub block and the default flags are used
+# - profile: directory where the profiler stores the phases measured by each process and the context shared by all
+#   of them (see profiler.enable), as a tuple. None if profiling is disabled
+optimization_options = {'artifacts': 'none', 'solver_pool': 0, 'iterative_deepening': False, 'backend': 'smtlib',
+                        'symmetry_breaking': False, 'greedy': False, 'portfolio': [], 'predictor': None,
+                        'profile': None}
+
+# Solvers and encoding flags that can appear in the configurations of the portfolio
+portfolio_solvers = ["oms", "z3", "barcelogic"]
+portfolio_encoding_flags = ["at-most", "pushed-at-least", "instruction-order", "no-output-before-pop",
+                            "inequality-gas-model", "default-encoding", "symmetry-breaking"]
+
+# Pool of solver processes of the current process, created the first time it is needed. Workers from the
+# process pool start with no solver pool, so each of them creates its own one
+solver_pool = None
+
+
+def set_optimization_options(options):
+    optimization_options.update(options)
+    if optimization_options['profile'] is not None:
+        profiler.enable(*optimization_options['profile'])
+
+
+# Sets the contract and the block that are being optimized, so that the phases measured by the profiler are
+# attributed to them
+def set_profiler_block(contract_name, block):
+    profiler.set_context(contract=contract_name, block=("initial_block" if block.get_is_init_block() else "block") +
+                         str(block.getBlockId()))
+
+
+# Flags of the encoding of the sub block that replace the default ones, according to the optimization options
+def encoding_flags(sfs_block):
+    flags = {'symmetry-breaking': optimization_options['symmetry_breaking']}
+    if optimization_options['predictor'] is not None:
+        flags.update(optimization_options['predictor'].predict_encoding_flags(sfs_block))
+        flags['symmetry-breaking'] = flags['symmetry-breaking'] or optimization_options['symmetry_breaking']
+    return flags
+
+
+# Given a comma separated list of configurations of the portfolio, each of them a solver followed by the encoding
+# flags that are enabled for it separated by "+" (e.g. "oms,z3,oms+symmetry-breaking"), returns the configurations
+# as tuples (name, solver, encoding flags). Raises ValueError if any of them is not valid.
+def parse_portfolio(portfolio):
+    configurations = []
+    for config_name in portfolio.split(","):
+        solver, *flags = config_name.split("+")
+        if solver not in portfolio_solvers or any(flag not in portfolio_encoding_flags for flag in flags):
+            raise ValueError("Invalid portfolio configuration: " + config_name)
+        configurations.append((config_name, solver, {flag: True for flag in flags}))
+    return configurations
+
+
+# Returns the solution found by the greedy scheduler for the sub block and its cost if the greedy option is enabled
+# and it is cheaper than the current cost of the sub block. Otherwise, returns (None, None)
+def greedy_sub_block_solution(sfs_block):
+    if not optimization_options['greedy']:
+        return None, None
+
+    solution, cost = generate_greedy_solution(sfs_block)
+    if solution is None or cost >= sfs_block['current_cost']:
+        return None, None
+    return solution, cost
+
+
+def get_solver_pool():
+    global solver_pool
+    if solver_pool is None:
+        solver_pool = SolverPool("oms", optimization_options['solver_pool'])
+    return solver_pool
 
 def clean_dir():
     ext = ["rbr", "csv", "sol", "bl", "disasm", "json"]
@@ -96,42 +217,428 @@ def compute_original_sfs_with_simplifications(instructions, stack_size, cname, b
     else:
         prefix = ""
 
-    exit_code = ir_block.evm2rbr_compiler(contract_name=cname, block=block_data, block_id=block_id,
-                                          preffix=prefix, simplification=True)
-
-    sfs_dict = get_sfs_dict()
+    sfs_builder = SFSBuilder(store_files=optimization_options['artifacts'] == 'all')
+    sfs_dict = sfs_builder.evm2rbr_compiler(contract_name=cname, block=block_data, block_id=block_id,
+                                            preffix=prefix, simplification=True)
 
     return sfs_dict
 
 
-# Given the sequence of bytecodes, the initial stack size, the contract name and the
-# block id, returns the output given by the solver, the name given to that block and current gas associated
-# to that sequence.
-def optimize_block(sfs_dict, timeout):
+# Given the sfs of a sub block and the sequence of instructions that has been found for it (following the format
+# of the log file), returns the tuple that represents the solution of the sub block: the sequence (None if the solver
+# could not find a solution), the name given to that block and the current gas and size associated to that sub block.
+def generate_sub_block_solution(block_name, sfs_block, solution):
+    return solution, block_name, sfs_block['current_cost'], sfs_block['max_progr_len'], sfs_block['user_instrs']
+
+
+# Generates the encoding of a sub block, whose cost is bounded by gas_upper_bound if it is not None (see
+# greedy_sub_block_solution). Returns the encoding as a string, or None if it has been stored in encoding_dir
+# instead (see artifacts option)
+def generate_sub_block_encoding(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir=smt_encoding_path):
+    return execute_syrup_backend(None, sfs_block, block_name=block_name, timeout=timeout,
+                                 encoding_dir=encoding_dir, in_memory=optimization_options['artifacts'] == 'none',
+                                 encoding_flags=encoding_flags(sfs_block),
+                                 gas_upper_bound=gas_upper_bound,
+                                 block_context=sfs_block_context(sfs_block))
+
+
+# Returns the solution of the sub block from the result given by the solver (see SolverResult), or the greedy one if
+# it is cheaper (e.g. the solver has reached the timeout without finding any solution). greedy is the pair returned
+# by greedy_sub_block_solution
+def generate_sub_block_solution_from_output(block_name, sfs_block, solver_result, greedy):
+    solution = generate_solution_dict(solver_result) if solver_result.is_correct() else None
+
+    greedy_solution, greedy_cost = greedy
+    if greedy_solution is not None and (solution is None or solution_cost(sfs_block, solution) > greedy_cost):
+        solution = greedy_solution
+
+    return generate_sub_block_solution(block_name, sfs_block, solution)
+
+
+# Same as generate_sub_block_encoding, but the encoding is always returned as a string
+def load_sub_block_encoding(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir=smt_encoding_path):
+    encoding = generate_sub_block_encoding(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir)
+
+    if encoding is None:
+        with open(encoding_dir + block_name + "_oms.smt2") as f:
+            encoding = f.read()
+
+    return encoding
+
+
+# Given the sfs of a sub block and its name, generates the encoding and returns the result given by the solver (see
+# SolverResult), either from a new solver process or from the solver pool. The encoding is stored in encoding_dir,
+# and the cost of the sequence is bounded by gas_upper_bound if it is not None.
+def solve_sub_block(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir=smt_encoding_path):
+    if optimization_options['iterative_deepening']:
+        return solve_sub_block_with_iterative_deepening(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir)
+
+    start = time.time()
+    solver_result = solve_sub_block_with_max_length(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir)
+    return set_optimality(solver_result, time.time() - start, timeout)
+
+
+# Same as solve_sub_block, but the number of instructions of the sequence is bounded by the field init_progr_len
+# of the sfs
+def solve_sub_block_with_max_length(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir=smt_encoding_path):
+    if optimization_options['backend'] == 'z3-api':
+        print("Executing z3 (Python API) for file " + block_name)
+        with profiler.phase("encoding", sub_block=block_name):
+            z3_encoding = execute_syrup_backend_z3(sfs_block, block_name, timeout, encoding_flags(sfs_block),
+                                                   gas_upper_bound, sfs_block_context(sfs_block))
+        with profiler.phase("solver", sub_block=block_name):
+            return z3_encoding.solve()
+
+    if optimization_options['portfolio']:
+        return solve_sub_block_with_portfolio(block_name, sfs_block, timeout, gas_upper_bound)
+
+    if optimization_options['solver_pool'] > 0:
+        with profiler.phase("encoding", sub_block=block_name):
+            encoding = load_sub_block_encoding(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir)
+        with profiler.phase("solver", sub_block=block_name):
+            solver_output = get_solver_pool().solve(block_name, encoding, timeout)
+    else:
+        with profiler.phase("encoding", sub_block=block_name):
+            encoding = generate_sub_block_encoding(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir)
+        with profiler.phase("solver", sub_block=block_name):
+            solver_output = obtain_solver_output(block_name, "oms", timeout, encoding_dir, encoding)
+
+    with profiler.phase("output_parsing", sub_block=block_name):
+        return parse_solver_output(solver_output)
+
+
+# Same as solve_sub_block_with_max_length, but the sub block is solved by the configurations of the portfolio at the
+# same time (see solve_with_portfolio). Their encodings are always generated in memory. The configuration that
+# won is stored in portfolio_winners_file, along with some features of the sub block.
+def solve_sub_block_with_portfolio(block_name, sfs_block, timeout, gas_upper_bound):
+    queries = []
+    with profiler.phase("encoding", sub_block=block_name):
+        for config_name, solver, flags in optimization_options['portfolio']:
+            encoding = execute_syrup_backend(None, sfs_block, block_name=block_name, timeout=timeout, in_memory=True,
+                                             encoding_flags=dict(encoding_flags(sfs_block), **flags),
+                                             gas_upper_bound=gas_upper_bound, solver=solver,
+                                             block_context=sfs_block_context(sfs_block))
+            queries.append((config_name, solver, encoding))
+
+    start = time.time()
+    with profiler.phase("solver", sub_block=block_name):
+        winner, solver_result = solve_with_portfolio(block_name, queries, timeout, lambda result: solution_cost(
+            sfs_block, generate_solution_dict(result)))
+
+    store_portfolio_winner(portfolio_winners_file, [block_name] + extract_sfs_features(sfs_block) +
+                           [winner if winner is not None else "none", solver_result.status,
+                            round(time.time() - start, 3)])
+    return solver_result
+
+
+# Solves the sub block bounding the length of the sequence, starting from the lower bound given by
+# infer_size_relation. If the solver proves there is no sequence with that length (unsat) or reaches the timeout,
+# the bound is increased. If it finds an optimal sequence for the current bound, cheaper sequences can only be longer,
+# so the bound is set to the maximum length of a sequence cheaper than the one found (see infer_length_upper_bound).
+# The bound never exceeds init_progr_len, and the timeout is shared by all the iterations. Returns the result of
+# the solver for the cheapest sequence found, or the last result if none has been found. The result is optimal if
+# no longer sequence can be cheaper, or if the solver found the optimal one for init_progr_len.
+def solve_sub_block_with_iterative_deepening(block_name, sfs_block, timeout, gas_upper_bound,
+                                             encoding_dir=smt_encoding_path):
+    user_instrs = sfs_block['user_instrs']
+    max_length = sfs_block['init_progr_len']
+    # Built before copying the sfs for each length, so that all the iterations share it
+    sfs_block_context(sfs_block)
+    length = min(infer_size_relation(sfs_block['src_ws'], sfs_block['tgt_ws'], user_instrs)[0], max_length)
+
+    length_bound = infer_length_upper_bound(sfs_block['current_cost'], user_instrs)
+    if length_bound is not None:
+        max_length = max(length, min(max_length, length_bound))
+
+    deadline = time.time() + timeout
+    solver_result, best_result, best_cost = SolverResult(), None, None
+    is_proven_optimal = False
+
+    while True:
+        # Solver timeouts are given in seconds, and rounded down so that the deadline is not exceeded
+        remaining_time = int(deadline - time.time())
+        if remaining_time < 1:
+            break
+
+        start = time.time()
+        solver_result = solve_sub_block_with_max_length(block_name, dict(sfs_block, init_progr_len=length),
+                                                        remaining_time, gas_upper_bound, encoding_dir)
+        is_optimal = time.time() - start < remaining_time
+
+        if solver_result.is_correct():
+            _, cost = generate_optimized_sequence_from_solution(sfs_block, generate_solution_dict(solver_result))
+            if best_result is None or cost < best_cost:
+                best_result, best_cost = solver_result, cost
+        else:
+            is_optimal = False
+
+        if length >= max_length:
+            is_proven_optimal = is_optimal
+            break
+
+        if is_optimal:
+            length_bound = infer_length_upper_bound(best_cost, user_instrs)
+            next_length = max_length if length_bound is None else min(max_length, length_bound)
+            # No sequence longer than the current one can be cheaper
+            if next_length <= length:
+                is_proven_optimal = True
+                break
+            length = next_length
+        else:
+            length = min(max_length, length + max(1, length // 2))
+
+    if best_result is None:
+        return solver_result
+
+    best_result.optimal = is_proven_optimal
+    return best_result
+
+
+# Given the sfs of a sub block and its name, generates the encoding and returns the solution of the sub block
+# from the output given by the solver. The encoding is stored in encoding_dir.
+def optimize_sub_block(block_name, sfs_block, timeout, encoding_dir=smt_encoding_path):
+    return optimize_sub_block_with_optimality(block_name, sfs_block, timeout, encoding_dir)[0]
+
+
+# Same as optimize_sub_block, but also returns whether the solution is known to be optimal (see set_optimality)
+def optimize_sub_block_with_optimality(block_name, sfs_block, timeout, encoding_dir=smt_encoding_path):
+    greedy = greedy_sub_block_solution(sfs_block)
+    solver_result = solve_sub_block(block_name, sfs_block, timeout, greedy[1], encoding_dir)
+    return generate_sub_block_solution_from_output(block_name, sfs_block, solver_result, greedy), solver_result.optimal
+
+
+# Same as optimize_sub_block_with_optimality, but the sub blocks are sent to the solver processes of the solver pool,
+# which solve them concurrently. Encodings are generated beforehand, as the encoder relies on global state.
+def optimize_sub_blocks_with_solver_pool(tasks, encoding_dir=smt_encoding_path):
+    greedy_solutions = [greedy_sub_block_solution(sfs_block) for _, sfs_block, _ in tasks]
+
+    with profiler.phase("encoding"):
+        queries = [(block_name, load_sub_block_encoding(block_name, sfs_block, timeout, greedy[1], encoding_dir),
+                    timeout) for (block_name, sfs_block, timeout), greedy in zip(tasks, greedy_solutions)]
+
+    with profiler.phase("solver"):
+        solver_outputs = get_solver_pool().solve_all(queries)
+
+    with profiler.phase("output_parsing"):
+        solver_results = [set_optimality(parse_solver_output(solver_output), solve_time, timeout)
+                          for (solver_output, solve_time), (_, _, timeout) in zip(solver_outputs, tasks)]
+    return [(generate_sub_block_solution_from_output(block_name, sfs_block, solver_result, greedy),
+             solver_result.optimal)
+            for (block_name, sfs_block, _), solver_result, greedy in zip(tasks, solver_results, greedy_solutions)]
+
+
+# Same as optimize_sub_block_with_optimality, but meant to be executed by a worker from the process pool. Each worker
+# uses its own directory for the encodings, as sub blocks from different contracts may share the same name.
+def optimize_sub_block_in_worker(task):
+    block_name, sfs_block, timeout = task
+    return optimize_sub_block_with_optimality(block_name, sfs_block, timeout, worker_encoding_dir())
+
+
+def worker_encoding_dir():
+    return smt_encoding_path + "worker_" + str(os.getpid()) + "/"
+
+
+# A sub block cannot be improved if its gas lower bound is not smaller than its current cost
+def sub_block_reaches_lower_bound(sfs_block):
+    return infer_gas_lower_bound(sfs_block['src_ws'], sfs_block['tgt_ws'],
+                                 sfs_block['user_instrs']) >= sfs_block['current_cost']
 
-    block_solutions = []
-    # SFS dict of syrup contract contains all sub-blocks derived from a block after splitting
-    for block_name in sfs_dict:
-        sfs_block = sfs_dict[block_name]
 
-        current_cost = sfs_block['current_cost']
-        current_size = sfs_block['max_progr_len']
-        user_instr = sfs_block['user_instrs']
+# Given a list of sub blocks, represented as tuples (block_name, sfs_block, timeout), returns their solutions
+# in the same order. Sub blocks that cannot be improved according to their gas lower bound are not solved, and
+# neither are those whose optimal solution is already stored in the solution cache. Non-optimal solutions from the
+# cache are only kept if the solver does not find a cheaper one. If the block predictor is enabled, it
+# decides the timeout of the remaining ones and skips those that it considers cannot be improved, which keep the
+# greedy solution if there is one.
+# If jobs > 1, the remaining sub blocks are solved using a pool of processes.
+# If the solver pool is enabled and jobs = 1, they are solved concurrently by the solver processes instead.
+# If a budget is given, the timeout of each sub block is decided by optimize_sub_blocks_with_budget.
+def optimize_sub_blocks(tasks, jobs=1, budget=None):
+    tasks = list(tasks)
+    block_solutions = [None] * len(tasks)
+    pending_positions = []
+    cached_solutions = {}
 
-        execute_syrup_backend(None, sfs_block, block_name=block_name, timeout=timeout)
+    for position, (block_name, sfs_block, timeout) in enumerate(tasks):
+        if sub_block_reaches_lower_bound(sfs_block):
+            lower_bound_stats['skipped_sub_blocks'] += 1
+            lower_bound_stats['saved_time'] += timeout
+            block_solutions[position] = generate_sub_block_solution(block_name, sfs_block, None)
+            continue
+
+        cached_solution, is_optimal = solution_cache.get_solution(sfs_block) if solution_cache is not None \
+            else (None, False)
+
+        if is_optimal:
+            block_solutions[position] = generate_sub_block_solution(block_name, sfs_block, cached_solution)
+            continue
+
+        if cached_solution is not None:
+            cached_solutions[position] = cached_solution
+
+        if optimization_options['predictor'] is not None:
+            predicted_timeout = optimization_options['predictor'].predict_timeout(sfs_block, timeout)
+            if predicted_timeout is None:
+                predictor_stats['skipped_sub_blocks'] += 1
+                predictor_stats['saved_time'] += timeout
+                block_solutions[position] = generate_sub_block_solution_from_output(
+                    block_name, sfs_block, SolverResult(), greedy_sub_block_solution(sfs_block))
+                continue
+
+            predictor_stats['saved_time'] += timeout - predicted_timeout
+            tasks[position] = (block_name, sfs_block, predicted_timeout)
+
+        pending_positions.append(position)
+
+    pending_tasks = [tasks[position] for position in pending_positions]
+
+    if budget is not None:
+        solutions = optimize_sub_blocks_with_budget(pending_tasks, budget, jobs)
+    elif jobs > 1:
+        with multiprocessing.Pool(jobs, initializer=set_optimization_options,
+                                  initargs=(optimization_options,)) as pool:
+            # Chunksize is set to 1, as solving times of sub blocks are really uneven
+            solutions = pool.map(optimize_sub_block_in_worker, pending_tasks, chunksize=1)
+    elif optimization_options['solver_pool'] > 0 and optimization_options['backend'] == 'smtlib' \
+            and not optimization_options['iterative_deepening'] and not optimization_options['portfolio']:
+        solutions = optimize_sub_blocks_with_solver_pool(pending_tasks)
+    else:
+        solutions = [optimize_sub_block_with_optimality(block_name, sfs_block, timeout)
+                     for block_name, sfs_block, timeout in pending_tasks]
+
+    for position, (solution, is_optimal) in zip(pending_positions, solutions):
+        block_solutions[position] = solution
+        sfs_block = tasks[position][1]
+
+        # Non-optimal solutions only replace the one in the cache if they are cheaper
+        if solution_cache is not None and solution[0] is not None and \
+                (is_optimal or position not in cached_solutions or
+                 solution_cost(sfs_block, solution[0]) < solution_cost(sfs_block, cached_solutions[position])):
+            solution_cache.store_solution(sfs_block, solution[0], is_optimal)
 
-        # At this point, solution is a string that contains the output directly
-        # from the solver
-        solver_output = obtain_solver_output(block_name, "oms", timeout)
-        block_solutions.append((solver_output, block_name, current_cost, current_size, user_instr))
+    for position, cached_solution in cached_solutions.items():
+        block_name, sfs_block, _ = tasks[position]
+        if solution_cost(sfs_block, cached_solution) < solution_cost(sfs_block, block_solutions[position][0]):
+            block_solutions[position] = generate_sub_block_solution(block_name, sfs_block, cached_solution)
 
     return block_solutions
 
 
+# Same as optimize_sub_block_with_optimality, but also returns the time spent solving the sub block
+def optimize_sub_block_with_time(block_name, sfs_block, timeout, encoding_dir=smt_encoding_path):
+    start = time.time()
+    solution, is_optimal = optimize_sub_block_with_optimality(block_name, sfs_block, timeout, encoding_dir)
+    return solution, is_optimal, time.time() - start
+
+
+# Same as optimize_sub_block_with_time, but the timeout is reduced so that the solver stops at the deadline (given as
+# a timestamp). Returns None if the deadline is reached before the sub block is solved
+def optimize_sub_block_before_deadline(block_name, sfs_block, timeout, deadline, encoding_dir=smt_encoding_path):
+    # Solver timeouts are given in seconds
+    remaining_time = int(deadline - time.time())
+    if remaining_time < 1:
+        return None
+    return optimize_sub_block_with_time(block_name, sfs_block, min(timeout, remaining_time), encoding_dir)
+
+
+def optimize_sub_block_before_deadline_in_worker(task):
+    block_name, sfs_block, timeout, deadline = task
+    return optimize_sub_block_before_deadline(block_name, sfs_block, timeout, deadline, worker_encoding_dir())
+
+
+# Returns the gas cost of the solution of a sub block, or its current cost if there is no solution
+def solution_cost(sfs_block, solution):
+    if solution is None:
+        return sfs_block['current_cost']
+    return generate_optimized_sequence_from_solution(sfs_block, solution)[1]
+
+
+# Anytime scheduler that solves the given sub blocks within budget seconds (wall-clock time). Every sub block is
+# first solved with a short timeout, so that half the budget is enough for all of them (but no longer than the
+# timeout of the task). Then, sub blocks that reached the timeout are solved again, ranked by the gas that could
+# still be saved according to their gas lower bound. The remaining budget is split among them, and each round
+# at least doubles the previous timeout. Only the best solution found for each sub block is kept. Sub blocks are not
+# sent to the solver once the budget is over, even in the first round, and those that were never solved keep the
+# greedy solution if there is one. Returns the solutions in the same order as the tasks, along with whether they
+# are known to be optimal.
+def optimize_sub_blocks_with_budget(tasks, budget, jobs=1):
+    start = time.time()
+    deadline = start + budget
+    best_solutions = [None] * len(tasks)
+    if not tasks:
+        return best_solutions
+
+    lower_bounds = [infer_gas_lower_bound(sfs_block['src_ws'], sfs_block['tgt_ws'], sfs_block['user_instrs'])
+                    for _, sfs_block, _ in tasks]
+    best_costs = [sfs_block['current_cost'] for _, sfs_block, _ in tasks]
+    best_are_optimal = [False] * len(tasks)
+
+    pool = multiprocessing.Pool(jobs, initializer=set_optimization_options,
+                                initargs=(optimization_options,)) if jobs > 1 else None
+
+    positions = list(range(len(tasks)))
+    round_timeout = max(1, min(min(timeout for _, _, timeout in tasks), int(budget * jobs / (2 * len(tasks)))))
+
+    try:
+        while positions:
+            round_tasks = [(tasks[position][0], tasks[position][1], round_timeout, deadline) for position in positions]
+
+            if pool is not None:
+                # Chunksize is set to 1, as solving times of sub blocks are really uneven
+                results = pool.map(optimize_sub_block_before_deadline_in_worker, round_tasks, chunksize=1)
+            else:
+                results = [optimize_sub_block_before_deadline(*task) for task in round_tasks]
+
+            timed_out_positions = []
+            for position, result in zip(positions, results):
+                # The budget was over before solving the sub block
+                if result is None:
+                    continue
+
+                sub_block_solution, is_optimal, solve_time = result
+                solution = sub_block_solution[0]
+                cost = solution_cost(tasks[position][1], solution)
+
+                if solution is not None and (best_solutions[position] is None or cost < best_costs[position]):
+                    best_solutions[position] = sub_block_solution
+                    best_costs[position] = cost
+                    best_are_optimal[position] = is_optimal
+
+                if solve_time >= round_timeout and best_costs[position] > lower_bounds[position]:
+                    timed_out_positions.append(position)
+
+            # Remaining solver time, taking into account that jobs sub blocks are solved at the same time
+            remaining_time = (budget - (time.time() - start)) * jobs
+            if not timed_out_positions or remaining_time < 2 * round_timeout:
+                break
+
+            timed_out_positions.sort(key=lambda position: best_costs[position] - lower_bounds[position],
+                                     reverse=True)
+            round_timeout = max(2 * round_timeout, int(remaining_time / len(timed_out_positions)))
+            positions = timed_out_positions[:int(remaining_time // round_timeout)]
+            print("Solving " + str(len(positions)) + " sub blocks again with timeout " + str(round_timeout) + "s")
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    return [(sub_block_solution if sub_block_solution is not None
+             else generate_sub_block_solution_from_output(block_name, sfs_block, SolverResult(),
+                                                          greedy_sub_block_solution(sfs_block)), is_optimal)
+            for sub_block_solution, is_optimal, (block_name, sfs_block, _) in zip(best_solutions, best_are_optimal,
+                                                                                  tasks)]
+
+
+# Given the sfs dict of a block, returns the solution of each sub-block (see generate_sub_block_solution).
+def optimize_block(sfs_dict, timeout):
+    # SFS dict of syrup contract contains all sub-blocks derived from a block after splitting
+    return optimize_sub_blocks([(block_name, sfs_dict[block_name], timeout) for block_name in sfs_dict])
+
+
 # Given the log file loaded in json format, current block and the contract name, generates three dicts: one that
 # contains the sfs from each block, the second one contains the sequence of instructions and
 # the third one is a set that contains all block ids.
 def generate_sfs_dicts_from_log(block, contract_name, json_log):
+    set_profiler_block(contract_name, block)
     bytecodes = block.getInstructions()
     stack_size = block.getSourceStack()
     block_id = block.getBlockId()
@@ -174,20 +681,43 @@ def generate_sfs_dicts_from_log(block, contract_name, json_log):
     return sfs_final, instr_sequence_dict, ids
 
 
-# Verify information derived from log file is correct
-def check_log_file_is_correct(sfs_dict, instr_sequence_dict):
-    execute_syrup_backend_combined(sfs_dict, instr_sequence_dict, "verify", "oms")
+# Returns the block a sub block from the log file belongs to, i.e. its log id without the index of the sub block
+def log_block_id(log_id):
+    return log_id.rsplit(".", 1)[0]
+
+
+# Verifies the information derived from the log file, returning whether the sub blocks of each block (see
+# log_block_id) are correct. The sub blocks of each block are checked in an independent query, so that the
+# queries can be solved by jobs solver processes at the same time. Encodings are generated beforehand, as the
+# encoder relies on global state.
+def check_log_file_by_block(sfs_dict, instr_sequence_dict, jobs=1):
+    block_sfs_dicts = collections.OrderedDict()
+    for log_id in sfs_dict:
+        block_sfs_dicts.setdefault(log_block_id(log_id), {})[log_id] = sfs_dict[log_id]
 
-    solver_output = obtain_solver_output("verify", "oms", 0)
+    queries = []
+    for block_id, block_sfs_dict in block_sfs_dicts.items():
+        encoding = execute_syrup_backend_combined(block_sfs_dict, instr_sequence_dict, "verify_" + block_id, "oms",
+                                                  in_memory=optimization_options['artifacts'] == 'none')
+        queries.append(("verify_" + block_id, encoding))
 
-    return check_solver_output_is_correct(solver_output)
+    with ThreadPoolExecutor(max(jobs, 1)) as executor:
+        solver_outputs = executor.map(lambda query: obtain_solver_output(query[0], "oms", 0, encoding=query[1]),
+                                      queries)
+        return collections.OrderedDict((block_id, parse_solver_output(solver_output).is_correct())
+                                       for block_id, solver_output in zip(block_sfs_dicts, solver_outputs))
+
+
+# Verify information derived from log file is correct. As the sub blocks of different blocks share no variables,
+# checking them all together is the same as checking each block (see check_log_file_by_block)
+def check_log_file_is_correct(sfs_dict, instr_sequence_dict, jobs=1):
+    return all(check_log_file_by_block(sfs_dict, instr_sequence_dict, jobs).values())
 
 
 
 # Given a dict with the sfs from each block and another dict that contains whether previous block was optimized or not,
 # generates the corresponding solution. All checks are assumed to have been done previously
 def optimize_asm_block_from_log(block, sfs_dict, instr_sequence_dict):
-    new_block = deepcopy(block)
     optimized_blocks = {}
     is_init_block = block.get_is_init_block()
     block_id = block.getBlockId()
@@ -211,12 +741,9 @@ def optimize_asm_block_from_log(block, sfs_dict, instr_sequence_dict):
 
         sfs_block = sfs_dict[block_id]
 
-        user_instr = sfs_block['user_instrs']
-
-        bs = sfs_block['max_sk_sz']
         instr_sequence = instr_sequence_dict[block_id]
         _, instruction_theta_dict, opcodes_theta_dict, gas_theta_dict, values_dict = \
-            generate_theta_dict_from_sequence(bs, user_instr)
+            sfs_block_context(sfs_block).theta_maps()
 
         asm_sub_block = generate_sub_block_asm_representation_from_log(instr_sequence, opcodes_theta_dict,
                                                                        instruction_theta_dict, gas_theta_dict, values_dict)
@@ -225,13 +752,18 @@ def optimize_asm_block_from_log(block, sfs_dict, instr_sequence_dict):
     asm_sub_blocks = list(filter(lambda x: isinstance(x, list), block.split_in_sub_blocks()))
     optimized_blocks_list = [None if i not in optimized_blocks else optimized_blocks[i] for i in range(len(asm_sub_blocks))]
 
+    if all(optimized_block is None for optimized_block in optimized_blocks_list):
+        return block
+
+    new_block = block.copy()
     new_block.set_instructions_from_sub_blocks(optimized_blocks_list)
     new_block.compute_stack_size()
     return new_block
 
 
-def optimize_asm_from_log(file_name, json_log, output_file):
-    asm = parse_asm(file_name)
+def optimize_asm_from_log(file_name, json_log, output_file, jobs=1):
+    with profiler.phase("parse"):
+        asm = parse_asm(file_name)
 
     # Blocks from all contracts are checked together. Thus, we first will obtain the needed
     # information from each block
@@ -246,7 +778,7 @@ def optimize_asm_from_log(file_name, json_log, output_file):
 
     for c in asm.getContracts():
 
-        new_contract = deepcopy(c)
+        new_contract = c.copy()
 
         # If it does not have the asm field, then we skip it, as there are no instructions to optimize
         if not c.has_asm_field():
@@ -293,19 +825,27 @@ def optimize_asm_from_log(file_name, json_log, output_file):
         print("Log file does not match source file")
     else:
         not_empty = {k : v for k,v in sfs_dict.items() if v != []}
-        correct = check_log_file_is_correct(not_empty, instr_sequence_dict)
+        profiler.set_context(contract=None, block=None)
+        with profiler.phase("verification"):
+            block_results = check_log_file_by_block(not_empty, instr_sequence_dict, jobs)
+        for block_id, block_correct in block_results.items():
+            print("Log entries of " + block_id + (" verified correctly" if block_correct
+                                                   else " do not contain a valid solution"))
+
+        correct = all(block_results.values())
         if correct:
             print("Solution generated from log file has been verified correctly")
-            new_asm = deepcopy(asm)
+            new_asm = asm.copy()
             new_asm.set_contracts(contracts)
 
-            with open(output_file, 'w') as f:
+            with profiler.phase("rebuild"), open(output_file, 'w') as f:
                 f.write(json.dumps(rebuild_asm(new_asm)))
         else:
             print("Log file does not contain a valid solution")
 
 
-def optimize_isolated_asm_block(block_name, timeout=10):
+# Given a file that contains an isolated asm block in a single line, returns the list of opcodes of the block
+def parse_isolated_asm_block(block_name):
 
     with open(block_name,"r") as f:        
         instructions = f.readline().strip()
@@ -356,27 +896,44 @@ def optimize_isolated_asm_block(block_name, timeout=10):
 
         i+=1
 
+    return opcodes
+
+
+# Returns the sfs dict of the sub blocks derived from the opcodes of an isolated asm block
+def compute_sfs_dict_from_isolated_asm_block(opcodes, block_name):
     stack_size = compute_stack_size(opcodes)
     contract_name = block_name.split('/')[-1]
 
-    sfs_dict = compute_original_sfs_with_simplifications(opcodes, stack_size, contract_name, 0, False)["syrup_contract"]
-    for solver_output, block_name, current_cost, current_length, user_instr \
+    return compute_original_sfs_with_simplifications(opcodes, stack_size, contract_name, 0, False)["syrup_contract"]
+
+
+# Given a solution of a sub block, returns the optimized sequence in disasm format and its cost
+def generate_optimized_sequence_from_solution(sfs_block, solution):
+    _, instruction_theta_dict, opcodes_theta_dict, gas_theta_dict, values_dict = \
+        sfs_block_context(sfs_block).theta_maps()
+
+    instruction_output, _, pushed_output, optimized_cost = \
+        generate_info_from_sequence(solution, opcodes_theta_dict, instruction_theta_dict,
+                                    gas_theta_dict, values_dict)
+
+    sol = generate_disasm_sol_from_log(solution, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict)
+    return sol, optimized_cost
+
+
+def optimize_isolated_asm_block(block_name, timeout=10):
+    with profiler.phase("parse"):
+        opcodes = parse_isolated_asm_block(block_name)
+    sfs_dict = compute_sfs_dict_from_isolated_asm_block(opcodes, block_name)
+
+    for solution, block_name, current_cost, current_length, user_instr \
         in optimize_block(sfs_dict, timeout):
 
         # We weren't able to find a solution using the solver, so we just update
-        if not check_solver_output_is_correct(solver_output):
+        if solution is None:
             print("The solver has not been able to find a solution for sub block " + block_name)
             continue
 
-        bs = sfs_dict[block_name]['max_sk_sz']
-
-        _, instruction_theta_dict, opcodes_theta_dict, gas_theta_dict, values_dict = generate_theta_dict_from_sequence(bs, user_instr)
-
-        instruction_output, _, pushed_output, optimized_cost = \
-            generate_info_from_solution(solver_output, opcodes_theta_dict, instruction_theta_dict,
-                                        gas_theta_dict, values_dict)
-
-        sol = generate_disasm_sol_from_output(solver_output, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict)
+        sol, optimized_cost = generate_optimized_sequence_from_solution(sfs_dict[block_name], solution)
 
         print("Estimated initial cost: " + str(current_cost))
         print("Initial sequence: " + str(opcodes))
@@ -384,6 +941,90 @@ def optimize_isolated_asm_block(block_name, timeout=10):
         print("Optimized sequence: " +str(sol))
 
 
+# Optimizes each sub block of an isolated asm block and returns a row for the batch results
+# (see BatchResults.store_block) per sub block, along with the status of the block and its error. The solution
+# cache is not used, as the aim is to measure the solver. If the block cannot be optimized (e.g. its sfs cannot be
+# generated or the solver fails), the status of the block is "error", none of its sub blocks is stored and the
+# error is the traceback of the exception.
+def optimize_isolated_asm_block_in_batch(task):
+    block_name, timeout = task
+    file_name = os.path.basename(block_name)
+    encoding_dir = worker_encoding_dir()
+    profiler.set_context(file=block_name)
+
+    try:
+        with profiler.phase("parse"):
+            opcodes = parse_isolated_asm_block(block_name)
+        sfs_dict = compute_sfs_dict_from_isolated_asm_block(opcodes, block_name)
+
+        rows = []
+        for sub_block_name, sfs_block in sfs_dict.items():
+            solve_time = 0
+
+            if sub_block_reaches_lower_bound(sfs_block):
+                status, solution = "lower_bound", None
+            else:
+                start = time.time()
+                solver_result = solve_sub_block(sub_block_name, sfs_block, timeout,
+                                                greedy_sub_block_solution(sfs_block)[1], encoding_dir)
+                solve_time = time.time() - start
+
+                status = solver_result.status
+                solution = generate_solution_dict(solver_result) if solver_result.is_correct() else None
+
+            optimized_cost = None
+            if solution is not None:
+                _, optimized_cost = generate_optimized_sequence_from_solution(sfs_block, solution)
+
+            rows.append((sub_block_name, sfs_block['current_cost'], optimized_cost, solve_time, status,
+                         solve_time >= timeout, extract_sfs_features(sfs_block)))
+    except Exception:
+        return file_name, "error", [], traceback.format_exc()
+
+    return file_name, "done", rows, None
+
+
+# Optimizes all the isolated asm blocks in dir_name and stores the results of each sub block in results_file.
+# Blocks whose results are already stored are skipped, so an interrupted batch is resumed by executing it again.
+# If model_file is given, a block predictor is trained from the results file and the portfolio winners file
+# and stored in it.
+def optimize_isolated_asm_blocks_in_batch(dir_name, results_file, timeout=10, jobs=1, model_file=None):
+    results = BatchResults(results_file)
+    processed_blocks = results.processed_blocks()
+
+    block_names = sorted(glob.glob(os.path.join(dir_name, "*.disasm_blk")))
+    tasks = [(block_name, timeout) for block_name in block_names
+             if os.path.basename(block_name) not in processed_blocks]
+    print("Blocks already processed: " + str(len(block_names) - len(tasks)) + ". Blocks to process: " +
+          str(len(tasks)))
+
+    if jobs > 1:
+        pool = multiprocessing.Pool(jobs, initializer=set_optimization_options, initargs=(optimization_options,))
+        # Chunksize is set to 1, as solving times of blocks are really uneven
+        block_results = pool.imap_unordered(optimize_isolated_asm_block_in_batch, tasks, chunksize=1)
+    else:
+        pool = None
+        block_results = map(optimize_isolated_asm_block_in_batch, tasks)
+
+    try:
+        for file_name, status, rows, error in block_results:
+            if error is not None:
+                print("Error when optimizing " + file_name + ": " + error.strip().splitlines()[-1])
+            results.store_block(file_name, status, rows, error)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    print(results.report())
+    results.close()
+
+    if model_file is not None:
+        predictor = train_block_predictor([results_file], portfolio_winners_file)
+        predictor.save(model_file)
+        print("Block predictor trained from " + str(len(predictor.samples)) + " samples and " +
+              str(len(predictor.winners)) + " portfolio winners, stored in " + model_file)
+
+
 # Due to intra block optimization, we need to be wary of those cases in which the optimized outcome is determined
 # from other blocks. In particular, when a sub block starts with a POP opcode, then it can be optimized iff the
 # previous block has been optimized
@@ -396,10 +1037,10 @@ def filter_optimized_blocks_by_intra_block_optimization(asm_sub_blocks, optimize
     # Traverse from right to left
     for asm_sub_block, optimized_sub_block in zip(reversed(asm_sub_blocks), reversed(optimized_sub_blocks)):
         if asm_sub_block[0].getDisasm() == "POP":
-            current_pop_streak_blocks.append(deepcopy(optimized_sub_block))
+            current_pop_streak_blocks.append(optimized_sub_block)
             previous_block_starts_with_pop = True
         elif previous_block_starts_with_pop:
-            current_pop_streak_blocks.append(deepcopy(optimized_sub_block))
+            current_pop_streak_blocks.append(optimized_sub_block)
 
             # All elements are not None, so the optimization can be applied
             if all(current_pop_streak_blocks):
@@ -413,7 +1054,7 @@ def filter_optimized_blocks_by_intra_block_optimization(asm_sub_blocks, optimize
             previous_block_starts_with_pop = False
             current_pop_streak_blocks = []
         else:
-            final_sub_blocks.append(deepcopy(optimized_sub_block))
+            final_sub_blocks.append(optimized_sub_block)
             previous_block_starts_with_pop = False
 
     # Final check in case first block also starts with a POP instruction
@@ -427,44 +1068,111 @@ def filter_optimized_blocks_by_intra_block_optimization(asm_sub_blocks, optimize
     # Finally, as we were working with reversed list, we reverse the solution to obtain the proper one
     return list(reversed(final_sub_blocks))
 
-# Given an asm_block and its contract name, returns the asm block after the optimization
+# Given an asm_block and its contract name, returns the sfs dict that contains the sfs of each sub block
+def compute_sfs_dict_from_asm_block(block, contract_name):
+    instructions = preprocess_instructions(block.getInstructions())
+
+    return compute_original_sfs_with_simplifications(instructions, block.getSourceStack(), contract_name,
+                                                     block.getBlockId(), block.get_is_init_block())["syrup_contract"]
+
+
+# Given an asm_block and its contract name, returns the asm block after the optimization, the log info and the sfs
+# dict of the block, which is reused to verify the optimized block (see compare_asm_block_asm_format)
 def optimize_asm_block_asm_format(block, contract_name, timeout):
-    bytecodes = block.getInstructions()
-    stack_size = block.getSourceStack()
+    set_profiler_block(contract_name, block)
+    sfs_dict = compute_sfs_dict_from_asm_block(block, contract_name)
+    tasks = [(contract_name, block_name, sfs_dict[block_name], timeout) for block_name in sfs_dict]
+    block_solutions = optimize_sub_blocks_with_baseline(tasks)
+
+    with profiler.phase("rebuild"):
+        new_block, log_dicts = generate_optimized_asm_block(block, contract_name, sfs_dict, block_solutions)
+    return new_block, log_dicts, sfs_dict
+
+
+# Given the asm json generated by a previous execution and its log file loaded in json format, returns the sfs of
+# each sub block of the asm json and the solution of the log for it (None if it was not optimized), indexed by the
+# same id as the log (see generate_sfs_dicts_from_log). As the asm json contains the optimized sub blocks, their sfs
+# correspond to the solutions, but they are equivalent to the sfs of the original sub blocks.
+def load_baseline(baseline_file, baseline_log):
+    sub_blocks = {}
+    for contract_name, block in asm_blocks_with_contract_name(parse_asm(baseline_file).getContracts()):
+        for block_name, sfs_block in compute_sfs_dict_from_asm_block(block, contract_name).items():
+            log_id = contract_name + "_" + block_name
+            sub_blocks[log_id] = (sfs_block, baseline_log.get(log_id))
+    return sub_blocks
+
+
+# Same as optimize_sub_blocks, but sub blocks are represented as tuples (contract_name, block_name, sfs_block,
+# timeout). Sub blocks whose sfs has the same terms as the one with the same id in the baseline (see
+# have_same_terms) are not solved again: they keep the solution from the baseline log, or no solution if they were
+# not optimized. Reused solutions are verified as the ones from a log file, and the sub blocks of the blocks that
+# are not verified correctly (see check_log_file_by_block) are solved again.
+def optimize_sub_blocks_with_baseline(tasks, jobs=1, budget=None):
+    block_solutions = [None] * len(tasks)
+    pending_positions = []
+    reused_sfs_dict, reused_solutions = {}, {}
+
+    for position, (contract_name, block_name, sfs_block, _) in enumerate(tasks):
+        log_id = contract_name + "_" + block_name
+        if baseline_sub_blocks is None or log_id not in baseline_sub_blocks or \
+                not have_same_terms(sfs_block, baseline_sub_blocks[log_id][0]):
+            pending_positions.append(position)
+            continue
+
+        solution = baseline_sub_blocks[log_id][1]
+        block_solutions[position] = generate_sub_block_solution(block_name, sfs_block, solution)
+        baseline_stats['reused_sub_blocks'] += 1
+        if solution:
+            reused_sfs_dict[log_id] = sfs_block
+            reused_solutions[log_id] = solution
+
+    if reused_solutions:
+        block_results = check_log_file_by_block(reused_sfs_dict, reused_solutions, jobs)
+        rejected_positions = [position for position, (contract_name, block_name, _, _) in enumerate(tasks)
+                              if contract_name + "_" + block_name in reused_solutions and
+                              not block_results[log_block_id(contract_name + "_" + block_name)]]
+        if rejected_positions:
+            baseline_stats['reused_sub_blocks'] -= len(rejected_positions)
+            baseline_stats['rejected_solutions'] += len(rejected_positions)
+            pending_positions = sorted(pending_positions + rejected_positions)
+
+    solutions = optimize_sub_blocks([tasks[position][1:] for position in pending_positions], jobs, budget)
+    for position, solution in zip(pending_positions, solutions):
+        block_solutions[position] = solution
+
+    return block_solutions
+
+
+# Given an asm_block, its contract name, its sfs dict and the solutions obtained from optimize_block,
+# returns the asm block after the optimization and the log info for the sub blocks that have been optimized
+def generate_optimized_asm_block(block, contract_name, sfs_dict, block_solutions):
     block_id = block.getBlockId()
     is_init_block = block.get_is_init_block()
-    new_block = deepcopy(block)
 
     # Optimized blocks. When a block is not optimized, None is pushed to the list.
     optimized_blocks = {}
 
     log_dicts = {}
 
-    instructions = preprocess_instructions(bytecodes)
-
-    sfs_dict = compute_original_sfs_with_simplifications(instructions,stack_size,contract_name, block_id, is_init_block)["syrup_contract"]
-
-    for solver_output, block_name, current_cost, current_length, user_instr \
-            in optimize_block(sfs_dict, timeout):
+    for solution, block_name, current_cost, current_length, user_instr in block_solutions:
 
         # We weren't able to find a solution using the solver, so we just update
-        if not check_solver_output_is_correct(solver_output):
+        if solution is None:
             optimized_blocks[block_name] = None
             continue
 
-        bs = sfs_dict[block_name]['max_sk_sz']
-
-        _, instruction_theta_dict, opcodes_theta_dict, gas_theta_dict, values_dict = generate_theta_dict_from_sequence(bs, user_instr)
+        _, instruction_theta_dict, opcodes_theta_dict, gas_theta_dict, values_dict = \
+            sfs_block_context(sfs_dict[block_name]).theta_maps()
 
         instruction_output, _, pushed_output, optimized_cost = \
-            generate_info_from_solution(solver_output, opcodes_theta_dict, instruction_theta_dict,
+            generate_info_from_sequence(solution, opcodes_theta_dict, instruction_theta_dict,
                                         gas_theta_dict, values_dict)
 
         if current_cost > optimized_cost:
-            new_sub_block = generate_sub_block_asm_representation_from_output(solver_output, opcodes_theta_dict, instruction_theta_dict,
-                                                              gas_theta_dict, values_dict)
+            new_sub_block = generate_sub_block_asm_representation_from_log(solution, opcodes_theta_dict, instruction_theta_dict,
+                                                                           gas_theta_dict, values_dict)
             optimized_blocks[block_name] = new_sub_block
-            log_dicts[contract_name + '_' + block_name] = generate_solution_dict(solver_output)
+            log_dicts[contract_name + '_' + block_name] = solution
         else:
             optimized_blocks[block_name] = None
 
@@ -481,7 +1189,7 @@ def optimize_asm_block_asm_format(block, contract_name, timeout):
 
     # Case zero: nothing has been optimized
     if len(asm_sub_blocks) == 0:
-        return deepcopy(block), {}
+        return block, {}
     # Case one: block may have been skipped completely
     if len(asm_sub_blocks) == 1:
         if not sfs_dict:
@@ -518,19 +1226,102 @@ def optimize_asm_block_asm_format(block, contract_name, timeout):
         log_dicts = {k : v for k,v in log_dicts.items() if optimized_blocks_list_with_intra_block_consideration[int(k.split(".")[-1])] is not None}
 
 
+    # Blocks that have not been modified are shared with the original asm instead of being copied
+    if all(optimized_block is None for optimized_block in optimized_blocks_list_with_intra_block_consideration):
+        return block, log_dicts
+
+    new_block = block.copy()
     new_block.set_instructions_from_sub_blocks(optimized_blocks_list_with_intra_block_consideration)
     new_block.compute_stack_size()
 
     return new_block, log_dicts
 
 
-def compare_asm_block_asm_format(old_block, new_block, contract_name="example"):
+# Returns the number of elements in the stack before each sub block of the block (see split_in_sub_blocks)
+def sub_block_stack_heights(block):
+    height = block.getSourceStack()
+    heights = []
+    for elem in block.split_in_sub_blocks():
+        if isinstance(elem, list):
+            heights.append(height)
+        for asm_bytecode in elem if isinstance(elem, list) else [elem]:
+            _, consumed_elements, produced_elements = get_opcode(asm_bytecode.getDisasm())[:3]
+            height += produced_elements - consumed_elements
+    return heights
+
+
+# Returns the position of the sub block an sfs dict key refers to (see generate_optimized_asm_block). Blocks with a
+# single sub block may have no index.
+def sub_block_index(block_name):
+    return int(block_name.rsplit(".", 1)[1]) if "." in block_name else 0
+
+
+# Returns the sfs of the sub blocks of new_block that are different from the ones of old_block and of the sub blocks
+# next to them, indexed by the same keys as old_sfs_dict, i.e. the sfs of the sub blocks of old_block. The sfs of
+# a sub block depends on its neighbours (e.g. the stack height they leave, or the POP that follows a split
+# instruction), so an unchanged sub block is only skipped if its neighbours are unchanged too. Each sub block is
+# compiled on its own, from the stack height it has in new_block. Returns None if the sub blocks cannot be matched
+# (i.e. some of them has no sfs), in which case the whole block must be compiled.
+def compute_sfs_dict_of_changed_sub_blocks(old_block, new_block, old_sfs_dict, contract_name):
+    old_sub_blocks = [elem for elem in old_block.split_in_sub_blocks() if isinstance(elem, list)]
+    new_sub_blocks = [elem for elem in new_block.split_in_sub_blocks() if isinstance(elem, list)]
+    keys = {sub_block_index(block_name): block_name for block_name in old_sfs_dict}
+
+    if len(old_sub_blocks) != len(new_sub_blocks) or len(keys) != len(old_sfs_dict):
+        return None
+
+    new_instructions = [preprocess_instructions(sub_block) for sub_block in new_sub_blocks]
+    changed_positions = [i for i, old_sub_block in enumerate(old_sub_blocks)
+                         if preprocess_instructions(old_sub_block) != new_instructions[i]]
+    compared_positions = sorted({j for i in changed_positions for j in (i - 1, i, i + 1)
+                                 if 0 <= j < len(new_sub_blocks)})
+
+    heights = sub_block_stack_heights(new_block)
+    new_sfs_dict = {}
+    for i in compared_positions:
+        if i not in keys:
+            return None
+
+        try:
+            sub_block_sfs_dict = compute_original_sfs_with_simplifications(
+                new_instructions[i], heights[i], contract_name, new_block.getBlockId(),
+                new_block.get_is_init_block())["syrup_contract"]
+        except Exception:
+            return None
+
+        if len(sub_block_sfs_dict) != 1:
+            return None
+        new_sfs_dict[keys[i]] = next(iter(sub_block_sfs_dict.values()))
+
+    return new_sfs_dict
+
+
+# Verifies that new_block computes the same as old_block. If the sfs dict of old_block (as computed by
+# compute_sfs_dict_from_asm_block) is given, it is not computed again, and only the sub blocks that are different
+# in new_block and their neighbours are compiled and compared (see compute_sfs_dict_of_changed_sub_blocks). If any
+# of them does not match, the whole new block is compiled and verified, as compiling a sub block on its own may give
+# a different sfs than compiling it as part of its block.
+def compare_asm_block_asm_format(old_block, new_block, contract_name="example", old_sfs_dict=None):
+
+    # We also must check intermediate instructions match i.e those that are not sub blocks
+    intermediate_instructions_old = list(map(lambda x: None if isinstance(x, list) else x, old_block.split_in_sub_blocks()))
+
+    intermediate_instructions_new = list(map(lambda x: None if isinstance(x, list) else x, new_block.split_in_sub_blocks()))
+
+    if intermediate_instructions_old != intermediate_instructions_new:
+        return False
 
-    old_instructions = preprocess_instructions(old_block.getInstructions())
+    if old_sfs_dict is not None:
+        new_sfs_dict = compute_sfs_dict_of_changed_sub_blocks(old_block, new_block, old_sfs_dict, contract_name)
+        if new_sfs_dict is not None and \
+                all(are_equals(old_sfs_dict[block_name], new_sfs) for block_name, new_sfs in new_sfs_dict.items()):
+            return True
+    else:
+        old_instructions = preprocess_instructions(old_block.getInstructions())
 
-    old_sfs_dict = compute_original_sfs_with_simplifications(old_instructions, old_block.getSourceStack(),
-                                                             contract_name, old_block.getBlockId(),
-                                                             old_block.get_is_init_block())["syrup_contract"]
+        old_sfs_dict = compute_original_sfs_with_simplifications(old_instructions, old_block.getSourceStack(),
+                                                                 contract_name, old_block.getBlockId(),
+                                                                 old_block.get_is_init_block())["syrup_contract"]
     new_instructions = preprocess_instructions(new_block.getInstructions())
 
 
@@ -538,37 +1329,80 @@ def compare_asm_block_asm_format(old_block, new_block, contract_name="example"):
                                                              contract_name, new_block.getBlockId(),
                                                              new_block.get_is_init_block())["syrup_contract"]
 
-    final_comparison = verify_block_from_list_of_sfs(old_sfs_dict, new_sfs_dict)
+    return verify_block_from_list_of_sfs(old_sfs_dict, new_sfs_dict)
 
-    # We also must check intermediate instructions match i.e those that are not sub blocks
-    intermediate_instructions_old = list(map(lambda x: None if isinstance(x, list) else x, old_block.split_in_sub_blocks()))
-
-    intermediate_instructions_new = list(map(lambda x: None if isinstance(x, list) else x, new_block.split_in_sub_blocks()))
 
-    return final_comparison and (intermediate_instructions_old == intermediate_instructions_new)
+# Yields the contract name and each block from the given contracts, following the same order in which
+# optimize_asm_contracts traverses them: first the init code and then the runtime code of each data id.
+def asm_blocks_with_contract_name(contracts):
+    for c in contracts:
+        if not c.has_asm_field():
+            continue
 
+        contract_name = (c.getContractName().split("/")[-1]).split(":")[-1]
 
-def optimize_asm_in_asm_format(file_name, output_file, timeout=10, log=False):
-    asm = parse_asm(file_name)
-    log_dicts = {}
-    contracts = []
-    verifier_error = False
+        for block in c.getInitCode():
+            yield contract_name, block
 
-    file_name_str = file_name.split("/")[-1].split(".")[0]
+        for identifier in c.getDataIds():
+            for block in c.getRunCodeOf(identifier):
+                yield contract_name, block
+
+
+# Optimizes the given blocks using a pool of processes and/or a time budget. Sfs dicts are generated first, so that
+# the sub blocks from all blocks can be scheduled together among the workers. Returns the optimized asm block, the
+# log info and the sfs dict for each block, in the same order as the blocks were given.
+def optimize_asm_blocks_in_parallel(blocks_with_contract_name, timeout, jobs, budget=None):
+    sfs_dicts = []
+    for contract_name, block in blocks_with_contract_name:
+        set_profiler_block(contract_name, block)
+        sfs_dicts.append(compute_sfs_dict_from_asm_block(block, contract_name))
+
+    tasks = [(contract_name, block_name, sfs_dict[block_name], timeout)
+             for (contract_name, _), sfs_dict in zip(blocks_with_contract_name, sfs_dicts) for block_name in sfs_dict]
+    solutions = iter(optimize_sub_blocks_with_baseline(tasks, jobs, budget))
+
+    optimized_blocks = []
+    for (contract_name, block), sfs_dict in zip(blocks_with_contract_name, sfs_dicts):
+        block_solutions = [next(solutions) for _ in sfs_dict]
+        set_profiler_block(contract_name, block)
+        with profiler.phase("rebuild"):
+            new_block, log_dicts = generate_optimized_asm_block(block, contract_name, sfs_dict, block_solutions)
+        optimized_blocks.append((new_block, log_dicts, sfs_dict))
+
+    return optimized_blocks
+
+
+# Returns an iterator with the optimized asm block, the log info and the sfs dict for each block of the given
+# contracts. Blocks are optimized lazily when executed sequentially, so that the output is shown while the blocks are
+# being optimized. Otherwise (or if a time budget is given), all blocks are optimized before returning the iterator.
+def optimize_asm_blocks(contracts, timeout, jobs, budget=None):
+    if jobs > 1 or budget is not None:
+        return iter(optimize_asm_blocks_in_parallel(list(asm_blocks_with_contract_name(contracts)), timeout, jobs,
+                                                    budget))
+    else:
+        return (optimize_asm_block_asm_format(block, contract_name, timeout)
+                for contract_name, block in asm_blocks_with_contract_name(contracts))
 
-    # If not output file provided, then we create a name by default.
-    if output_file is None:
-        output_file = file_name_str + "_optimized.json_solc"
 
-    for c in asm.getContracts():
+# Yields the optimized version of each contract, in the same order. If optimized_asm_blocks is None, the blocks
+# of each contract are optimized when the contract is reached. Otherwise, it must be the iterator returned by
+# optimize_asm_blocks for all the contracts. log_dicts and stats are updated with the info of each contract.
+def optimize_asm_contracts(contracts, optimized_asm_blocks, timeout, jobs, log_dicts, stats):
+    for c in contracts:
 
-        new_contract = deepcopy(c)
+        new_contract = c.copy()
 
         # If it does not have the asm field, then we skip it, as there are no instructions to optimize
         if not c.has_asm_field():
-            contracts.append(new_contract)
+            yield new_contract
             continue
 
+        if optimized_asm_blocks is None:
+            contract_asm_blocks = optimize_asm_blocks([c], timeout, jobs)
+        else:
+            contract_asm_blocks = optimized_asm_blocks
+
         contract_name = (c.getContractName().split("/")[-1]).split(":")[-1]
         init_code = c.getInitCode()
 
@@ -578,16 +1412,20 @@ def optimize_asm_in_asm_format(file_name, output_file, timeout=10, log=False):
         init_code_blocks = []
 
         for block in init_code:
-            asm_block, log_element = optimize_asm_block_asm_format(block, contract_name, timeout)
+            asm_block, log_element, sfs_dict = next(contract_asm_blocks)
             log_dicts.update(log_element)
             init_code_blocks.append(asm_block)
 
-            if not compare_asm_block_asm_format(block, asm_block):
+            set_profiler_block(contract_name, block)
+            with profiler.phase("verification"):
+                verified = compare_asm_block_asm_format(block, asm_block, contract_name, sfs_dict)
+
+            if not verified:
                 print("Optimized block " + str(block.getBlockId()) + " from init code at contract " + contract_name +
                       " has not been verified correctly")
                 print(block.getInstructions())
                 print(asm_block.getInstructions())
-                verifier_error = True
+                stats['verifier_error'] = True
 
         new_contract.setInitCode(init_code_blocks)
 
@@ -598,38 +1436,75 @@ def optimize_asm_in_asm_format(file_name, output_file, timeout=10, log=False):
 
             run_code_blocks = []
             for block in blocks:
-                asm_block, log_element = optimize_asm_block_asm_format(block, contract_name, timeout)
+                asm_block, log_element, sfs_dict = next(contract_asm_blocks)
                 log_dicts.update(log_element)
                 run_code_blocks.append(asm_block)
 
-                if not compare_asm_block_asm_format(block, asm_block):
+                set_profiler_block(contract_name, block)
+                with profiler.phase("verification"):
+                    verified = compare_asm_block_asm_format(block, asm_block, contract_name, sfs_dict)
+
+                if not verified:
                     print("Optimized block " + str(block.getBlockId()) + " from data id " + str(identifier)
                           + " at contract " + contract_name + " has not been verified correctly")
                     print(block.getInstructions())
                     print(asm_block.getInstructions())
-                    verifier_error = True
+                    stats['verifier_error'] = True
 
             new_contract.setRunCode(identifier, run_code_blocks)
 
-        contracts.append(new_contract)
+        # Sizes are stored per contract name, as in compute_number_of_instructions_in_asm_json_per_contract
+        stats['previous_sizes'][contract_name] = compute_number_of_instructions_in_asm_contract(c)
+        stats['new_sizes'][contract_name] = compute_number_of_instructions_in_asm_contract(new_contract)
+
+        yield new_contract
+
 
-    if not verifier_error:
+# If streaming is True, the contracts are parsed, optimized and written to the output file one at a time, instead
+# of loading the whole asm json in memory. If budget is given, it is the time in seconds available to optimize all
+# the blocks of the file (see optimize_sub_blocks_with_budget), and it is not compatible with streaming.
+def optimize_asm_in_asm_format(file_name, output_file, timeout=10, log=False, jobs=1, streaming=False, budget=None):
+    log_dicts = {}
+    stats = {'verifier_error': False, 'previous_sizes': {}, 'new_sizes': {}}
+
+    file_name_str = file_name.split("/")[-1].split(".")[0]
+
+    # If not output file provided, then we create a name by default.
+    if output_file is None:
+        output_file = file_name_str + "_optimized.json_solc"
+
+    if streaming:
+        with profiler.phase("parse"):
+            asm, contracts = parse_asm_incrementally(file_name)
+        new_contracts = optimize_asm_contracts(contracts, None, timeout, jobs, log_dicts, stats)
+
+        with open(output_file, 'w') as f:
+            write_asm_incrementally(f, asm, new_contracts)
+    else:
+        with profiler.phase("parse"):
+            asm = parse_asm(file_name)
+        optimized_asm_blocks = optimize_asm_blocks(asm.getContracts(), timeout, jobs, budget)
+        new_asm = asm.copy()
+        new_asm.set_contracts(list(optimize_asm_contracts(asm.getContracts(), optimized_asm_blocks, timeout, jobs,
+                                                          log_dicts, stats)))
+
+    if not stats['verifier_error']:
         print("Optimized bytecode has been checked successfully")
     else:
         print("Error when generating the optimized bytecode")
 
-    new_asm = deepcopy(asm)
-    new_asm.set_contracts(contracts)
-
-    print("Previous size:", compute_number_of_instructions_in_asm_json_per_file(asm))
-    print("New size:", compute_number_of_instructions_in_asm_json_per_file(new_asm))
+    print("Previous size:", sum(stats['previous_sizes'].values()))
+    print("New size:", sum(stats['new_sizes'].values()))
 
     if log:
+        os.makedirs(gasol_path, exist_ok=True)
         with open(gasol_path + file_name_str + ".log" , "w") as log_f:
             json.dump(log_dicts, log_f)
 
-    with open(output_file, 'w') as f:
-        f.write(json.dumps(rebuild_asm(new_asm)))
+    if not streaming:
+        profiler.set_context(contract=None, block=None)
+        with profiler.phase("rebuild"), open(output_file, 'w') as f:
+            f.write(json.dumps(rebuild_asm(new_asm)))
 
 
 if __name__ == '__main__':
@@ -644,15 +1519,154 @@ if __name__ == '__main__':
     ap.add_argument("-log", "--generate-log", help ="Generate log file for Etherscan verification",
                     action = "store_true", dest='log_flag')
     ap.add_argument("-o", help="ASM output path", dest='output_path', action='store')
+    ap.add_argument("--cache", help="Reuse the solutions stored in the solution cache and store the new ones",
+                    action="store_true", dest='cache_flag')
+    ap.add_argument("--cache-size", metavar='N', action='store', type=int,
+                    help="Maximum number of solutions kept in the solution cache. By default, set to 100000.",
+                    default=100000)
+    ap.add_argument("--artifacts", choices=["none", "debug", "all"], action='store', default="none",
+                    help="Intermediate files stored in " + gasol_path + ". With debug, the SMT-LIB encoding and "
+                         "the theta maps of each sub block. With all, also the rbr, the input json and the disasm "
+                         "of each block. By default, set to none.")
+    ap.add_argument("-j", "--jobs", metavar='N', action='store', type=int,
+                    help="Number of processes used to optimize the sub blocks. By default, set to 1.", default=1)
+    ap.add_argument("--streaming", help="Parse, optimize and write the contracts one at a time, instead of "
+                                         "loading the whole asm json in memory", action="store_true")
+    ap.add_argument("--solver-pool", metavar='N', action='store', type=int, dest='solver_pool',
+                    help="Number of long-lived solver processes (per job) that receive the sub blocks through "
+                         "pipes, instead of starting a solver process for each of them. By default, set to 0 "
+                         "(disabled).", default=0)
+    ap.add_argument("--backend", choices=["smtlib", "z3-api"], action='store', default="smtlib",
+                    help="With smtlib, the encoding of each sub block is written as a SMT-LIB script and solved by "
+                         "a solver process. With z3-api, it is built and solved using the z3 Python API, which must "
+                         "be installed. By default, set to smtlib.")
+    ap.add_argument("--iterative-deepening", help="Solve each sub block with increasing bounds on the length of "
+                                                   "the sequence, starting from a lower bound, instead of encoding "
+                                                   "the length of the original block", action="store_true",
+                    dest='iterative_deepening')
+    ap.add_argument("--symmetry-breaking", help="Forbid in the encoding the sequences of instructions that can be "
+                                                 "replaced by a cheaper equivalent one, such as SWAP1 SWAP1",
+                    action="store_true", dest='symmetry_breaking')
+    ap.add_argument("--portfolio", metavar='configurations', action='store',
+                    help="Comma separated list of solvers (oms, z3 or barcelogic) that are run at the same time on each "
+                         "sub block, keeping the first optimal solution or the best one at the timeout. Each solver "
+                         "can be followed by encoding flags separated by + (e.g. oms,z3,oms+symmetry-breaking). The "
+                         "winner of each sub block is stored in " + portfolio_winners_file + ".")
+    ap.add_argument("--greedy", help="Find a solution for each sub block with a greedy scheduler before calling the "
+                                      "solver. Its cost bounds the cost of the solutions, and it is kept if the "
+                                      "solver does not find a cheaper one", action="store_true")
+    ap.add_argument("--baseline", metavar='asm_file', action='store', dest='baseline_path',
+                    help="Output of a previous execution. Sub blocks that have not changed since then keep the "
+                         "solution from its log file (see --baseline-log) instead of being solved again")
+    ap.add_argument("--baseline-log", metavar='log_file', action='store', dest='baseline_log_path',
+                    help="Log file generated by the execution given in --baseline")
+    ap.add_argument("--budget", metavar='seconds', action='store', type=int,
+                    help="Time in seconds available to optimize all the blocks of the asm json. Every sub block is "
+                         "first solved with a short timeout (at most -tout), and the remaining time is given to the "
+                         "sub blocks that reached it. Not compatible with --streaming.")
+    ap.add_argument("--batch", help="Optimize all the isolated asm blocks (.disasm_blk files) in the input "
+                                     "directory and store the results of each sub block in the results file",
+                    action="store_true")
+    ap.add_argument("--results", metavar='results_file', action='store', dest='results_path',
+                    help="Results file used by --batch. By default, set to " + batch_results_file + ".",
+                    default=batch_results_file)
+    ap.add_argument("--train-predictor", metavar='model_file', action='store', dest='train_predictor_path',
+                    help="After --batch, train a block predictor from the results file and " +
+                         portfolio_winners_file + ", and store it in model_file")
+    ap.add_argument("--predictor", metavar='model_file', action='store', dest='predictor_path',
+                    help="Block predictor trained with --train-predictor, which decides the timeout (at most -tout) "
+                         "and the encoding flags of each sub block, and skips those that it predicts cannot be "
+                         "improved")
+    ap.add_argument("--profile", metavar='out_file', action='store', dest='profile_path',
+                    help="Measure the time spent in each phase (parse, rbr, sfs, simplification, encoding, solver, "
+                         "output parsing, verification and rebuild) and store it in out_file")
+    ap.add_argument("--profile-format", choices=["json", "chrome"], action='store', default="json",
+                    help="Format of the --profile file: the time of each phase in total and per file, contract and "
+                         "block (json), or every phase in the Chrome trace format (chrome). By default, json.")
 
 
     args = ap.parse_args()
+
+    if args.jobs < 1:
+        ap.error("-j/--jobs must be at least 1")
+
+    if args.budget is not None and args.streaming:
+        ap.error("--budget cannot be combined with --streaming")
+
+    if args.backend == "z3-api" and importlib.util.find_spec("z3") is None:
+        ap.error("--backend z3-api requires the z3 Python API (pip install z3-solver)")
+
+    try:
+        portfolio = parse_portfolio(args.portfolio) if args.portfolio is not None else []
+    except ValueError as e:
+        ap.error(str(e))
+
+    if portfolio and args.backend == "z3-api":
+        ap.error("--portfolio cannot be combined with --backend z3-api")
+
+    if (args.baseline_path is None) != (args.baseline_log_path is None):
+        ap.error("--baseline and --baseline-log must be given together")
+
+    if args.baseline_path is not None and (args.block or args.batch or args.log_path is not None):
+        ap.error("--baseline can only be used to optimize an asm json")
+
+    if args.train_predictor_path is not None and not args.batch:
+        ap.error("--train-predictor can only be used with --batch")
+
+    try:
+        predictor = BlockPredictor.load(args.predictor_path) if args.predictor_path is not None else None
+    except (OSError, ValueError, KeyError) as e:
+        ap.error("Invalid block predictor " + args.predictor_path + ": " + str(e))
+
+    if args.profile_path is not None:
+        profiler.start(profile_events_path, {'file': args.input_path})
+
+    set_optimization_options({'artifacts': args.artifacts, 'solver_pool': args.solver_pool,
+                              'iterative_deepening': args.iterative_deepening, 'backend': args.backend,
+                              'symmetry_breaking': args.symmetry_breaking, 'greedy': args.greedy,
+                              'portfolio': portfolio, 'predictor': predictor,
+                              'profile': (profile_events_path, {'file': args.input_path})
+                              if args.profile_path is not None else None})
+
+    if args.cache_flag:
+        solution_cache = SolutionCache(cache_file, args.cache_size)
+
+    if args.baseline_path is not None:
+        with open(args.baseline_log_path) as path:
+            baseline_sub_blocks = load_baseline(args.baseline_path, json.load(path))
+
     if args.log_path is not None:
         with open(args.log_path) as path:
             log_dict = json.load(path)
-            optimize_asm_from_log(args.input_path, log_dict, args.output_path)
+            optimize_asm_from_log(args.input_path, log_dict, args.output_path, args.jobs)
+    elif args.batch:
+        optimize_isolated_asm_blocks_in_batch(args.input_path, args.results_path, args.tout, args.jobs,
+                                              args.train_predictor_path)
     elif not args.block:
-        optimize_asm_in_asm_format(args.input_path, args.output_path, args.tout, args.log_flag)
+        optimize_asm_in_asm_format(args.input_path, args.output_path, args.tout, args.log_flag, args.jobs,
+                                   args.streaming, args.budget)
     else:
         optimize_isolated_asm_block(args.input_path, args.tout)
 
+    if solver_pool is not None:
+        solver_pool.close()
+
+    if lower_bound_stats['skipped_sub_blocks'] > 0:
+        print("Sub blocks skipped by the gas lower bound: " + str(lower_bound_stats['skipped_sub_blocks']) +
+              " (" + str(lower_bound_stats['saved_time']) + "s of solver time saved)")
+
+    if baseline_sub_blocks is not None:
+        print("Sub blocks reused from the baseline: " + str(baseline_stats['reused_sub_blocks']) +
+              " (" + str(baseline_stats['rejected_solutions']) + " solutions could not be verified)")
+
+    if predictor_stats['skipped_sub_blocks'] > 0 or predictor_stats['saved_time'] > 0:
+        print("Sub blocks skipped by the block predictor: " + str(predictor_stats['skipped_sub_blocks']) +
+              " (" + str(predictor_stats['saved_time']) + "s of solver time saved)")
+
+    if solution_cache is not None:
+        solution_cache.close()
+        print(solution_cache.report())
+
+    if args.profile_path is not None:
+        profiler.write_profile(args.profile_path, args.profile_format)
+        print("Profile stored in " + args.profile_path)
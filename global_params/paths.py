@@ -5,6 +5,7 @@ gasol_path = tmp_path + "gasol/"
 gasol_folder = "gasol"
 json_path =  gasol_path + "jsons"
 smt_encoding_path = gasol_path +"smt_encoding/"
+cache_file = gasol_path + "cache/solutions.db"
 
 project_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 
@@ -18,4 +19,10 @@ oms_exec = project_path + "/bin/optimathsat"
 
 log_file = gasol_path + "verification.log"
 
-csv_file = gasol_path + "solutions/statistics.csv"
\ No newline at end of file
+csv_file = gasol_path + "solutions/statistics.csv"
+
+batch_results_file = gasol_path + "batch/results.db"
+
+portfolio_winners_file = gasol_path + "portfolio/winners.csv"
+
+profile_events_path = gasol_path + "profile/"
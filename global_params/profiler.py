@@ -0,0 +1,137 @@
+import glob
+import json
+import os
+import resource
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+# Phase timers enabled with --profile. Each process appends the phases it measures to its own file in events_dir
+# (one json object per line), so that the phases measured by the workers of a process pool are collected as well.
+# Each phase is tagged with the file, contract, block and sub block that were being optimized when it started (see
+# set_context). None if profiling is disabled, in which case phases are not measured.
+events_dir = None
+
+_events_file = None
+_events_pid = None
+_default_context = {}
+_context = threading.local()
+_lock = threading.Lock()
+
+
+# Enables the profiler in the current process. Context keys that are not set by set_context take the values given
+# in default_context (e.g. the input file)
+def enable(directory, default_context=None):
+    global events_dir, _default_context, _events_pid
+    events_dir = directory
+    # Events are stored in a new file the next time a phase finishes
+    _events_pid = None
+    _default_context = dict(default_context or {})
+    _context.__dict__.clear()
+
+
+# Removes the events stored by previous executions and enables the profiler
+def start(directory, default_context=None):
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+    enable(directory, default_context)
+
+
+def set_context(**context):
+    _context.__dict__.update(context)
+
+
+def _children_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _store_event(event):
+    global _events_file, _events_pid
+    with _lock:
+        # Workers created by fork inherit the file of their parent, so each process opens its own one
+        if _events_pid != os.getpid():
+            _events_file = open(os.path.join(events_dir, str(os.getpid()) + ".jsonl"), "a")
+            _events_pid = os.getpid()
+        _events_file.write(json.dumps(event) + "\n")
+        _events_file.flush()
+
+
+# Measures the wall-clock time and the CPU time of the phase. CPU time includes the time of the child processes
+# (i.e. solvers) that finished during the phase, so it is only accurate if phases with child processes are not run
+# concurrently. Keyword arguments replace the context of the phase.
+@contextmanager
+def phase(name, **context):
+    if events_dir is None:
+        yield
+        return
+
+    start_time = time.time()
+    start_cpu = time.process_time() + _children_cpu_time()
+    try:
+        yield
+    finally:
+        event = dict(_default_context, **_context.__dict__)
+        event.update(context)
+        event.update({'phase': name, 'start': start_time, 'wall': time.time() - start_time,
+                      'cpu': time.process_time() + _children_cpu_time() - start_cpu, 'pid': os.getpid(),
+                      'tid': threading.get_ident()})
+        _store_event(event)
+
+
+def load_events(directory):
+    events = []
+    for events_file in sorted(glob.glob(os.path.join(directory, "*.jsonl"))):
+        with open(events_file) as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    return sorted(events, key=lambda event: event['start'])
+
+
+# Name of the block of a phase: the block name prefixed by its contract, as in the log file. Phases run by the
+# workers of a process pool only know the sub block, so its block is used without the contract
+def _block_key(event):
+    block = event.get('block') or (event['sub_block'].rsplit(".", 1)[0] if event.get('sub_block') else None)
+    if block is None:
+        return None
+    return event['contract'] + "_" + block if event.get('contract') else block
+
+
+def _add_phase(totals, key, event):
+    if key is None:
+        return
+    phase_totals = totals.setdefault(key, {}).setdefault(event['phase'], {'wall': 0, 'cpu': 0, 'count': 0})
+    phase_totals['wall'] += event['wall']
+    phase_totals['cpu'] += event['cpu']
+    phase_totals['count'] += 1
+
+
+# Returns the wall-clock and CPU time spent in each phase and the number of times it has been executed, in total
+# and per file, contract and block. Note that phases may be nested (e.g. simplification is part of sfs), so the
+# times of different phases must not be added up
+def aggregate_events(events):
+    totals, files, contracts, blocks = {}, {}, {}, {}
+    for event in events:
+        _add_phase(totals, "total", event)
+        _add_phase(files, event.get('file'), event)
+        _add_phase(contracts, event.get('contract'), event)
+        _add_phase(blocks, _block_key(event), event)
+    return {'phases': totals.get("total", {}), 'files': files, 'contracts': contracts, 'blocks': blocks}
+
+
+# Returns the phases in the Chrome trace event format, which can be loaded in chrome://tracing or Perfetto
+def chrome_trace(events):
+    trace_events = []
+    for event in events:
+        args = {key: event[key] for key in ['file', 'contract', 'block', 'sub_block', 'cpu'] if event.get(key)}
+        trace_events.append({'name': event['phase'], 'cat': "gasol", 'ph': "X", 'ts': int(event['start'] * 1e6),
+                             'dur': int(event['wall'] * 1e6), 'pid': event['pid'], 'tid': event['tid'],
+                             'args': args})
+    return {'traceEvents': trace_events, 'displayTimeUnit': "ms"}
+
+
+# Writes the phases measured by every process in output_file, either aggregated (json) or as a Chrome trace (chrome)
+def write_profile(output_file, profile_format="json"):
+    events = load_events(events_dir)
+    with open(output_file, "w") as f:
+        json.dump(chrome_trace(events) if profile_format == "chrome" else aggregate_events(events), f, indent=1)
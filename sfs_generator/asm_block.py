@@ -4,6 +4,8 @@ import sfs_generator.utils as utils
 from global_params.constants import split_block
 
 class AsmBlock():
+
+    __slots__ = ("contract_name", "identifier", "instructions", "source_stack", "is_init_block")
     
     def __init__(self, cname, identifier, is_init_block):
         self.contract_name = cname
@@ -103,6 +105,14 @@ class AsmBlock():
         assert (current_sub_block == len(optimized_sub_blocks))
         self.instructions = instructions
 
+    # Returns a copy of the block that shares the instructions with this one. Bytecodes are never modified once
+    # they are created, so there is no need to copy them when the list of instructions is replaced
+    def copy(self):
+        new_block = AsmBlock(self.contract_name, self.identifier, self.is_init_block)
+        new_block.instructions = list(self.instructions)
+        new_block.source_stack = self.source_stack
+        return new_block
+
 
     def __str__(self):
         content = ""
@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 
+import sys
+
+# Opcode names are interned, so all the bytecodes with the same opcode share the same string
 class AsmBytecode:
 
+    __slots__ = ("begin", "end", "source", "disasm", "value")
+
     def __init__(self,begin,end,source,disasm,value):
         self.begin = begin
         self.end = end
         self.source = source
-        self.disasm = disasm
+        self.disasm = sys.intern(disasm)
         self.value = value
 
 
@@ -32,7 +37,7 @@ class AsmBytecode:
         return self.disasm
     
     def setDisasm(self, v):
-        self.disasm = v
+        self.disasm = sys.intern(v)
 
     def getValue(self):
         return self.value
@@ -49,5 +54,5 @@ class AsmBytecode:
         return content
 
     def __eq__(self, other):
-        return self.begin == other.begin and self.end == other.end and self.source == other.source and \
+        return isinstance(other, AsmBytecode) and self.begin == other.begin and self.end == other.end and self.source == other.source and \
                self.disasm == other.disasm and self.value == other.value
@@ -12,6 +12,15 @@ class AsmContract:
     def has_asm_field(self):
         return self.contains_asm_field
 
+    # Returns a copy of the contract that shares the blocks with this one, so that the code of the copy can be
+    # replaced without modifying this contract
+    def copy(self):
+        new_contract = AsmContract(self.cname, self.contains_asm_field)
+        new_contract.code = list(self.code)
+        new_contract.data = {data_id: dict(fields) for data_id, fields in self.data.items()}
+        new_contract.data_addresses = dict(self.data_addresses)
+        return new_contract
+
     def setAux(self,data_id,aux):
         if not self.data.get(data_id,False):
             self.data[data_id] = {}
@@ -27,6 +27,13 @@ class AsmJSON():
     def set_contracts(self, contracts):
         self.contracts = contracts
 
+    # Returns a copy that shares the contracts with this one
+    def copy(self):
+        new_asm = AsmJSON()
+        new_asm.solc_version = self.solc_version
+        new_asm.contracts = list(self.contracts)
+        return new_asm
+
 
     def __str__(self):
         content = ""
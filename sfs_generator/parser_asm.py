@@ -112,4 +112,97 @@ def parse_asm(file_name):
 
 
     return asm_json
-        
+
+
+# Number of characters read from the asm json file each time the buffer of JSONStreamReader runs out
+chunk_size = 1 << 20
+
+
+# Reads a json file incrementally, so that only the value that is being parsed is kept in memory
+class JSONStreamReader:
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    # Discards the consumed part of the buffer and appends the next size characters. Returns False at EOF
+    def read_more(self, size):
+        data = self.f.read(size)
+        if not data:
+            return False
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    # Returns the next character that is not a whitespace, without consuming it
+    def next_char(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more(chunk_size):
+                raise ValueError("Unexpected end of the asm json file")
+
+    def consume(self, expected_chars):
+        char = self.next_char()
+        if char not in expected_chars:
+            raise ValueError("Unexpected character " + char + " in the asm json file")
+        self.pos += 1
+        return char
+
+    # Parses the next value. If it is not complete in the buffer, the buffer is doubled until it is
+    def read_value(self):
+        self.next_char()
+        while True:
+            try:
+                value, self.pos = self.decoder.raw_decode(self.buffer, self.pos)
+                return value
+            except json.JSONDecodeError:
+                if not self.read_more(max(chunk_size, len(self.buffer))):
+                    raise
+
+    # Yields the keys of the object that starts at the current position. The value of each key must be read
+    # before asking for the next key
+    def object_keys(self):
+        self.consume("{")
+        if self.next_char() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self.consume(":")
+            yield key
+            if self.consume(",}") == "}":
+                return
+
+
+def parse_contracts_incrementally(file_name, asm_json):
+    with open(file_name) as f:
+        reader = JSONStreamReader(f)
+
+        for key in reader.object_keys():
+            if key == "contracts":
+                for c in reader.object_keys():
+                    contract = reader.read_value()
+
+                    if contract.get("asm",None) is None:
+                        yield AsmContract(c, False)
+                    else:
+                        yield build_asm_contract(c,contract["asm"])
+
+            elif key == "version":
+                asm_json.setVersion(reader.read_value())
+            else:
+                reader.read_value()
+
+
+# Same as parse_asm, but the contracts are parsed one at a time. Returns the AsmJSON object, which does not
+# contain the contracts, and a generator that yields them. The version is only guaranteed to be set once
+# the generator has been exhausted.
+def parse_asm_incrementally(file_name):
+    asm_json = AsmJSON()
+    return asm_json, parse_contracts_incrementally(file_name, asm_json)
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import json
+
 def rebuild_asm_bytecode(asm_bytecode):
     json_bytecode = {"begin": asm_bytecode.getBegin(), "end": asm_bytecode.getEnd(), "name": asm_bytecode.getDisasm(),
                      "source": asm_bytecode.getSource()}
@@ -74,3 +76,22 @@ def rebuild_asm(asm_json):
     final_asm["contracts"] = contracts
 
     return final_asm
+
+
+# Same as rebuild_asm, but the json is written to the file f as soon as each contract is given, so that only one
+# contract is kept in memory at a time. The version is written once all contracts have been written.
+def write_asm_incrementally(f, asm_json, contracts):
+    f.write('{"contracts": {')
+
+    for i, c in enumerate(contracts):
+        if i > 0:
+            f.write(', ')
+
+        if not c.has_asm_field():
+            f.write(json.dumps(c.getContractName()) + ': {}')
+            continue
+
+        for contract_name, json_contract in rebuild_asm_contract(c).items():
+            f.write(json.dumps(contract_name) + ': ' + json.dumps(json_contract))
+
+    f.write('}, "version": ' + json.dumps(asm_json.getVersion()) + '}')
@@ -149,19 +149,22 @@ def isYulInstruction(opcode):
         return True
 
 
+# Computes the number of bytecodes in the runtime code of a contract
+def compute_number_of_instructions_in_asm_contract(c):
+    number_instrs = 0
+    for identifier in c.getDataIds():
+        blocks = c.getRunCodeOf(identifier)
+        for block in blocks:
+            number_instrs += len(list(filter(lambda x: x.getDisasm() != "tag", block.getInstructions())))
+    return number_instrs
+
+
 # Computes the number of bytecodes given an ASM json object
 def compute_number_of_instructions_in_asm_json_per_contract(asm_json):
     contract_counter_dict = {}
     for c in asm_json.getContracts():
-        number_instrs = 0
         contract_name = (c.getContractName().split("/")[-1]).split(":")[-1]
-
-        for identifier in c.getDataIds():
-            blocks = c.getRunCodeOf(identifier)
-            for block in blocks:
-                number_instrs += len(list(filter(lambda x: x.getDisasm() != "tag", block.getInstructions())))
-
-        contract_counter_dict[contract_name] = number_instrs
+        contract_counter_dict[contract_name] = compute_number_of_instructions_in_asm_contract(c)
     return contract_counter_dict
 
 
@@ -0,0 +1,35 @@
+from encoding_utils import generate_stack_theta, generate_uninterpreted_theta, generate_instr_map, \
+    generate_disasm_map, generate_costs_ordered_dict, generate_uninterpreted_push_map
+
+# Theta values of the instructions of a sub block and the maps derived from them (see
+# generate_theta_dict_from_sequence), which only depend on the max stack size (bs) and the user instructions.
+# They are computed once per sub block and shared by the encoder, the greedy scheduler and the reconstruction of
+# the solutions, instead of being generated again by each of them.
+class BlockContext:
+
+    def __init__(self, bs, user_instr):
+        self.bs = bs
+        self.user_instr = user_instr
+        self.user_instr_by_id = {instr['id']: instr for instr in user_instr}
+        self.theta_stack = generate_stack_theta(bs)
+        self.theta_comm, self.theta_non_comm = generate_uninterpreted_theta(user_instr, len(self.theta_stack))
+        self.theta_dict = dict(self.theta_stack, **self.theta_comm, **self.theta_non_comm)
+        self.instr_map = generate_instr_map(user_instr, self.theta_stack, self.theta_comm, self.theta_non_comm)
+        self.disasm_map = generate_disasm_map(user_instr, self.theta_dict)
+        self.costs_map = generate_costs_ordered_dict(bs, user_instr, self.theta_dict)
+        self.value_map = generate_uninterpreted_push_map(user_instr, self.theta_dict)
+
+    # Same tuple as generate_theta_dict_from_sequence
+    def theta_maps(self):
+        return self.theta_dict, self.instr_map, self.disasm_map, self.costs_map, self.value_map
+
+
+# Returns the context of a sub block, which is built the first time and stored in its sfs, so that it is shared by
+# every function that receives the sfs. Copies of the sfs made afterwards (e.g. with a different init_progr_len)
+# share the context as well.
+def sfs_block_context(sfs_block):
+    block_context = sfs_block.get('block_context')
+    if block_context is None:
+        block_context = BlockContext(sfs_block['max_sk_sz'], sfs_block['user_instrs'])
+        sfs_block['block_context'] = block_context
+    return block_context
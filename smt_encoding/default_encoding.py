@@ -1,8 +1,22 @@
-# This function infers statically the number of necessary instructions without
-# taking into account SWAPs, the number of necessary instructions and the number of push
-# instructions.
-def infer_size_relation(initial_stack, final_stack, instructions):
-    n_instrs = len(instructions)
+import math
+from encoding_utils import generate_dependency_graph, generate_dependency_order
+
+# Instructions that read from storage or memory
+storage_instructions = ["SLOAD", "MLOAD", "KECCAK256"]
+
+# Minimum length of the sequence (b0) from which the default encoding restrains the order of the instructions
+# (see generate_instruction_order_structures)
+instruction_order_min_length = 20
+
+# Names of the features of a sub block, in the same order as they are returned by extract_sfs_features
+sfs_feature_names = ["user_instrs", "init_progr_len", "max_sk_sz", "commutative_share", "storage_ops",
+                     "dependency_depth"]
+
+
+# Returns a dict that links each element to the number of times it is available minus the number of times it is
+# needed, considering the initial and final stack and the inputs and outputs of each instruction. Also returns
+# the number of integers that appear in the final stack and in the inputs.
+def compute_stack_var_count(initial_stack, final_stack, instructions):
     n_push = 0
     stack_var_count = dict()
     for elem in initial_stack:
@@ -23,6 +37,16 @@ def infer_size_relation(initial_stack, final_stack, instructions):
         for elem in instr['outpt_sk']:
             stack_var_count[elem] = stack_var_count.get(elem, 0) + 1
 
+    return stack_var_count, n_push
+
+
+# This function infers statically the number of necessary instructions without
+# taking into account SWAPs, the number of necessary instructions and the number of push
+# instructions.
+def infer_size_relation(initial_stack, final_stack, instructions):
+    n_instrs = len(instructions)
+    stack_var_count, n_push = compute_stack_var_count(initial_stack, final_stack, instructions)
+
     # A lower bound is the different between consumed and produced elements + number
     # of instructions. If we consume more elements that produce, we need at least to generate
     # elements via PUSH or DUP instructions. Otherwise, we need to apply POP. As we know that
@@ -38,6 +62,64 @@ def infer_size_relation(initial_stack, final_stack, instructions):
     return max(num_stack_ops + len(instructions), 1), n_instrs, n_push
 
 
+# Lower bound for the gas of any sequence that implements the sfs. Every instruction must appear at least once,
+# and elements that are missing (resp. left over) must be generated (resp. removed) by other instructions. PUSH and
+# DUP generate an element for 3 units of gas and POP removes one for 2, but repeating an instruction can be cheaper:
+# an instruction with no inputs generates one element and an instruction with k > 1 inputs removes k-1 elements.
+def infer_gas_lower_bound(initial_stack, final_stack, instructions):
+    stack_var_count, _ = compute_stack_var_count(initial_stack, final_stack, instructions)
+    missing_elements = sum(-count for count in stack_var_count.values() if count < 0)
+    leftover_elements = sum(count for count in stack_var_count.values() if count > 0)
+
+    generation_cost = min([3] + [instr['gas'] for instr in instructions if len(instr['inpt_sk']) == 0])
+    removal_cost = min([2] + [instr['gas'] / (len(instr['inpt_sk']) - 1)
+                              for instr in instructions if len(instr['inpt_sk']) > 1])
+
+    return sum(instr['gas'] for instr in instructions) + missing_elements * generation_cost + \
+        leftover_elements * removal_cost
+
+
+# Upper bound for the number of instructions of any sequence that implements the sfs and consumes less than cost
+# units of gas. Every instruction must appear at least once, and any other instruction consumes at least the
+# minimum between 2 (POP) and the gas of the cheapest instruction. Returns None if there is no bound, i.e. some
+# instruction consumes no gas.
+def infer_length_upper_bound(cost, instructions):
+    min_gas = min([2] + [instr['gas'] for instr in instructions])
+    if min_gas <= 0:
+        return None
+
+    remaining_gas = cost - sum(instr['gas'] for instr in instructions)
+    return len(instructions) + math.ceil(remaining_gas / min_gas) - 1
+
+
+# Returns the length of the longest chain of instructions of the sfs such that each of them uses the output
+# of the previous one, or 0 if there are no instructions. Instructions are visited after the ones they depend on
+# (see generate_dependency_order), so that long chains do not reach the recursion limit.
+def infer_dependency_depth(instructions):
+    dependency_graph = generate_dependency_graph(instructions)
+    depths = dict()
+
+    for instr_id in generate_dependency_order(dependency_graph):
+        depths[instr_id] = 1 + max([depths[previous_id] for previous_id, _ in dependency_graph[instr_id]
+                                    if previous_id != 'PUSH'], default=0)
+
+    return max(depths.values(), default=0)
+
+
+# Features of a sub block that are used to predict how hard it is to optimize (see BlockPredictor): the number of
+# instructions of the sfs, the maximum length of the sequence (b0), the maximum size of the stack (bs), the share
+# of commutative instructions, the number of instructions that read from storage or memory and the dependency depth
+# (see infer_dependency_depth). They are returned as a list, following the order of sfs_feature_names.
+def extract_sfs_features(sfs_block):
+    instructions = sfs_block['user_instrs']
+    n_commutative = len([instr for instr in instructions if instr['commutative']])
+    n_storage = len([instr for instr in instructions if instr['disasm'] in storage_instructions])
+
+    return [len(instructions), sfs_block['init_progr_len'], sfs_block['max_sk_sz'],
+            round(n_commutative / len(instructions), 3) if instructions else 0, n_storage,
+            infer_dependency_depth(instructions)]
+
+
 # Computes the corresponding static parameters and enables the corresponding flags according
 # to them.
 def activate_default_encoding(initial_stack, final_stack, instructions, initial_seq_length, flags):
@@ -47,4 +129,6 @@ def activate_default_encoding(initial_stack, final_stack, instructions, initial_
         flags['pushed-at-least'] = True
     if initial_seq_length <= 15:
         flags['pushed-at-least'] = True
+    if initial_seq_length >= instruction_order_min_length:
+        flags['instruction-order'] = True
     return flags
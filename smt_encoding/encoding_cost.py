@@ -21,12 +21,12 @@ def generate_previous_solution_statement(b0, theta_dict, instr_seq):
     write_encoding(add_assert(add_eq(previous_solution_var, add_and(*and_variables))))
 
 
-# Generates the soft constraints contained in the paper.
-def paper_soft_constraints(b0, bs, user_instr, theta_dict, is_barcelogic=False, instr_seq=None, previous_solution_weight=-1):
+# Generates the soft constraints contained in the paper. Instr_costs is the gas cost of each theta value
+# (see generate_costs_ordered_dict)
+def paper_soft_constraints(b0, instr_costs, theta_dict, is_barcelogic=False, instr_seq=None, previous_solution_weight=-1):
     if instr_seq is None:
         instr_seq = []
     write_encoding("; Soft constraints from paper")
-    instr_costs = generate_costs_ordered_dict(bs, user_instr, theta_dict)
     disjoin_sets = generate_disjoint_sets_from_cost(instr_costs)
     previous_cost = 0
     or_variables = []
@@ -60,11 +60,30 @@ def paper_soft_constraints(b0, bs, user_instr, theta_dict, is_barcelogic=False,
         previous_cost = gas_cost
 
 
+# Hard constraint stating that the gas cost of the sequence is at most upper_bound, so that the solver does not
+# explore sequences that are more expensive than a solution that is already known (see greedy_scheduler). The cost
+# of each position is the one of the instruction assigned to it, as in the soft constraints.
+def gas_upper_bound_constraint(b0, instr_costs, upper_bound):
+    write_encoding("; Upper bound on the gas cost")
+    disjoint_sets = generate_disjoint_sets_from_cost(instr_costs)
+    gas_costs = list(disjoint_sets)
+
+    position_costs = []
+    for j in range(b0):
+        # The instructions with the highest cost are the remaining ones
+        position_cost = gas_costs[-1]
+        for gas_cost in reversed(gas_costs[:-1]):
+            position_cost = add_ite(add_or(*[add_eq(t(j), instr) for instr in disjoint_sets[gas_cost]]),
+                                    gas_cost, position_cost)
+        position_costs.append(position_cost)
+
+    write_encoding(add_assert(add_leq(add_plus(*position_costs) if b0 > 1 else position_costs[0], upper_bound)))
+
+
 # Method for generating an alternative model for soft constraints. This method is similar to the previous one,
 # but instead it is based on inequalities and shorter constraints. See new paper for more details
-def alternative_soft_constraints(b0, bs, user_instr, theta_dict, is_barcelogic=False):
+def alternative_soft_constraints(b0, instr_costs, is_barcelogic=False):
     write_encoding("; Alternative soft constraints model")
-    instr_costs = generate_costs_ordered_dict(bs, user_instr, theta_dict)
 
     # For every instruction and every position in the sequence, we add a soft constraint
     for theta_instr, gas_cost in instr_costs.items():
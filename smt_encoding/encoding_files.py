@@ -1,7 +1,9 @@
 import sys
+import io
 import pathlib
 import json
 from global_params.paths import smt_encoding_path
+from smtlib_utils import define_fun
 
 def init():
 
@@ -20,15 +22,30 @@ def init():
     global encoding_stream
     encoding_stream = sys.stdout
 
+    global encoding_path
+    encoding_path = smt_encoding_path
 
-def initialize_dir_and_streams(solver,source_name = None):
+    global in_memory_encoding
+    in_memory_encoding = False
+
+    global defined_terms
+    defined_terms = set()
+
+
+# If in_memory is set, the encoding is built in memory instead of being written in encoding_dir, and the
+# files containing the theta maps are not generated.
+def initialize_dir_and_streams(solver,source_name = None, encoding_dir = smt_encoding_path, in_memory = False):
     global encoding_stream
     global encoding_name
     global instr_map_file
     global opcode_map_file
     global gas_map_file
+    global encoding_path
+    global in_memory_encoding
 
     init()
+    encoding_path = encoding_dir
+    in_memory_encoding = in_memory
 
     if source_name:
         name = source_name.split("/")[-1].rstrip(".json")
@@ -37,14 +54,29 @@ def initialize_dir_and_streams(solver,source_name = None):
         opcode_map_file = name + "_" + opcode_map_file
         gas_map_file = name + "_" + gas_map_file
 
-    pathlib.Path(smt_encoding_path).mkdir(parents=True, exist_ok=True)
-    encoding_stream = open(smt_encoding_path + encoding_name, 'w')
+    if in_memory:
+        encoding_stream = io.StringIO()
+    else:
+        pathlib.Path(encoding_path).mkdir(parents=True, exist_ok=True)
+        encoding_stream = open(encoding_path + encoding_name, 'w')
 
     return encoding_stream
 
 
+# Statements are None if they have been received by a term builder instead (see smtlib_utils)
 def write_encoding(string):
-    print(string, file=encoding_stream)
+    if string is not None:
+        print(string, file=encoding_stream)
+
+
+# Writes the definition of a shared term the first time its name is used in the current encoding,
+# and returns the name, so that it can be used instead of the term. The term is given by a function
+# without arguments, so that it is only built once.
+def define_term_once(term_name, term_type, generate_term):
+    if term_name not in defined_terms:
+        defined_terms.add(term_name)
+        write_encoding(define_fun(term_name, term_type, generate_term()))
+    return term_name
 
 
 def close_encoding():
@@ -52,16 +84,22 @@ def close_encoding():
 
 
 def write_instruction_map(theta_instr):
+    if in_memory_encoding:
+        return
     print(instr_map_file)
-    with open(smt_encoding_path + instr_map_file, 'w') as f:
+    with open(encoding_path + instr_map_file, 'w') as f:
         f.write(json.dumps(theta_instr))
 
 
 def write_opcode_map(instr_opcodes):
-    with open(smt_encoding_path + opcode_map_file, 'w') as f:
+    if in_memory_encoding:
+        return
+    with open(encoding_path + opcode_map_file, 'w') as f:
         f.write(json.dumps(instr_opcodes))
 
 
 def write_gas_map(gas_instr):
-    with open(smt_encoding_path + gas_map_file, 'w') as f:
+    if in_memory_encoding:
+        return
+    with open(encoding_path + gas_map_file, 'w') as f:
         f.write(json.dumps(gas_instr))
\ No newline at end of file
@@ -124,4 +124,44 @@ def each_instruction_in_final_stack_is_used_at_least_once(b0, final_stack_theta_
 
         for j in range(initial_idx, final_idx):
             or_variables.append(add_eq(t(j), theta_instr))
-        write_encoding(add_assert(add_or(*or_variables)))
\ No newline at end of file
+        write_encoding(add_assert(add_or(*or_variables)))
+
+# Symmetry breaking: forbids pairs of consecutive instructions that leave the stack as it was, or as the
+# first instruction does on its own, so any sequence that contains them can be replaced by a cheaper one.
+# These are SWAPk SWAPk, DUPk POP, PUSH POP, DUPk SWAPk (the swapped elements are equal) and SWAP1 followed
+# by a commutative instruction (its operands can already appear in either order).
+def forbid_redundant_stack_patterns(b0, theta_stack, theta_comm):
+    write_encoding("; Consecutive instructions that can be replaced by a cheaper sequence")
+    theta_pop = theta_stack["POP"]
+
+    redundant_pairs = [(theta_stack["PUSH"], theta_pop)]
+    for instr, theta_instr in theta_stack.items():
+        if instr.startswith("SWAP"):
+            redundant_pairs.append((theta_instr, theta_instr))
+        elif instr.startswith("DUP"):
+            redundant_pairs.append((theta_instr, theta_pop))
+            if "SWAP" + instr[3:] in theta_stack:
+                redundant_pairs.append((theta_instr, theta_stack["SWAP" + instr[3:]]))
+    if "SWAP1" in theta_stack:
+        redundant_pairs.extend((theta_stack["SWAP1"], theta_instr) for theta_instr in theta_comm.values())
+
+    for j in range(b0 - 1):
+        for first_theta, second_theta in redundant_pairs:
+            write_encoding(add_assert(add_not(add_and(add_eq(t(j), first_theta), add_eq(t(j+1), second_theta)))))
+
+
+# Symmetry breaking: instructions without inputs (PUSH included) do not depend on the instructions executed
+# before them, so two consecutive ones followed by SWAP1 are equivalent to executing them in the opposite
+# order without SWAP1. Hence, the order in which they appear is determined by the stack that must be obtained.
+def order_independent_instructions(b0, user_instr, theta_stack, theta_dict):
+    write_encoding("; Independent instructions are not reordered using SWAP1")
+    if "SWAP1" not in theta_stack:
+        return
+
+    independent_theta = [theta_stack["PUSH"]] + [theta_dict[instr['id']] for instr in user_instr
+                                                 if not instr['inpt_sk']]
+
+    for j in range(b0 - 2):
+        write_encoding(add_assert(add_not(add_and(add_or(*[add_eq(t(j), theta) for theta in independent_theta]),
+                                                  add_or(*[add_eq(t(j+1), theta) for theta in independent_theta]),
+                                                  add_eq(t(j+2), theta_stack["SWAP1"])))))
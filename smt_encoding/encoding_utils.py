@@ -2,6 +2,7 @@
 # other auxiliary methods to generate the encoding
 
 from smtlib_utils import *
+from encoding_files import define_term_once
 from collections import OrderedDict
 import re
 
@@ -15,6 +16,9 @@ max_k_swap = 16
 
 int_limit = 2**256
 
+pattern_swap = re.compile("SWAP(.*)")
+pattern_dup = re.compile("DUP(.*)")
+
 # Methods for generating string corresponding to
 # variables we will be using for the encoding
 
@@ -36,17 +40,37 @@ def a(i):
 
 # Auxiliary methods for defining the constraints
 
+# Term that states that the elements in positions [alpha, beta] of the stack are moved delta positions
+# after executing the instruction in position j. As the same moves are repeated for many instructions,
+# the term is shared: each aligned interval [k*2^p, (k+1)*2^p - 1] is defined once per encoding as the
+# conjunction of its two halves (see define_term_once), and any other interval is the conjunction of the
+# aligned intervals it can be split into, which are O(log(beta - alpha)).
 def move(j, alpha, beta, delta):
-    and_variables = []
-
     # Move can be empty
     if alpha > beta:
         return "true"
-    for i in range(alpha, beta+1):
-        first_and = add_eq(u(i+delta, j+1), u(i,j))
-        second_and = add_eq(x(i+delta, j+1), x(i,j))
-        and_variables.append(add_and(first_and, second_and))
-    return add_and(*and_variables)
+
+    aligned_intervals = []
+    while alpha <= beta:
+        size = alpha & -alpha if alpha > 0 else 1 << (beta + 1).bit_length()
+        while alpha + size - 1 > beta:
+            size //= 2
+        aligned_intervals.append(_aligned_move(j, alpha, size, delta))
+        alpha += size
+
+    if len(aligned_intervals) == 1:
+        return aligned_intervals[0]
+    return add_and(*aligned_intervals)
+
+
+def _aligned_move(j, alpha, size, delta):
+    def generate_term():
+        if size == 1:
+            return add_and(add_eq(u(alpha+delta, j+1), u(alpha,j)), add_eq(x(alpha+delta, j+1), x(alpha,j)))
+        return add_and(_aligned_move(j, alpha, size // 2, delta),
+                       _aligned_move(j, alpha + size // 2, size // 2, delta))
+
+    return define_term_once(var2str("move", j, alpha, alpha + size - 1, delta), "Bool", generate_term)
 
 
 def generate_stack_theta(bs):
@@ -117,88 +141,93 @@ def generate_disjoint_sets_from_cost(ordered_costs):
     return OrderedDict(sorted(disjoint_set.items(), key=lambda t: t[0]))
 
 
-# Given a instruction, a dict that links each instruction to a lower bound to the number of instructions
-# # needed to obtain the output from that dict, and another dict
-# that links each instruction to the previous instructions needed to execute that instruction,
-# updates both dicts for that instruction and returns the corresponding values associated to the instruction.
-def generate_instr_dependencies(instr, number_of_instructions_to_execute, previous_values, dependency_theta_graph):
-
-    # Base case: it has been already analyzed, so we return the values associated.
-    if instr in previous_values:
-        return number_of_instructions_to_execute[instr], previous_values[instr]
-
-    # Base case: if the instruction is a push, it doesn't have any previous instruction, so
-    # it needs 0 instructions and doesn't have any dependency.
-    if instr == 'PUSH':
-        return 0, set()
+# Returns the instructions of the dependency graph in an order in which each instruction comes after the ones it
+# depends on (i.e. the order in which they are finished by a depth-first traversal). The graph is traversed
+# iteratively, so that long chains of dependencies do not reach the recursion limit.
+def generate_dependency_order(dependency_theta_graph):
+    order = []
+    visited = set()
+    for root in dependency_theta_graph:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(dependency_theta_graph[root]))]
+        while stack:
+            instr, previous_instrs = stack[-1]
+            for previous_instr, _ in previous_instrs:
+                if previous_instr != 'PUSH' and previous_instr not in visited:
+                    visited.add(previous_instr)
+                    stack.append((previous_instr, iter(dependency_theta_graph[previous_instr])))
+                    break
+            else:
+                stack.pop()
+                order.append(instr)
+    return order
 
-    number_of_instructions_needed = 0
-    instructions_dependency = set()
 
-    # Recursive case: we obtain the output for each previous instruction and update the values
-    for previous_instr, aj in dependency_theta_graph[instr]:
+# Yields the positions of the bits set to 1 in bitset
+def bitset_positions(bitset):
+    while bitset:
+        lowest_bit = bitset & -bitset
+        yield lowest_bit.bit_length() - 1
+        bitset ^= lowest_bit
 
-        previous_number_of_instr_needed, previous_instructions_dependency = \
-            generate_instr_dependencies(previous_instr, number_of_instructions_to_execute,
-                                        previous_values, dependency_theta_graph)
-        # We need the number of instructions needed for previous instruction plus one (executing that instruction)
-        number_of_instructions_needed += previous_number_of_instr_needed + 1
 
-        # We ignore push instructions from this point, as they don't add any info
-        if previous_instr == 'PUSH':
-            continue
+# Given the dict containing the dependency among different instructions, we generate
+# another dict that links each instruction to the number of instructions that must be
+# executed previously to be able to execute that instruction. Instructions are visited following the dependency
+# order, so the values of the instructions each one depends on have already been computed. The instructions an
+# instruction depends on (directly or not) are represented as a bitset over the positions in that order.
+def generate_number_of_previous_instr_dict(dependency_theta_graph):
+    order = generate_dependency_order(dependency_theta_graph)
+    position = {instr: i for i, instr in enumerate(order)}
+    previous_values = {}
+    number_of_instructions_to_execute = {'PUSH': 0}
 
-        # We need to add previous instruction to its associated values, as it wasn't added yet
-        previous_instructions = previous_instructions_dependency | {previous_instr}
+    for instr in order:
+        number_of_instructions_needed = 0
+        instructions_dependency = 0
 
-        # See detailed explanation for more information to understand this step
-        repeated_instructions = instructions_dependency.intersection(previous_instructions)
+        for previous_instr, aj in dependency_theta_graph[instr]:
 
-        # Maximal elements are those that don't appear as a previous instruction for any of the repeated instructions
-        maximal_elements = repeated_instructions.difference(set().union(*[previous_values[repeated_instr]
-                                                                          for repeated_instr in repeated_instructions]))
-        for repeated_instr in maximal_elements:
+            # A push doesn't have any previous instruction, so we only need to execute it
+            if previous_instr == 'PUSH':
+                number_of_instructions_needed += 1
+                continue
 
-            # If it is the maximal representative, then the necessary number of previous instructions is 0
-            # (as it could have been duplicated)
-            number_of_instructions_needed -= number_of_instructions_to_execute[repeated_instr]
+            # We need the number of instructions needed for previous instruction plus one (executing that instruction)
+            number_of_instructions_needed += number_of_instructions_to_execute[previous_instr] + 1
 
-        # We update instructions_dependency
-        instructions_dependency = instructions_dependency.union(previous_instructions)
+            # We need to add previous instruction to its associated values, as it wasn't added yet
+            previous_instructions = previous_values[previous_instr] | (1 << position[previous_instr])
 
-    number_of_instructions_to_execute[instr] = number_of_instructions_needed
-    previous_values[instr] = instructions_dependency
+            # Instructions needed both by previous instruction and by the ones already considered
+            repeated_instructions = instructions_dependency & previous_instructions
 
-    # print(instr, ":", previous_values)
+            if repeated_instructions:
+                # Maximal elements are those that don't appear as a previous instruction for any of the repeated
+                # instructions
+                covered_instructions = 0
+                for i in bitset_positions(repeated_instructions):
+                    covered_instructions |= previous_values[order[i]]
 
-    return number_of_instructions_needed, instructions_dependency
+                for i in bitset_positions(repeated_instructions & ~covered_instructions):
+                    # If it is the maximal representative, then the necessary number of previous instructions is 0
+                    # (as it could have been duplicated)
+                    number_of_instructions_needed -= number_of_instructions_to_execute[order[i]]
 
+            instructions_dependency |= previous_instructions
 
-# Given the dict containing the dependency among different instructions, we generate
-# another dict that links each instruction to the number of instructions that must be
-# executed previously to be able to execute that instruction.
-def generate_number_of_previous_instr_dict(dependency_theta_graph):
-    previous_values = {}
-    number_of_instructions_to_execute = {'PUSH': 0}
-    for instr in dependency_theta_graph:
-        generate_instr_dependencies(instr, number_of_instructions_to_execute, previous_values, dependency_theta_graph)
+        number_of_instructions_to_execute[instr] = number_of_instructions_needed
+        previous_values[instr] = instructions_dependency
 
     return number_of_instructions_to_execute
 
 
-# First time an instruction cannot appear is b0-h, where h is the tree height. We recursively obtain this value,
-# taking into account that we may have different trees and the final value is the min for all possible ones
-def update_with_tree_level(b0, dependency_theta_graph, current_idx, instr, first_position_instr_cannot_appear):
-    # We don't consider push instructions
-    if instr == 'PUSH':
-        return
-    first_position_instr_cannot_appear[instr] = min(current_idx, first_position_instr_cannot_appear.get(instr, b0))
-    for prev_instr, _ in dependency_theta_graph[instr]:
-        update_with_tree_level(b0, dependency_theta_graph, current_idx-1, prev_instr, first_position_instr_cannot_appear)
-
-
 # Generates a dict that given b0, returns the first position in which a instruction cannot appear
-# due to dependencies with other instructions.
+# due to dependencies with other instructions. First time an instruction cannot appear is b0-h, where h is the tree
+# height, and the final value is the min for all possible trees. Instructions are visited in reverse dependency
+# order, so the value of an instruction is known before it is propagated to the instructions it depends on.
 def generate_first_position_instr_cannot_appear(b0, final_stack_instr, dependency_graph, top_elem_is_instruction):
     first_position_instr_cannot_appear = {'PUSH': b0}
 
@@ -215,10 +244,23 @@ def generate_first_position_instr_cannot_appear(b0, final_stack_instr, dependenc
         b0_aux = b0 - 1
 
     for final_instr in final_stack_instr:
-        update_with_tree_level(b0, dependency_graph, b0_aux, final_instr, first_position_instr_cannot_appear)
+        if final_instr != 'PUSH':
+            first_position_instr_cannot_appear[final_instr] = \
+                min(b0_aux, first_position_instr_cannot_appear.get(final_instr, b0))
 
         # If it isn't top of the stack, another instruction must go before it (SWAP or DUP). Only works once
         b0_aux = b0 - 1
+
+    for instr in reversed(generate_dependency_order(dependency_graph)):
+        if instr not in first_position_instr_cannot_appear:
+            continue
+        for prev_instr, _ in dependency_graph[instr]:
+            # We don't consider push instructions
+            if prev_instr != 'PUSH':
+                first_position_instr_cannot_appear[prev_instr] = \
+                    min(first_position_instr_cannot_appear[instr] - 1,
+                        first_position_instr_cannot_appear.get(prev_instr, b0))
+
     return first_position_instr_cannot_appear
 
 
@@ -226,6 +268,13 @@ def generate_first_position_instr_cannot_appear(b0, final_stack_instr, dependenc
 # the id of instructions that must be executed to obtain its input and the corresponding
 # aj. Note that aj must be only assigned when push, in other cases we just set aj value to -1.
 def generate_dependency_graph(user_instr):
+    # Id of the instruction that generates each stack elem as an output. If several instructions generate the same
+    # one, the first of them is considered
+    instr_by_output = {}
+    for instr in user_instr:
+        if instr['outpt_sk']:
+            instr_by_output.setdefault(instr['outpt_sk'][0], instr['id'])
+
     dependency_theta_graph = {}
     for instr in user_instr:
         instr_id = instr['id']
@@ -234,12 +283,10 @@ def generate_dependency_graph(user_instr):
             # We search for another instruction that generates the
             # stack elem as an output and add it to the set
             if type(stack_elem) == str:
-                previous_instr = list(filter(lambda instruction: instruction['outpt_sk'][0] == stack_elem, user_instr))
-
-                # It might be in the initial stack, so the list can be empty
-                if previous_instr:
+                # It might be in the initial stack, so there may be no instruction
+                if stack_elem in instr_by_output:
                     # We add previous instr id
-                    dependency_theta_graph[instr['id']].append((previous_instr[0]['id'], -1))
+                    dependency_theta_graph[instr_id].append((instr_by_output[stack_elem], -1))
             # If we have an int, then we must perform a PUSHx to obtain that value
             else:
                 dependency_theta_graph[instr_id].append(('PUSH', stack_elem))
@@ -281,9 +328,8 @@ def generate_phi_dict(user_instr, final_stack):
 # and nop has no opcode associated. We will associated push to 60, the corresponding opcode
 # for PUSH1.
 def generate_disasm_map(user_instr, theta_instr):
-
-    pattern_swap = re.compile("SWAP(.*)")
-    pattern_dup = re.compile("DUP(.*)")
+    # Opcode of each user instruction, so that it is not searched for each theta value
+    user_instr_opcodes = {instr['id']: instr['opcode'] for instr in user_instr}
 
     instr_opcodes = {0: "60", 1: "50"}
     for id, theta in theta_instr.items():
@@ -291,16 +337,14 @@ def generate_disasm_map(user_instr, theta_instr):
         if id == "PUSH" or id == "POP" or id == "NOP":
             continue
 
-        uninterpreted_function = True
-        for match in re.finditer(pattern_swap, id):
-            opcode = hex(int(match.group(1)) + int(str("90"), 16) - 1)[2:]
-            uninterpreted_function = False
-        for match in re.finditer(pattern_dup, id):
-            opcode = hex(int(match.group(1)) + int(str("80"), 16) - 1)[2:]
-            uninterpreted_function = False
-        if uninterpreted_function:
-            instr = list(filter(lambda instr: instr['id'] == id, user_instr))[0]
-            opcode = instr['opcode']
+        swap_match = pattern_swap.search(id)
+        dup_match = pattern_dup.search(id)
+        if swap_match is not None:
+            opcode = hex(int(swap_match.group(1)) + int(str("90"), 16) - 1)[2:]
+        elif dup_match is not None:
+            opcode = hex(int(dup_match.group(1)) + int(str("80"), 16) - 1)[2:]
+        else:
+            opcode = user_instr_opcodes[id]
         instr_opcodes[theta] = opcode
 
     return instr_opcodes
@@ -4,11 +4,11 @@ from superoptimization_enconding import generate_smtlib_encoding, generate_smtli
 from utils_bckend import add_bars_and_index_to_string
 import json
 from encoding_files import initialize_dir_and_streams, write_encoding
-from smtlib_utils import set_logic, check_sat
+from smtlib_utils import set_logic, check_sat, set_term_builder
 import re
-from encoding_utils import generate_disasm_map, generate_costs_ordered_dict, generate_stack_theta, generate_instr_map, \
-    generate_uninterpreted_theta, generate_uninterpreted_push_map
+from block_context import BlockContext, sfs_block_context
 import copy
+from global_params.paths import smt_encoding_path
 
 def parse_data(json_path, var_initial_idx=0, with_simplifications=True):
     # We can pass either the path to a json file, or
@@ -61,7 +61,7 @@ def initialize_flags_and_additional_info(args_i, current_cost, instr_seq, previo
                  'instruction-order': False,
                  'no-output-before-pop': False, 'inequality-gas-model': False,
                  'initial-solution': False, 'default-encoding': False,
-                 'number-instruction-gas-model': False}
+                 'number-instruction-gas-model': False, 'symmetry-breaking': False}
         additional_info = {'tout': 10, 'solver': "oms", 'current_cost': current_cost,
                            'instr_seq': instr_seq, 'previous_solution': previous_solution_dict}
     else:
@@ -70,18 +70,25 @@ def initialize_flags_and_additional_info(args_i, current_cost, instr_seq, previo
                  'no-output-before-pop': args_i.no_output_before_pop,
                  'inequality-gas-model': args_i.inequality_gas_model,
                  'initial-solution': args_i.initial_solution, 'default-encoding': args_i.default_encoding,
-                 'number-instruction-gas-model': args_i.number_instruction_gas_model}
+                 'number-instruction-gas-model': args_i.number_instruction_gas_model,
+                 'symmetry-breaking': getattr(args_i, 'symmetry_breaking', False)}
         additional_info = {'tout': args_i.tout, 'solver': args_i.solver, 'current_cost': current_cost,
                            'instr_seq': instr_seq, 'previous_solution': previous_solution_dict}
     return flags, additional_info
 
 
-# Executes the smt encoding generator from the main script
-def execute_syrup_backend(args_i,json_file = None, previous_solution_dict = None, block_name = None, timeout=10):
+# Executes the smt encoding generator from the main script. If in_memory is set, the encoding is
+# not written in a file and it is returned as a string instead. Flags in encoding_flags replace the
+# default ones (see initialize_flags_and_additional_info). If gas_upper_bound is given, sequences
+# whose gas cost is greater are excluded. If block_context is given, the theta values are taken from it
+# instead of being generated again (see BlockContext).
+def execute_syrup_backend(args_i,json_file = None, previous_solution_dict = None, block_name = None, timeout=10,
+                          encoding_dir=smt_encoding_path, in_memory=False, encoding_flags=None, gas_upper_bound=None,
+                          solver="oms", block_context=None):
     # Args_i is None if the function is called from syrup-asm. In this case
-    # we assume by default oms, and json_file already contains the sfs dict
+    # the encoding is generated for solver (oms by default), and json_file already contains the sfs dict
     if args_i is None:
-        es = initialize_dir_and_streams("oms", block_name)
+        es = initialize_dir_and_streams(solver, block_name, encoding_dir, in_memory)
         json_path = json_file
     else:
         if json_file:
@@ -90,25 +97,63 @@ def execute_syrup_backend(args_i,json_file = None, previous_solution_dict = None
             json_path = args_i.source
 
         solver = args_i.solver
-        es = initialize_dir_and_streams(solver, json_path)
+        es = initialize_dir_and_streams(solver, json_path, encoding_dir, in_memory)
 
     b0, bs, user_instr, variables, initial_stack, final_stack, current_cost, instr_seq = parse_data(json_path)
 
     flags, additional_info = initialize_flags_and_additional_info(args_i, current_cost, instr_seq, previous_solution_dict)
+    flags.update(encoding_flags or {})
 
+    additional_info['solver'] = solver
     additional_info['tout'] = timeout
+    additional_info['gas_upper_bound'] = gas_upper_bound
+    additional_info['block_context'] = block_context
 
     generate_smtlib_encoding(b0, bs, user_instr, variables, initial_stack, final_stack, flags, additional_info)
 
+    encoding = es.getvalue() if in_memory else None
     es.close()
+    return encoding
 
 
-def execute_syrup_backend_combined(sfs_dict, instr_sequence_dict, contract_name, solver):
+# Same as execute_syrup_backend (called from syrup-asm), but the constraints are built as terms of the z3 Python
+# API (see z3_target) instead of being written as a SMT-LIB script. Returns the Z3Target that contains them.
+def execute_syrup_backend_z3(json_file, block_name=None, timeout=10, encoding_flags=None, gas_upper_bound=None,
+                             block_context=None):
+    # Imported here, as z3 is only needed by this backend
+    from z3_target import Z3Target
+
+    target = Z3Target()
+    set_term_builder(target)
+
+    try:
+        # The stream only receives the comments of the encoding
+        es = initialize_dir_and_streams("z3", block_name, in_memory=True)
+
+        b0, bs, user_instr, variables, initial_stack, final_stack, current_cost, instr_seq = parse_data(json_file)
+
+        flags, additional_info = initialize_flags_and_additional_info(None, current_cost, instr_seq, None)
+        flags.update(encoding_flags or {})
+
+        additional_info['tout'] = timeout
+        additional_info['solver'] = "z3"
+        additional_info['gas_upper_bound'] = gas_upper_bound
+        additional_info['block_context'] = block_context
+
+        generate_smtlib_encoding(b0, bs, user_instr, variables, initial_stack, final_stack, flags, additional_info)
+        es.close()
+    finally:
+        set_term_builder(None)
+
+    return target
+
+
+def execute_syrup_backend_combined(sfs_dict, instr_sequence_dict, contract_name, solver, in_memory=False):
     next_empty_idx = 0
     # Stores the number of previous stack variables to ensures there's no collision
     next_var_idx = 0
 
-    es = initialize_dir_and_streams(solver, contract_name)
+    es = initialize_dir_and_streams(solver, contract_name, in_memory=in_memory)
 
     write_encoding(set_logic('QF_LIA'))
 
@@ -122,7 +167,7 @@ def execute_syrup_backend_combined(sfs_dict, instr_sequence_dict, contract_name,
                                                                                                         next_var_idx)
 
         generate_smtlib_encoding_appending(b0, bs, user_instr, variables, initial_stack, final_stack,
-                                           log_dict, next_empty_idx)
+                                           log_dict, next_empty_idx, sfs_block_context(sfs_block))
         next_empty_idx += b0 + 1
 
         # Next available index for assigning var values is equal to the maximum of previous ones
@@ -130,19 +175,15 @@ def execute_syrup_backend_combined(sfs_dict, instr_sequence_dict, contract_name,
             next_var_idx = max(map(lambda x: int(re.search('\d+', x).group()), variables)) + 1
 
     write_encoding(check_sat())
+    encoding = es.getvalue() if in_memory else None
     es.close()
+    return encoding
 
 
 # Given the max stack size (bs) and the user instructions directly from the json, generates four dicts:
 # one for the conversion of an opcode id to the corresponding theta value, other for the disasm associated
 # to the theta value, another for the bytecode associated to the theta value, and finally, the cost of each
 # opcode associated to a theta value.
+# Sub blocks whose sfs is available should use sfs_block_context instead, so that they are only generated once.
 def generate_theta_dict_from_sequence(bs, usr_instr):
-    theta_stack = generate_stack_theta(bs)
-    theta_comm, theta_non_comm = generate_uninterpreted_theta(usr_instr, len(theta_stack))
-    theta_dict = dict(theta_stack, **theta_comm, **theta_non_comm)
-    instr_map = generate_instr_map(usr_instr, theta_stack, theta_comm, theta_non_comm)
-    disasm_map = generate_disasm_map(usr_instr, theta_dict)
-    costs_map = generate_costs_ordered_dict(bs, usr_instr, theta_dict)
-    value_map = generate_uninterpreted_push_map(usr_instr, theta_dict)
-    return theta_dict, instr_map, disasm_map, costs_map, value_map
\ No newline at end of file
+    return BlockContext(bs, usr_instr).theta_maps()
\ No newline at end of file
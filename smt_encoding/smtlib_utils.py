@@ -1,17 +1,27 @@
 # Module containing all necessary functions to generate
 # a SMT-Lib script. All methods return a string with
-# the corresponding statement.
+# the corresponding statement, unless a term builder
+# has been set.
+
+# Term builder that receives the terms and statements instead
+# of generating strings (see z3_target.Z3Target). Statements
+# return None in that case. If None, strings are generated.
+term_builder = None
+
+
+def set_term_builder(builder):
+    global term_builder
+    term_builder = builder
+
 
 # Methods to generate logical connective asserts.
 
 # Given a logical connective symbol and its operands,
 # returns the corresponding statement
 def _add_connective(connective_name, *formulas):
-    string = "(" + connective_name
-    for formula in formulas:
-        string += " " + str(formula)
-    string += ")"
-    return string
+    if term_builder is not None:
+        return term_builder.connective(connective_name, formulas)
+    return "(" + " ".join([connective_name, *map(str, formulas)]) + ")"
 
 
 def add_implies(form1, form2):
@@ -41,6 +51,14 @@ def add_leq(form1, form2):
 def add_lt(form1, form2):
     return _add_connective("<", form1, form2)
 
+
+def add_ite(condition, then_term, else_term):
+    return _add_connective("ite", condition, then_term, else_term)
+
+
+def add_plus(*terms):
+    return _add_connective("+", *terms)
+
 # Methods to declare variables
 
 # Given a variable prefix and the indexes,
@@ -52,6 +70,8 @@ def var2str(var_name, *indexes):
     return string
 
 def _declare_variable(var_name, var_type):
+    if term_builder is not None:
+        return term_builder.declare(var_name, var_type)
     return "(declare-fun " + str(var_name) + " () " + str(var_type) + ")"
 
 
@@ -63,13 +83,25 @@ def declare_intvar(var_name):
     return _declare_variable(var_name, "Int")
 
 
+# Given a name, a type and a term, returns the statement that defines the name
+# as an abbreviation of the term
+def define_fun(fun_name, fun_type, term):
+    if term_builder is not None:
+        return term_builder.define(fun_name, fun_type, term)
+    return "(define-fun " + str(fun_name) + " () " + str(fun_type) + " " + str(term) + ")"
+
+
 # Methods to add asserts
 
 def add_assert(statement):
+    if term_builder is not None:
+        return term_builder.add_assert(statement)
     return "(assert "+ statement +")"
 
 
 def add_assert_soft(statement, weight, id=None, exclamation=False):
+    if term_builder is not None:
+        return term_builder.add_assert_soft(statement, weight, id)
     if id is None:
         if not exclamation:
             return "(assert-soft " + statement + " :weight " + str(weight) + ")"
@@ -85,40 +117,58 @@ def add_assert_soft(statement, weight, id=None, exclamation=False):
 # SMT-Lib
 
 def set_logic(mode):
+    if term_builder is not None:
+        return None
     return "(set-logic " + mode + ")"
 
 
 def check_sat():
+    if term_builder is not None:
+        return None
     return "(check-sat)"
 
 
 def get_objectives():
+    if term_builder is not None:
+        return None
     return "(get-objectives)"
 
 
 def get_model():
+    if term_builder is not None:
+        return None
     return "(get-model)"
 
 
 def get_value(variable):
+    if term_builder is not None:
+        return term_builder.get_value(variable)
     return "(get-value (" + str(variable) + "))"
 
 
 def set_timeout(time_in_ms):
+    if term_builder is not None:
+        return term_builder.set_timeout(time_in_ms)
     return "(set-option :timeout " + str(time_in_ms) + ")"
 
 
 # For OMS: flag to allow to generate a model
 def set_model_true():
+    if term_builder is not None:
+        return None
     return "(set-option :produce-models true)"
 
 
 # Extension in OMS and Z3 to minimize a certain term
 def set_minimize_function(id):
+    if term_builder is not None:
+        return None
     return "(minimize " + id + ")"
 
 
 # Allows to generate model when the optimal solution hasn't been
 # found in OptiMathSat
 def load_objective_model():
+    if term_builder is not None:
+        return None
     return "(load-objective-model -1)"
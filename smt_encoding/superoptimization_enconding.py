@@ -6,12 +6,13 @@ from encoding_utils import *
 from encoding_initialize import initialize_variables, variables_assignment_constraint, \
     initial_stack_encoding, final_stack_encoding
 from encoding_cost import paper_soft_constraints, label_name, alternative_soft_constraints, \
-    number_instructions_soft_constraints
+    number_instructions_soft_constraints, gas_upper_bound_constraint
 from encoding_instructions import instructions_constraints
 from encoding_redundant import *
 from encoding_files import write_encoding, write_opcode_map, write_instruction_map, write_gas_map
 from default_encoding import activate_default_encoding
 from encoding_reconstruct_solution import generate_encoding_from_log_json_dict
+from block_context import BlockContext
 
 # Method to generate redundant constraints according to flags (at least once is included by default)
 def generate_redundant_constraints(flags, b0, user_instr, theta_stack, theta_comm, theta_non_comm, final_stack,
@@ -39,6 +40,9 @@ def generate_redundant_constraints(flags, b0, user_instr, theta_stack, theta_com
     else:
         each_function_is_used_at_least_once(b0, len(theta_stack),
                                             len(theta_stack) + len(theta_comm) + len(theta_non_comm))
+    if flags['symmetry-breaking']:
+        forbid_redundant_stack_patterns(b0, theta_stack, theta_comm)
+        order_independent_instructions(b0, user_instr, theta_stack, theta_dict)
 
 
 # Method to generate optional asserts according to additional info. It includes that info that relies on the
@@ -51,8 +55,7 @@ def generate_asserts_from_additional_info(additional_info):
             write_encoding(set_timeout(float(additional_info['tout'])))
 
 
-def generate_soft_constraints(solver_name, b0, bs, usr_instr, theta_dict, flags,
-                              current_cost, instr_seq):
+def generate_soft_constraints(solver_name, b0, block_context, flags, current_cost, instr_seq):
     is_barcelogic = solver_name == "barcelogic"
 
     # We need to address whether the want to encode the initial solution (in which case,
@@ -63,11 +66,11 @@ def generate_soft_constraints(solver_name, b0, bs, usr_instr, theta_dict, flags,
         weight = -1
 
     if flags['inequality-gas-model']:
-        alternative_soft_constraints(b0, bs, usr_instr, theta_dict, is_barcelogic)
+        alternative_soft_constraints(b0, block_context.costs_map, is_barcelogic)
     elif flags['number-instruction-gas-model']:
-        number_instructions_soft_constraints(b0, theta_dict['NOP'], is_barcelogic)
+        number_instructions_soft_constraints(b0, block_context.theta_dict['NOP'], is_barcelogic)
     else:
-        paper_soft_constraints(b0, bs, usr_instr, theta_dict, is_barcelogic, instr_seq, weight)
+        paper_soft_constraints(b0, block_context.costs_map, block_context.theta_dict, is_barcelogic, instr_seq, weight)
 
 
 def generate_cost_functions(solver_name):
@@ -115,22 +118,25 @@ def generate_final_statements(solver_name):
         write_encoding(load_objective_model())
 
 
-# Method to generate complete representation
+# Method to generate complete representation. The theta values and the maps derived from them are taken from the
+# block context in additional_info, if any (see BlockContext)
 def generate_smtlib_encoding(b0, bs, usr_instr, variables, initial_stack, final_stack, flags, additional_info):
     solver_name = additional_info['solver']
     current_cost = additional_info['current_cost']
     instr_seq = additional_info['instr_seq']
-    theta_stack = generate_stack_theta(bs)
-    theta_comm, theta_non_comm = generate_uninterpreted_theta(usr_instr, len(theta_stack))
+    block_context = additional_info.get('block_context') or BlockContext(bs, usr_instr)
+    theta_stack = block_context.theta_stack
+    theta_comm, theta_non_comm = block_context.theta_comm, block_context.theta_non_comm
     comm_instr, non_comm_instr = separe_usr_instr(usr_instr)
-    dependency_graph, first_position_instr_appears_dict, first_position_instr_cannot_appear_dict = \
-        generate_instruction_dicts(b0, usr_instr, final_stack, flags)
-    theta_dict = dict(theta_stack, **theta_comm, **theta_non_comm)
+    theta_dict = block_context.theta_dict
 
     # Before generating the encoding, we activate the default encoding if its corresponding flag is activated
     if flags['default-encoding']:
         flags = activate_default_encoding(initial_stack, final_stack, usr_instr, b0, flags)
 
+    dependency_graph, first_position_instr_appears_dict, first_position_instr_cannot_appear_dict = \
+        generate_instruction_dicts(b0, usr_instr, final_stack, flags)
+
     write_encoding(set_logic('QF_LIA'))
     generate_configuration_statements(solver_name)
     generate_asserts_from_additional_info(additional_info)
@@ -143,7 +149,9 @@ def generate_smtlib_encoding(b0, bs, usr_instr, variables, initial_stack, final_
     generate_redundant_constraints(flags, b0, usr_instr, theta_stack, theta_comm, theta_non_comm, final_stack,
                                    dependency_graph, first_position_instr_appears_dict,
                                    first_position_instr_cannot_appear_dict, theta_dict)
-    generate_soft_constraints(solver_name, b0, bs, usr_instr, theta_dict, flags, current_cost, instr_seq)
+    generate_soft_constraints(solver_name, b0, block_context, flags, current_cost, instr_seq)
+    if additional_info.get('gas_upper_bound') is not None and b0 > 0:
+        gas_upper_bound_constraint(b0, block_context.costs_map, additional_info['gas_upper_bound'])
     generate_cost_functions(solver_name)
     if additional_info['previous_solution'] is not None:
         generate_encoding_from_log_json_dict(additional_info['previous_solution'])
@@ -157,16 +165,18 @@ def generate_smtlib_encoding(b0, bs, usr_instr, variables, initial_stack, final_
     write_encoding("; Comm: " + str(theta_comm))
     write_encoding("; Non-Comm: " + str(theta_non_comm))
 
-    write_instruction_map(generate_instr_map(usr_instr, theta_stack, theta_comm, theta_non_comm))
-    write_opcode_map(generate_disasm_map(usr_instr, theta_dict))
-    write_gas_map(generate_costs_ordered_dict(bs, usr_instr, theta_dict))
+    write_instruction_map(block_context.instr_map)
+    write_opcode_map(block_context.disasm_map)
+    write_gas_map(block_context.costs_map)
 
 
 # Method to generate complete representation given
 def generate_smtlib_encoding_appending(b0, bs, usr_instr, variables, initial_stack, final_stack,
-                                       previous_solution, previous_idx):
-    theta_stack = generate_stack_theta(bs)
-    theta_comm, theta_non_comm = generate_uninterpreted_theta(usr_instr, len(theta_stack))
+                                       previous_solution, previous_idx, block_context=None):
+    if block_context is None:
+        block_context = BlockContext(bs, usr_instr)
+    theta_stack = block_context.theta_stack
+    theta_comm, theta_non_comm = block_context.theta_comm, block_context.theta_non_comm
     comm_instr, non_comm_instr = separe_usr_instr(usr_instr)
 
     initialize_variables(variables, bs, b0, previous_idx)
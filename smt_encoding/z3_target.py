@@ -0,0 +1,97 @@
+import z3
+from verification.solver_solution_verify import SolverResult
+
+# Term builder (see smtlib_utils) that builds the constraints of the encoding as terms of the z3 Python API
+# and adds them to an Optimize instance, so that the encoding can be solved without writing a SMT-LIB script
+# and running a solver process. Variables are still referred to by their names in the encoding functions,
+# so names are mapped to the corresponding z3 constants (or defined terms, see define_fun).
+
+ctx = z3.main_ctx()
+
+
+# Terms are built using the C API directly, as the arguments of the encoding have always the expected sorts
+# and the checks and coercions of the Python functions (z3.And, z3.Implies...) dominate the encoding time otherwise
+def _mk_nary(mk_function):
+    def mk_term(operands):
+        return z3.BoolRef(mk_function(ctx.ref(), len(operands), (z3.Ast * len(operands))(*operands)), ctx)
+    return mk_term
+
+
+def _mk_binary(mk_function):
+    return lambda operands: z3.BoolRef(mk_function(ctx.ref(), operands[0], operands[1]), ctx)
+
+
+def _mk_ite(operands):
+    return z3.ArithRef(z3.Z3_mk_ite(ctx.ref(), operands[0], operands[1], operands[2]), ctx)
+
+
+def _mk_add(operands):
+    return z3.ArithRef(z3.Z3_mk_add(ctx.ref(), len(operands), (z3.Ast * len(operands))(*operands)), ctx)
+
+
+connectives = {"and": _mk_nary(z3.Z3_mk_and), "or": _mk_nary(z3.Z3_mk_or),
+               "not": lambda operands: z3.BoolRef(z3.Z3_mk_not(ctx.ref(), operands[0]), ctx),
+               "=>": _mk_binary(z3.Z3_mk_implies), "=": _mk_binary(z3.Z3_mk_eq),
+               "<=": _mk_binary(z3.Z3_mk_le), "<": _mk_binary(z3.Z3_mk_lt), "ite": _mk_ite, "+": _mk_add}
+
+sorts = {"Bool": z3.Bool, "Int": z3.Int}
+
+
+class Z3Target:
+
+    def __init__(self):
+        self.optimize = z3.Optimize()
+        self.symbols = {"true": z3.BoolVal(True), "false": z3.BoolVal(False)}
+        # Variables whose value is returned after solving, in the same order as get-value statements
+        self.values = []
+
+    def term(self, formula):
+        if isinstance(formula, z3.ExprRef):
+            return formula
+        if isinstance(formula, int):
+            if formula not in self.symbols:
+                self.symbols[formula] = z3.IntVal(formula)
+        return self.symbols[formula]
+
+    def connective(self, connective_name, formulas):
+        return connectives[connective_name]([self.term(formula).as_ast() for formula in formulas])
+
+    def declare(self, var_name, var_type):
+        self.symbols[var_name] = sorts[var_type](var_name)
+
+    def define(self, fun_name, fun_type, term):
+        self.symbols[fun_name] = self.term(term)
+
+    def add_assert(self, statement):
+        self.optimize.add(self.term(statement))
+
+    def add_assert_soft(self, statement, weight, id):
+        self.optimize.add_soft(self.term(statement), weight, id if id is not None else "")
+
+    def get_value(self, variable):
+        self.values.append(variable)
+
+    def set_timeout(self, time_in_ms):
+        self.optimize.set("timeout", int(time_in_ms))
+
+    # Solves the constraints and returns the answer as the result of a solver for the encoding (see SolverResult),
+    # whose values are the ones of the get-value statements. As with OMS, if the timeout is reached, the best model
+    # found is returned along with sat.
+    def solve(self):
+        result = self.optimize.check()
+
+        try:
+            model = self.optimize.model() if result != z3.unsat else None
+        except z3.Z3Exception:
+            model = None
+
+        # After reaching the timeout, the model can be empty if no solution has been found
+        if model is None or len(model) == 0:
+            return SolverResult(str(result))
+
+        solver_result = SolverResult("sat")
+        for variable in self.values:
+            kind, position = variable.split("_")
+            values = solver_result.theta if kind == "t" else solver_result.pushed_values
+            values[int(position)] = model.eval(self.symbols[variable], model_completion=True).as_long()
+        return solver_result
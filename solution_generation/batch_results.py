@@ -0,0 +1,68 @@
+import pathlib
+import sqlite3
+from default_encoding import sfs_feature_names
+
+
+# Results of optimizing a directory of isolated asm blocks (see --batch option). For each sub block, it stores
+# its initial cost, the cost of the solution found (NULL if there is none), the time spent by the solver, the
+# status returned by the solver (or lower_bound if the sub block was not solved) and whether the timeout was
+# reached. The features of each sub block (see extract_sfs_features) are stored in a separate table, so that the
+# results can be used to train a BlockPredictor. Blocks are stored along with their sub blocks in a single
+# transaction, so an interrupted batch can be resumed from the blocks that have not been stored yet. Blocks that
+# could not be optimized are stored with status "error" and the traceback of the error, and are processed again.
+class BatchResults:
+
+    def __init__(self, results_file):
+        pathlib.Path(results_file).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(results_file)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS blocks (block TEXT PRIMARY KEY, status TEXT, error TEXT)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS sub_blocks "
+                                "(block TEXT, sub_block TEXT, initial_cost INTEGER, optimized_cost INTEGER, "
+                                "solve_time REAL, status TEXT, timeout_hit INTEGER, PRIMARY KEY (block, sub_block))")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS sub_block_features (block TEXT, sub_block TEXT, " +
+                                ", ".join(name + " REAL" for name in sfs_feature_names) +
+                                ", PRIMARY KEY (block, sub_block))")
+
+        # Results stored before the error column was introduced
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(blocks)")]
+        if "error" not in columns:
+            self.connection.execute("ALTER TABLE blocks ADD COLUMN error TEXT")
+
+        self.connection.commit()
+        self.stored_blocks = 0
+
+    # Returns the names of the blocks whose results have already been stored, except the ones that failed
+    def processed_blocks(self):
+        return {row[0] for row in self.connection.execute("SELECT block FROM blocks WHERE status != 'error'")}
+
+    # Rows are tuples (sub_block, initial_cost, optimized_cost, solve_time, status, timeout_hit), optionally
+    # followed by the list of features of the sub block. error is the traceback of the error if the block failed
+    def store_block(self, block, status, rows, error=None):
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO sub_blocks VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                        [(block,) + tuple(row[:6]) for row in rows])
+            self.connection.executemany("INSERT OR REPLACE INTO sub_block_features VALUES (?, ?" +
+                                        ", ?" * len(sfs_feature_names) + ")",
+                                        [(block, row[0]) + tuple(row[6]) for row in rows if len(row) > 6])
+            self.connection.execute("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?)", (block, status, error))
+        self.stored_blocks += 1
+
+    # Returns the features of each sub block whose features have been stored, followed by its initial cost, optimized
+    # cost, solving time and whether the timeout was reached. Sub blocks skipped by the gas lower bound are excluded,
+    # as they were never sent to the solver
+    def training_samples(self):
+        return self.connection.execute("SELECT " + ", ".join("f." + name for name in sfs_feature_names) +
+                                       ", s.initial_cost, s.optimized_cost, s.solve_time, s.timeout_hit "
+                                       "FROM sub_blocks s JOIN sub_block_features f "
+                                       "ON s.block = f.block AND s.sub_block = f.sub_block "
+                                       "WHERE s.status != 'lower_bound'").fetchall()
+
+    def close(self):
+        self.connection.close()
+
+    def report(self):
+        total_blocks, = self.connection.execute("SELECT COUNT(*) FROM blocks").fetchone()
+        improved_sub_blocks, = self.connection.execute("SELECT COUNT(*) FROM sub_blocks "
+                                                       "WHERE optimized_cost < initial_cost").fetchone()
+        return "Batch results: " + str(self.stored_blocks) + " blocks processed in this execution, " + \
+               str(total_blocks) + " in total, " + str(improved_sub_blocks) + " sub blocks improved"
@@ -0,0 +1,110 @@
+import csv
+import heapq
+import json
+import math
+import os
+from collections import Counter
+from batch_results import BatchResults
+from default_encoding import sfs_feature_names, extract_sfs_features
+
+# Number of samples of the training data that are taken into account for each prediction
+neighbours = 10
+
+# The timeout predicted for a sub block is the longest time needed to solve its neighbours times this factor
+timeout_factor = 2
+
+
+# Predicts, for a sub block, whether it can be improved, the timeout it needs and the encoding flags that should be
+# used, from the sub blocks whose features (see extract_sfs_features) are the closest ones in the training data,
+# i.e. k nearest neighbours after dividing each feature by its standard deviation.
+# The model is a dict with the scale of each feature and two lists of samples:
+# - samples: sub blocks solved by --batch, represented as [features, number of sub blocks with the same features,
+#   number of them that have been improved, number of them that reached the timeout, longest solving time]
+# - winners: sub blocks solved by a portfolio, represented as [features, encoding flags of the configuration that won]
+class BlockPredictor:
+
+    def __init__(self, model):
+        self.scale = model['scale']
+        self.samples = model['samples']
+        self.winners = model['winners']
+
+    @staticmethod
+    def load(model_file):
+        with open(model_file) as f:
+            return BlockPredictor(json.load(f))
+
+    def save(self, model_file):
+        os.makedirs(os.path.dirname(os.path.abspath(model_file)), exist_ok=True)
+        with open(model_file, "w") as f:
+            json.dump({'features': sfs_feature_names, 'scale': self.scale, 'samples': self.samples,
+                       'winners': self.winners}, f)
+
+    def _nearest(self, samples, features):
+        return heapq.nsmallest(neighbours, samples, key=lambda sample: sum(
+            ((value - sample_value) / scale) ** 2 for value, sample_value, scale in zip(features, sample[0],
+                                                                                         self.scale)))
+
+    # Returns the timeout for the sub block: the longest time needed to solve its neighbours (times timeout_factor),
+    # or the given timeout if any of them reached it. Returns None if the sub block should not be solved, as none of
+    # its neighbours could be improved and the solver proved it for all of them
+    def predict_timeout(self, sfs_block, timeout):
+        nearest_samples = self._nearest(self.samples, extract_sfs_features(sfs_block))
+        if not nearest_samples:
+            return timeout
+
+        if all(improved == 0 and timeouts == 0 for _, _, improved, timeouts, _ in nearest_samples):
+            return None
+
+        if any(timeouts > 0 for _, _, _, timeouts, _ in nearest_samples):
+            return timeout
+
+        solve_time = max(sample_time for _, _, _, _, sample_time in nearest_samples)
+        return min(timeout, max(1, math.ceil(timeout_factor * solve_time)))
+
+    # Returns the encoding flags of the configuration that won the portfolio for most of the neighbours of the sub
+    # block (the nearest one in case of a tie), or no flag if there is no portfolio data
+    def predict_encoding_flags(self, sfs_block):
+        nearest_winners = self._nearest(self.winners, extract_sfs_features(sfs_block))
+        if not nearest_winners:
+            return {}
+
+        flags = Counter(tuple(sorted(flags)) for _, flags in nearest_winners).most_common(1)[0][0]
+        return {flag: True for flag in flags}
+
+
+# Trains a BlockPredictor from the results of --batch executions (see BatchResults.training_samples) and the
+# portfolio winners file (see store_portfolio_winner), which may not exist. Sub blocks with the same features
+# are grouped into a single sample.
+def train_block_predictor(results_files, winners_file):
+    samples = dict()
+    for results_file in results_files:
+        results = BatchResults(results_file)
+        for row in results.training_samples():
+            features = list(row[:len(sfs_feature_names)])
+            initial_cost, optimized_cost, solve_time, timeout_hit = row[len(sfs_feature_names):]
+            sample = samples.setdefault(tuple(features), [features, 0, 0, 0, 0])
+            sample[1] += 1
+            sample[2] += optimized_cost is not None and optimized_cost < initial_cost
+            sample[3] += bool(timeout_hit)
+            sample[4] = max(sample[4], solve_time)
+        results.close()
+
+    winners = []
+    if os.path.exists(winners_file):
+        with open(winners_file, newline="") as f:
+            for row in csv.DictReader(f):
+                # Rows stored before the features were added to the file are ignored. The first element of the
+                # name of a configuration is the solver, followed by its flags
+                if row['winner'] != "none" and all(row.get(name) for name in sfs_feature_names):
+                    winners.append([[float(row[name]) for name in sfs_feature_names], row['winner'].split("+")[1:]])
+
+    all_features = [sample[0] for sample in samples.values()] + [features for features, _ in winners]
+    scale = []
+    for i in range(len(sfs_feature_names)):
+        values = [features[i] for features in all_features]
+        mean = sum(values) / len(values) if values else 0
+        deviation = math.sqrt(sum((value - mean) ** 2 for value in values) / len(values)) if values else 0
+        # Features with the same value in every sample do not affect the distance
+        scale.append(deviation if deviation > 0 else 1)
+
+    return BlockPredictor({'scale': scale, 'samples': list(samples.values()), 'winners': winners})
@@ -100,51 +100,59 @@ def read_initial_dicts_from_files(contract_name, block_name):
     return opcodes_theta_dict, instruction_theta_dict, gas_theta_dict
 
 
-# Generates three structures containing all the info from the solver: the sequence of instructions
-# in plain text, the sequence of instructions converted to hexadecimal, the pushed values corresponding to push
-# opcodes and an int that contains the gas cost of this solution.
-def generate_info_from_solution(solver_output, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict = None):
+# Generates three structures containing all the info from the solver result (see SolverResult): the sequence of
+# instructions in plain text, the sequence of instructions converted to hexadecimal, the pushed values corresponding
+# to push opcodes and an int that contains the gas cost of this solution.
+def generate_info_from_solution(solver_result, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict = None):
     instr_sol = {}
     opcode_sol = {}
     pushed_values_decimal = {}
 
-    pattern1 = re.compile("t_([0-9]*) ([0-9]*)")
-    pattern2 = re.compile("a_([0-9]*) ([0-9]*)")
-
     total_gas = 0
 
-    for line in solver_output.splitlines():
-        for match in re.finditer(pattern1, line):
-            instruction_position = int(match.group(1))
-            instruction_theta = int(match.group(2))
-                # Nops are excluded. theta(NOP) = 2
-            if instruction_theta == 2:
-                break
-            instr_sol[instruction_position] = instruction_theta_dict[instruction_theta]
-            opcode_sol[instruction_position] = opcodes_theta_dict[instruction_theta]
-            total_gas += gas_theta_dict[instruction_theta]
-            if values_dict.get(instruction_theta, None) is not None:
-                pushed_values_decimal[instruction_position] = values_dict[instruction_theta]
-
-        for match in re.finditer(pattern2, line):
-            instruction_position = int(match.group(1))
-            pushed_value = match.group(2)
-
-            # Already special PUSH instructions
-            if instruction_position in pushed_values_decimal:
-                continue
-            pushed_values_decimal[instruction_position] = pushed_value
+    for instruction_position, instruction_theta in solver_result.theta.items():
+        # Nops are excluded. theta(NOP) = 2
+        if instruction_theta == 2:
+            continue
+        instr_sol[instruction_position] = instruction_theta_dict[instruction_theta]
+        opcode_sol[instruction_position] = opcodes_theta_dict[instruction_theta]
+        total_gas += gas_theta_dict[instruction_theta]
+        if values_dict.get(instruction_theta, None) is not None:
+            pushed_values_decimal[instruction_position] = values_dict[instruction_theta]
+
+    for instruction_position, pushed_value in solver_result.pushed_values.items():
+        # Already special PUSH instructions
+        if instruction_position in pushed_values_decimal:
+            continue
+        pushed_values_decimal[instruction_position] = pushed_value
 
     instr_sol, opcode_sol, pushed_values_decimal = generate_ordered_structures(instr_sol, opcode_sol, pushed_values_decimal)
     return instr_sol, opcode_sol, pushed_values_decimal, total_gas
 
 
-def generate_disasm_sol_from_output(solver_output, opcodes_theta_dict, instruction_theta_dict,
+def generate_disasm_sol_from_output(solver_result, opcodes_theta_dict, instruction_theta_dict,
                                                       gas_theta_dict, values_dict):
 
     instr_sol, _, pushed_values_decimal, _ = \
-        generate_info_from_solution(solver_output, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict)
+        generate_info_from_solution(solver_result, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict)
+
+    return generate_disasm_sol_from_instructions(instr_sol, pushed_values_decimal)
+
+
+# Same as generate_disasm_sol_from_output, but the solution is given as a sequence of instructions
+# following the log file format.
+def generate_disasm_sol_from_log(instr_sequence, opcodes_theta_dict, instruction_theta_dict,
+                                 gas_theta_dict, values_dict):
+
+    instr_sol, _, pushed_values_decimal, _ = \
+        generate_info_from_sequence(instr_sequence, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict)
+
+    return generate_disasm_sol_from_instructions(instr_sol, pushed_values_decimal)
+
 
+# Given a dict of instructions in assembly format with its corresponding position in the sequence as keys and
+# the pushed values in decimal format, returns the list of instructions in disassembly format
+def generate_disasm_sol_from_instructions(instr_sol, pushed_values_decimal):
     opcode_list = []
 
     for position, instr in instr_sol.items():
@@ -257,12 +265,12 @@ def generate_sub_block_asm_representation_from_log(instr_sequence,
 
 
 
-# Given the output obtained from executing the corresponding SMT solver and the corresponding dicts, it generates
-# the optimized sub-block following the AsmBytecode format.
-def generate_sub_block_asm_representation_from_output(solver_output, opcodes_theta_dict, instruction_theta_dict,
+# Given the result obtained from executing the corresponding SMT solver (see SolverResult) and the corresponding
+# dicts, it generates the optimized sub-block following the AsmBytecode format.
+def generate_sub_block_asm_representation_from_output(solver_result, opcodes_theta_dict, instruction_theta_dict,
                                                       gas_theta_dict, values_dict):
 
     instr_sol, _, pushed_values_decimal, _ = \
-        generate_info_from_solution(solver_output, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict)
+        generate_info_from_solution(solver_result, opcodes_theta_dict, instruction_theta_dict, gas_theta_dict, values_dict)
 
     return generate_sub_block_asm_representation_from_instructions(instr_sol, pushed_values_decimal)
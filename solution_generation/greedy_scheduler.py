@@ -0,0 +1,213 @@
+from collections import Counter
+from block_context import sfs_block_context
+
+
+# Builds a sequence of instructions for the sfs of a sub block without calling the solver, so that its cost can be
+# used as an upper bound for the solver (see gas_upper_bound_constraint) and as a fallback if the solver does not
+# find any solution. Stack elements are represented as in the sfs, i.e. lists whose first element is the top.
+# Values that are needed more than once are computed first. Then, the target stack is built from the bottom: each
+# element is computed on top of the stack, duplicating the values that are already in the stack unless they can be
+# consumed. Elements of the target stack only need to be in the stack, as they are swapped to their positions at the
+# end, once the elements that are not in the target stack have been removed.
+class GreedyScheduler:
+
+    def __init__(self, sfs_block):
+        self.bs = sfs_block['max_sk_sz']
+        self.max_length = sfs_block['init_progr_len']
+        self.target = sfs_block['tgt_ws']
+        self.stack = list(sfs_block['src_ws'])
+        # Whether each element of the stack has already been placed, either as an operand of an instruction that
+        # is being computed or as an element of the target stack. Only elements that have not can be consumed
+        self.placed = [False] * len(self.stack)
+        # Number of elements on top of the stack that are operands of instructions that have not been executed yet
+        self.pending = 0
+        self.instructions = {instr['outpt_sk'][0]: instr for instr in sfs_block['user_instrs'] if instr['outpt_sk']}
+        self.theta_dict = sfs_block_context(sfs_block).theta_dict
+        self.gas = {instr['id']: instr['gas'] for instr in sfs_block['user_instrs']}
+        self.gas.update({"PUSH": 3, "POP": 2})
+        self.sequence = []
+        self.cost = 0
+
+        # Elements at the bottom of the initial stack that are already in their final position are never modified
+        self.fixed = 0
+        while self.fixed < min(len(self.stack), len(self.target)) and \
+                self.stack[-self.fixed - 1] == self.target[-self.fixed - 1]:
+            self.fixed += 1
+
+        # Number of times each value is still needed, either as an operand or as an element of the target stack
+        self.uses = Counter()
+        for term in self.target[:len(self.target) - self.fixed]:
+            self._count_uses(term)
+
+    def _count_uses(self, term):
+        self.uses[term] += 1
+        # Operands of an instruction are only counted the first time its output is needed
+        if self.uses[term] == 1 and term in self.instructions and term not in self.stack:
+            for operand in self.instructions[term]['inpt_sk']:
+                self._count_uses(operand)
+
+    # Appends the instruction to the sequence. Raises ValueError if it cannot be represented in the encoding
+    # of the sub block, i.e. the stack overflows or the instruction accesses a position deeper than allowed
+    def _apply(self, instr, value=None):
+        if instr not in self.theta_dict:
+            raise ValueError("Instruction " + instr + " not available")
+
+        self.sequence.append(-value if instr == "PUSH" else self.theta_dict[instr])
+        self.cost += self.gas.get(instr, 3)
+
+        if len(self.stack) > self.bs:
+            raise ValueError("Stack size exceeded")
+
+    def _push(self, value):
+        self.stack.insert(0, value)
+        self.placed.insert(0, True)
+        self._apply("PUSH", value)
+
+    def _pop(self):
+        self.stack.pop(0)
+        self.placed.pop(0)
+        self._apply("POP")
+
+    def _dup(self, k):
+        self.stack.insert(0, self.stack[k - 1])
+        self.placed.insert(0, True)
+        self._apply("DUP" + str(k))
+
+    def _swap(self, k):
+        self.stack[0], self.stack[k] = self.stack[k], self.stack[0]
+        self.placed[0], self.placed[k] = self.placed[k], self.placed[0]
+        self._apply("SWAP" + str(k))
+
+    def _execute(self, instr):
+        del self.stack[:len(instr['inpt_sk'])]
+        del self.placed[:len(instr['inpt_sk'])]
+        self.stack.insert(0, instr['outpt_sk'][0])
+        self.placed.insert(0, True)
+        self._apply(instr['id'])
+
+    # Returns the position of an element with the given value that can be consumed, i.e. it is not needed anymore
+    # (apart from the reserved uses, which are satisfied by duplicating it once placed), it has not been placed and
+    # it is not part of the elements that are already in their final position. None if there is no such element
+    def _consumable_position(self, term, reserved):
+        if self.uses[term] > reserved:
+            return None
+        return next((i for i in range(len(self.stack) - self.fixed)
+                     if self.stack[i] == term and not self.placed[i]), None)
+
+    # Places the term on top of the stack, or anywhere in the stack if it is an element of the target stack.
+    # Reserved is the number of times the term appears in the operands that will be placed above it
+    def _materialize(self, term, is_target=False, reserved=0):
+        if isinstance(term, int):
+            self._push(term)
+            return
+
+        self.uses[term] -= 1
+        if term in self.stack:
+            position = self._consumable_position(term, reserved)
+            if position is not None and (position == 0 or is_target):
+                self.placed[position] = True
+            # Swapping the top is only possible if it is not an operand
+            elif position is not None and self.pending == 0 and "SWAP" + str(position) in self.theta_dict:
+                self._swap(position)
+                self.placed[0] = True
+            else:
+                position = self.stack.index(term)
+                self._dup(position + 1)
+                # Any copy can be part of the target stack, so the one that is not placed is kept on top
+                if is_target and not self.placed[position + 1] and position + 1 < len(self.stack) - self.fixed:
+                    self.placed[0], self.placed[position + 1] = False, True
+            return
+
+        if term not in self.instructions:
+            raise ValueError("Value " + term + " cannot be computed")
+
+        instr = self.instructions[term]
+        operands = instr['inpt_sk']
+        # The operands of a commutative instruction are computed in the order that allows consuming the top
+        # of the stack, if possible
+        if instr['commutative'] and len(operands) == 2 and self.stack and self.stack[0] == operands[0] \
+                and not self.placed[0] and self.uses[operands[0]] == 1:
+            operands = [operands[1], operands[0]]
+
+        for i in reversed(range(len(operands))):
+            self._materialize(operands[i], reserved=operands[:i].count(operands[i]))
+            self.pending += 1
+        self._execute(instr)
+        self.pending -= len(operands)
+
+    # Returns the outputs of the instructions that are needed more than once, so that their operands appear first
+    def _shared_terms(self, term, visited):
+        shared_terms = []
+        if term in visited or term not in self.instructions or term in self.stack:
+            return shared_terms
+
+        visited.add(term)
+        for operand in self.instructions[term]['inpt_sk']:
+            shared_terms.extend(self._shared_terms(operand, visited))
+        if self.uses[term] > 1:
+            shared_terms.append(term)
+        return shared_terms
+
+    # Removes the elements that are not in the target stack and swaps the remaining ones to their positions
+    def _arrange(self):
+        for _ in range(4 * (len(self.stack) + 1) ** 2):
+            offset = len(self.stack) - len(self.target)
+            if offset < 0:
+                break
+            if offset == 0 and self.stack == self.target:
+                return
+
+            top = self.stack[0]
+            # Positions of the target stack (aligned from the bottom) that must contain the top of the stack
+            positions = [i for i in range(max(offset, 1), len(self.stack))
+                         if self.target[i - offset] == top and self.stack[i] != top]
+
+            if positions:
+                self._swap(positions[0])
+            elif offset > 0:
+                self._pop()
+            else:
+                # The top is in its final position, so a misplaced element is moved to the top
+                self._swap(next(i for i in range(1, len(self.stack)) if self.stack[i] != self.target[i]))
+
+        raise ValueError("Target stack cannot be arranged")
+
+    def schedule(self):
+        # Initial elements that are not needed are removed first
+        while len(self.stack) > self.fixed and self.uses[self.stack[0]] == 0:
+            self._pop()
+
+        visited = set()
+        for term in reversed(self.target[:len(self.target) - self.fixed]):
+            for shared_term in self._shared_terms(term, visited):
+                # The value is left in the stack without using it, so that it is duplicated later
+                self._materialize(shared_term)
+                self.uses[shared_term] += 1
+                self.placed[0] = False
+
+        for term in reversed(self.target[:len(self.target) - self.fixed]):
+            while len(self.stack) > self.fixed and not self.placed[0] and self.uses[self.stack[0]] == 0:
+                self._pop()
+            self._materialize(term, True)
+
+        self._arrange()
+
+        if len(self.sequence) > self.max_length:
+            raise ValueError("Sequence longer than the maximum length")
+        return self.sequence
+
+
+# Given the sfs of a sub block, returns a sequence of instructions that produces its target stack (following the
+# format of the log file) and its gas cost, or (None, None) if the greedy scheduler cannot find one that fits
+# in the encoding of the sub block
+def generate_greedy_solution(sfs_block):
+    scheduler = GreedyScheduler(sfs_block)
+    try:
+        sequence = scheduler.schedule()
+    except ValueError:
+        return None, None
+
+    # As in the solutions found by the solver, NOP marks the end of the sequence
+    if len(sequence) < scheduler.max_length:
+        sequence = sequence + [scheduler.theta_dict["NOP"]]
+    return sequence, scheduler.cost
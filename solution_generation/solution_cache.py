@@ -0,0 +1,95 @@
+import hashlib
+import json
+import pathlib
+import sqlite3
+import time
+
+
+# Renames the stack variables that appear in the sfs following the order in which they appear for the first time
+# in the initial stack, the user instructions (sorted by id) and the final stack. Integers are kept as they are.
+def _alpha_rename(sfs_block):
+    renaming = {}
+
+    def rename(elem):
+        if type(elem) != str:
+            return elem
+        if elem not in renaming:
+            renaming[elem] = "s(" + str(len(renaming)) + ")"
+        return renaming[elem]
+
+    src_ws = list(map(rename, sfs_block['src_ws']))
+
+    user_instrs = []
+    for instr in sorted(sfs_block['user_instrs'], key=lambda k: k['id']):
+        new_instr = dict(instr)
+        new_instr['inpt_sk'] = list(map(rename, instr['inpt_sk']))
+        new_instr['outpt_sk'] = list(map(rename, instr['outpt_sk']))
+        user_instrs.append(new_instr)
+
+    tgt_ws = list(map(rename, sfs_block['tgt_ws']))
+    return src_ws, tgt_ws, user_instrs
+
+
+# Canonical signature of a sub block. Two sfs share the same signature iff they only differ in the names
+# of the stack variables, and hence, a solution for one of them is also valid for the other. Note that
+# the ids of the user instructions and the max stack size are included, as they determine the theta values.
+def canonical_block_signature(sfs_block):
+    src_ws, tgt_ws, user_instrs = _alpha_rename(sfs_block)
+    canonical_sfs = {'src_ws': src_ws, 'tgt_ws': tgt_ws, 'user_instrs': user_instrs,
+                     'max_sk_sz': sfs_block['max_sk_sz']}
+    return hashlib.sha256(json.dumps(canonical_sfs, sort_keys=True).encode()).hexdigest()
+
+
+# Persistent cache that links the canonical signature of a sub block to the sequence found by the solver,
+# following the same format as the log file (see generate_solution_dict), and whether it is optimal. Non-optimal
+# sequences (e.g. the solver reached the timeout) may be improved by a later execution, so they are not enough to
+# skip the solver. When the number of entries exceeds max_size, the least recently used ones are removed.
+class SolutionCache:
+
+    def __init__(self, cache_file, max_size):
+        pathlib.Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(cache_file)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS solutions "
+                                "(signature TEXT PRIMARY KEY, solution TEXT, last_used INTEGER, optimal INTEGER)")
+
+        # Caches created before the optimal column was introduced: their solutions are not known to be optimal
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(solutions)")]
+        if "optimal" not in columns:
+            self.connection.execute("ALTER TABLE solutions ADD COLUMN optimal INTEGER DEFAULT 0")
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    # Returns the sequence stored for the given sfs and whether it is optimal, or (None, False) if it has not been
+    # solved before. Only optimal sequences are counted as hits, as the remaining ones must be solved again
+    def get_solution(self, sfs_block):
+        signature = canonical_block_signature(sfs_block)
+        row = self.connection.execute("SELECT solution, optimal FROM solutions WHERE signature = ?",
+                                      (signature,)).fetchone()
+
+        if row is None or not row[1]:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        if row is None:
+            return None, False
+
+        self.connection.execute("UPDATE solutions SET last_used = ? WHERE signature = ?", (time.time_ns(), signature))
+        return json.loads(row[0]), bool(row[1])
+
+    def store_solution(self, sfs_block, solution, optimal):
+        self.connection.execute("INSERT OR REPLACE INTO solutions (signature, solution, last_used, optimal) "
+                                "VALUES (?, ?, ?, ?)", (canonical_block_signature(sfs_block), json.dumps(solution),
+                                                        time.time_ns(), int(optimal)))
+
+    # Removes the least recently used entries and stores the changes on disk
+    def close(self):
+        self.connection.execute("DELETE FROM solutions WHERE signature NOT IN "
+                                "(SELECT signature FROM solutions ORDER BY last_used DESC LIMIT ?)", (self.max_size,))
+        self.connection.commit()
+        self.connection.close()
+
+    def report(self):
+        return "Solution cache: " + str(self.hits) + " hits, " + str(self.misses) + " misses"
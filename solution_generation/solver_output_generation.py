@@ -4,37 +4,53 @@ from global_params.paths import *
 
 
 
-def run_command(cmd):
+# If input_str is given, it is passed to the command through the standard input
+def run_command(cmd, input_str=None):
     FNULL = open(os.devnull, 'w')
-    solc_p = subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE,
+    if input_str is None:
+        solc_p = subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE,
+                                  stderr=FNULL)
+        return solc_p.communicate()[0].decode()
+    solc_p = subprocess.Popen(shlex.split(cmd), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
                               stderr=FNULL)
-    return solc_p.communicate()[0].decode()
+    return solc_p.communicate(input_str.encode())[0].decode()
 
 
+# If smt_file is None, the solver reads the encoding from the standard input
 def get_solver_to_execute(smt_file, solver, tout):
     if solver == "z3":
+        if smt_file is None:
+            return z3_exec + " -smt2 -in"
         return z3_exec + " -smt2 " + smt_file
     elif solver == "barcelogic":
+        if smt_file is None:
+            smt_file = "/dev/stdin"
         if tout is None:
             return bclt_exec + " -file " + smt_file
         else:
             return bclt_exec + " -file " + smt_file + " -tlimit " + str(tout)
     else:
+        if smt_file is None:
+            return oms_exec
         return oms_exec + " " + smt_file
 
 
-# Calls syrup and computes the solution. Returns the raw output from the corresponding solver
-def generate_solution(block_name, solver, tout):
-    # encoding_file = encoding_path+"encoding_Z3.smt2"
-    encoding_file = smt_encoding_path + block_name + "_" + solver + ".smt2"
+# Calls syrup and computes the solution. Returns the raw output from the corresponding solver. If the encoding
+# is given as a string, it is passed to the solver directly. Otherwise, it is read from the corresponding file.
+def generate_solution(block_name, solver, tout, encoding_dir=smt_encoding_path, encoding=None):
+    if encoding is None:
+        # encoding_file = encoding_path+"encoding_Z3.smt2"
+        encoding_file = encoding_dir + block_name + "_" + solver + ".smt2"
+    else:
+        encoding_file = None
 
     exec_command = get_solver_to_execute(encoding_file, solver, tout)
 
     print("Executing " + solver + " for file " + block_name)
-    solution = run_command(exec_command)
+    solution = run_command(exec_command, encoding)
 
     return solution
 
 
-def obtain_solver_output(block_name, solver, tout):
-    return generate_solution(block_name, solver, tout)
+def obtain_solver_output(block_name, solver, tout, encoding_dir=smt_encoding_path, encoding=None):
+    return generate_solution(block_name, solver, tout, encoding_dir, encoding)
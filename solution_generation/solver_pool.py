@@ -0,0 +1,153 @@
+import queue
+import shlex
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from solver_output_generation import get_solver_to_execute
+
+# Line printed by the solver (through the echo command) once it has answered all the commands of a query
+query_end = "@gasol-end"
+
+# Extra seconds given to a solver process to answer a query before it is considered stuck and restarted
+timeout_margin = 10
+
+
+# Splits the encoding of a block into the header, i.e. the commands that must appear before any other
+# command and cannot be scoped (set-logic and produce-models), and the body with the remaining commands.
+def split_encoding(encoding):
+    header, body = [], []
+    for line in encoding.splitlines():
+        if line.startswith("(set-logic") or line.startswith("(set-option :produce-models"):
+            header.append(line)
+        else:
+            body.append(line)
+    return header, body
+
+
+def _read_lines(stream, lines):
+    for line in stream:
+        lines.put(line)
+    # EOF: the process has finished
+    lines.put(None)
+
+
+# Long-lived solver process that receives the encodings through a pipe. Each query is enclosed in a
+# (push 1)/(pop 1) scope, so the assertions of a block do not interfere with the following ones. If the
+# solver rejects the scoped query, the block is solved again after a (reset) command.
+class SolverSession:
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.start()
+
+    def start(self):
+        self.process = subprocess.Popen(shlex.split(get_solver_to_execute(None, self.solver, None)),
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, universal_newlines=True, bufsize=1)
+        self.lines = queue.Queue()
+        threading.Thread(target=_read_lines, args=(self.process.stdout, self.lines), daemon=True).start()
+        # Header currently declared in the solver. None if the solver must be reset before the next query
+        self.header = []
+
+    def restart(self):
+        self.process.kill()
+        self.process.wait()
+        self.start()
+
+    # Sends the commands followed by the echo command and returns the output of the solver until the echo
+    # is reached, and whether it was reached. If the solver does not answer on time or finishes unexpectedly, it is
+    # restarted and the output received so far is returned. In that case, the new process has received none of the
+    # commands.
+    def query(self, commands, tout):
+        deadline = time.monotonic() + tout + timeout_margin if tout else None
+
+        try:
+            self.process.stdin.write("\n".join(commands) + "\n(echo \"" + query_end + "\")\n")
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            self.restart()
+            return "", False
+
+        output = []
+        while True:
+            try:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                line = None
+
+            if line is None:
+                self.restart()
+                return "".join(output), False
+            if line.strip().strip('"') == query_end:
+                return "".join(output), True
+            output.append(line)
+
+    def solve(self, encoding, tout):
+        header, body = split_encoding(encoding)
+
+        # The header is only declared if the solver has answered. Otherwise, it has been restarted
+        if header != self.header:
+            _, answered = self.query(["(reset)"] + header, tout)
+            if answered:
+                self.header = header
+
+        if header == self.header:
+            output, answered = self.query(["(push 1)"] + body + ["(pop 1)"], tout)
+
+            # If the solver has not answered on time, solving it again would not help
+            if not answered or "(error" not in output:
+                return output
+
+        output, answered = self.query(["(reset)", encoding], tout)
+        if answered:
+            # The assertions of the whole encoding remain after solving it this way
+            self.header = None
+        return output
+
+    def close(self):
+        try:
+            self.process.stdin.write("(exit)\n")
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout_margin)
+        except (BrokenPipeError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+# Pool of solver sessions. Queries are assigned to the first session available, so at most size
+# blocks are solved at the same time.
+class SolverPool:
+
+    def __init__(self, solver, size):
+        self.solver = solver
+        self.size = size
+        self.sessions = queue.Queue()
+        for _ in range(size):
+            self.sessions.put(SolverSession(solver))
+
+    # Returns the raw output of the solver for the given encoding, as obtain_solver_output
+    def solve(self, block_name, encoding, tout):
+        session = self.sessions.get()
+        try:
+            print("Executing " + self.solver + " for file " + block_name)
+            return session.solve(encoding, tout)
+        finally:
+            self.sessions.put(session)
+
+    # Same as solve, but also returns the time it took. Solve_all never waits for a session, as it uses one thread per
+    # session
+    def solve_with_time(self, block_name, encoding, tout):
+        start = time.time()
+        output = self.solve(block_name, encoding, tout)
+        return output, time.time() - start
+
+    # Given a list of queries, represented as tuples (block_name, encoding, timeout), returns the output
+    # of the solver for each of them and the time spent solving it, in the same order
+    def solve_all(self, queries):
+        with ThreadPoolExecutor(self.size) as executor:
+            return list(executor.map(lambda query: self.solve_with_time(*query), queries))
+
+    def close(self):
+        while not self.sessions.empty():
+            self.sessions.get().close()
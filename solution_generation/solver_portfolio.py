@@ -0,0 +1,83 @@
+import csv
+import fcntl
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+from solver_output_generation import get_solver_to_execute
+from solver_solution_verify import parse_solver_output
+from default_encoding import sfs_feature_names
+
+# Extra seconds given to the solvers to answer once the timeout has been reached before they are killed
+timeout_margin = 5
+
+# Columns of the file that stores the configuration that won the portfolio for each sub block, along with the
+# features of the sub block (see extract_sfs_features)
+winners_fields = ["block"] + sfs_feature_names + ["winner", "status", "solve_time"]
+
+
+def _communicate(index, process, encoding, start, answers):
+    output = process.communicate(encoding)[0]
+    answers.put((index, output, time.time() - start))
+
+
+# Runs several solvers on the same sub block at the same time. Queries are represented as tuples (config_name, solver,
+# encoding), where the encoding has been generated for the corresponding solver. As soon as a solver proves its
+# solution is optimal (i.e. it answers before the timeout), the remaining ones are killed. Otherwise, once every
+# solver has answered (or has been killed after the timeout), the cheapest solution according to solution_cost is
+# chosen. The output of each solver is parsed once (see SolverResult). Returns the name of the configuration that won
+# and its result, or None and the last result received if no solver has found a solution.
+def solve_with_portfolio(block_name, queries, tout, solution_cost):
+    print("Executing portfolio (" + ", ".join(config_name for config_name, _, _ in queries) + ") for file " + block_name)
+
+    start = time.time()
+    answers = queue.Queue()
+    processes = []
+    for index, (_, solver, encoding) in enumerate(queries):
+        process = subprocess.Popen(shlex.split(get_solver_to_execute(None, solver, tout)), stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+        processes.append(process)
+        threading.Thread(target=_communicate, args=(index, process, encoding, start, answers), daemon=True).start()
+
+    deadline = start + tout + timeout_margin
+    winner, best_result, best_cost, last_result = None, None, None, parse_solver_output("")
+    try:
+        for _ in queries:
+            try:
+                index, output, solve_time = answers.get(timeout=max(deadline - time.time(), 0))
+            except queue.Empty:
+                break
+
+            last_result = parse_solver_output(output)
+            if not last_result.is_correct():
+                continue
+
+            if last_result.status == "optimal" or solve_time < tout:
+                return queries[index][0], last_result
+
+            cost = solution_cost(last_result)
+            if best_result is None or cost < best_cost:
+                winner, best_result, best_cost = queries[index][0], last_result, cost
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+
+    return winner, best_result if best_result is not None else last_result
+
+
+# Appends a row (see winners_fields) to the csv file that stores the winner of each sub block. The file is locked
+# while writing, as sub blocks may be solved by several processes.
+def store_portfolio_winner(winners_file, row):
+    os.makedirs(os.path.dirname(winners_file), exist_ok=True)
+    with open(winners_file, "a", newline="") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            writer = csv.writer(f)
+            if f.seek(0, os.SEEK_END) == 0:
+                writer.writerow(winners_fields)
+            writer.writerow(row)
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
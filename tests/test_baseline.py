@@ -0,0 +1,52 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import unittest
+
+import gasol_asm
+from gasol_asm import asm_blocks_with_contract_name, compute_sfs_dict_from_asm_block, load_baseline, \
+    optimize_sub_blocks_with_baseline
+from sfs_generator.parser_asm import parse_asm
+from verification.sfs_verify import have_same_terms
+
+
+class TestBaseline(unittest.TestCase):
+
+    def test_same_terms_with_different_variable_names(self):
+        add = {'id': 'ADD_0', 'opcode': '01', 'disasm': 'ADD', 'inpt_sk': ["s(0)", 31], 'outpt_sk': ["s(1)"],
+               'gas': 3, 'commutative': True}
+        and_31 = {'id': 'AND_0', 'opcode': '16', 'disasm': 'AND', 'inpt_sk': ["s(1)", 31], 'outpt_sk': ["s(2)"],
+                  'gas': 3, 'commutative': True}
+        sfs_block = {'src_ws': ["s(0)"], 'tgt_ws': ["s(2)"], 'user_instrs': [add, and_31]}
+
+        renamed_sfs_block = {'src_ws': ["s(0)"], 'tgt_ws': ["s(5)"], 'user_instrs': [
+            dict(add, inpt_sk=[31, "s(0)"], outpt_sk=["s(4)"]), dict(and_31, inpt_sk=["s(4)", 31], outpt_sk=["s(5)"])]}
+        self.assertTrue(have_same_terms(sfs_block, renamed_sfs_block))
+
+        # The instruction that computes the target stack is the same, but one of its operands is not
+        changed_sfs_block = {'src_ws': ["s(0)"], 'tgt_ws': ["s(2)"], 'user_instrs': [
+            dict(add, inpt_sk=["s(0)", 63]), and_31]}
+        self.assertFalse(have_same_terms(sfs_block, changed_sfs_block))
+
+    def test_unchanged_sub_blocks_are_not_solved(self):
+        asm_file = "examples/jsons-solc/0x363c421901B7BDCa0f2a17dA03948D676bE350E4.json_solc"
+        tasks = []
+        for contract_name, block in asm_blocks_with_contract_name(parse_asm(asm_file).getContracts()):
+            sfs_dict = compute_sfs_dict_from_asm_block(block, contract_name)
+            tasks += [(contract_name, block_name, sfs_dict[block_name], 10) for block_name in sfs_dict]
+
+        # No sub block was optimized in the baseline, so no solution has to be verified either
+        gasol_asm.baseline_sub_blocks = load_baseline(asm_file, {})
+        try:
+            solutions = optimize_sub_blocks_with_baseline(tasks)
+        finally:
+            gasol_asm.baseline_sub_blocks = None
+
+        self.assertEqual([(None, block_name) for _, block_name, _, _ in tasks],
+                         [(solution, block_name) for solution, block_name, _, _, _ in solutions])
+
+
+if __name__ == '__main__':
+    unittest.main()
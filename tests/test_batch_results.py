@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+
+import unittest
+import tempfile
+
+import gasol_asm
+from gasol_asm import optimize_isolated_asm_block_in_batch
+from solution_generation.batch_results import BatchResults
+from verification.solver_solution_verify import get_solver_status
+
+
+class TestBatchResults(unittest.TestCase):
+
+    def test_stored_blocks_are_processed_after_reopening(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results_file = tmp_dir + "/batch/results.db"
+
+            results = BatchResults(results_file)
+            results.store_block("block1.disasm_blk", "done", [("block0", 10, 7, 0.5, "sat", False),
+                                                              ("block0.1", 3, None, 0, "lower_bound", False)])
+            results.store_block("block2.disasm_blk", "error", [], "RuntimeError: The solver failed")
+            results.close()
+
+            # Blocks that failed are processed again
+            results = BatchResults(results_file)
+            self.assertEqual({"block1.disasm_blk"}, results.processed_blocks())
+            self.assertEqual(("error", "RuntimeError: The solver failed"),
+                             results.connection.execute("SELECT status, error FROM blocks "
+                                                        "WHERE block = 'block2.disasm_blk'").fetchone())
+            self.assertEqual([("block0", 7), ("block0.1", None)],
+                             results.connection.execute("SELECT sub_block, optimized_cost FROM sub_blocks "
+                                                        "ORDER BY sub_block").fetchall())
+            results.close()
+
+    def test_blocks_whose_solver_fails_are_errors(self):
+        def solve_sub_block(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir=None):
+            raise RuntimeError("The solver failed")
+
+        previous_solve_sub_block = gasol_asm.solve_sub_block
+        gasol_asm.solve_sub_block = solve_sub_block
+        try:
+            result = optimize_isolated_asm_block_in_batch(("examples/blocks/block1000.disasm_blk", 1))
+        finally:
+            gasol_asm.solve_sub_block = previous_solve_sub_block
+
+        file_name, status, rows, error = result
+        self.assertEqual(("block1000.disasm_blk", "error", []), (file_name, status, rows))
+        self.assertIn("RuntimeError: The solver failed", error)
+
+    def test_solver_status(self):
+        self.assertEqual("sat", get_solver_status("sat\n(objectives\n (gas 12)\n)\n((t_0 1))\n"))
+        self.assertEqual("unknown", get_solver_status("unknown\n(error \"model is not available\")\n"))
+        self.assertEqual("error", get_solver_status(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+
+import copy
+import unittest
+
+from block_context import BlockContext, sfs_block_context
+from encoding_utils import generate_stack_theta, generate_uninterpreted_theta, generate_instr_map, \
+    generate_disasm_map, generate_costs_ordered_dict, generate_uninterpreted_push_map
+
+
+user_instrs = [{'id': "PUSHTAG_0", 'opcode': "00", 'disasm': "PUSH [tag]", 'inpt_sk': [], 'value': [12],
+                'outpt_sk': ["s(3)"], 'gas': 3, 'commutative': False},
+               {'id': "ADD_0", 'opcode': "01", 'disasm': "ADD", 'inpt_sk': ["s(0)", "s(1)"], 'outpt_sk': ["s(4)"],
+                'gas': 3, 'commutative': True},
+               {'id': "SLOAD_0", 'opcode': "54", 'disasm': "SLOAD", 'inpt_sk': ["s(4)"], 'outpt_sk': ["s(5)"],
+                'gas': 800, 'commutative': False}]
+
+
+class TestBlockContext(unittest.TestCase):
+
+    def test_same_maps_as_generators(self):
+        bs = 5
+        block_context = BlockContext(bs, user_instrs)
+
+        theta_stack = generate_stack_theta(bs)
+        theta_comm, theta_non_comm = generate_uninterpreted_theta(user_instrs, len(theta_stack))
+        theta_dict = dict(theta_stack, **theta_comm, **theta_non_comm)
+        self.assertEqual(theta_dict, block_context.theta_dict)
+        self.assertEqual(generate_instr_map(user_instrs, theta_stack, theta_comm, theta_non_comm),
+                         block_context.instr_map)
+        self.assertEqual(generate_costs_ordered_dict(bs, user_instrs, theta_dict), block_context.costs_map)
+        self.assertEqual(generate_uninterpreted_push_map(user_instrs, theta_dict), block_context.value_map)
+
+        disasm_map = generate_disasm_map(user_instrs, theta_dict)
+        self.assertEqual(disasm_map, block_context.disasm_map)
+        self.assertEqual("91", disasm_map[theta_dict["SWAP2"]])
+        self.assertEqual("80", disasm_map[theta_dict["DUP1"]])
+        self.assertEqual("54", disasm_map[theta_dict["SLOAD_0"]])
+
+    def test_contexts_are_built_once_per_sub_block(self):
+        sfs_block = {'max_sk_sz': 5, 'user_instrs': user_instrs}
+        block_context = sfs_block_context(sfs_block)
+        self.assertIs(block_context, sfs_block_context(sfs_block))
+        self.assertIs(block_context, sfs_block_context(dict(sfs_block, init_progr_len=4)))
+
+        # Other sfs with the same user instructions (e.g. received from another process) get their own context
+        other_context = sfs_block_context({'max_sk_sz': 5, 'user_instrs': copy.deepcopy(user_instrs)})
+        self.assertIsNot(block_context, other_context)
+        self.assertEqual(block_context.theta_maps(), other_context.theta_maps())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/solution_generation")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/verification")
+
+import tempfile
+import unittest
+
+from batch_results import BatchResults
+from block_predictor import BlockPredictor, train_block_predictor
+from solver_portfolio import store_portfolio_winner
+
+
+# Sub block with n_instrs independent CALLER instructions, whose features only differ in the number of instructions
+def caller_sfs_block(n_instrs):
+    instrs = [{'id': 'CALLER_' + str(i), 'opcode': '33', 'disasm': 'CALLER', 'inpt_sk': [],
+               'outpt_sk': ["s(" + str(i) + ")"], 'gas': 2, 'commutative': False} for i in range(n_instrs)]
+    return {'src_ws': [], 'tgt_ws': ["s(" + str(i) + ")" for i in range(n_instrs)], 'user_instrs': instrs,
+            'init_progr_len': n_instrs, 'max_sk_sz': n_instrs, 'current_cost': 2 * n_instrs}
+
+
+class TestBlockPredictor(unittest.TestCase):
+
+    def test_predictions_follow_the_nearest_sub_blocks(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results = BatchResults(tmp_dir + "/results.db")
+            # Small sub blocks are never improved, medium ones are improved quickly and big ones reach the timeout
+            rows = [("block" + str(n), 2 * n, 2 * n, 0.2, "sat", False, [n, n, n, 0, 0, 1]) for n in range(1, 15)] + \
+                   [("block" + str(n), 2 * n, n, 1.2, "sat", False, [n, n, n, 0, 0, 1]) for n in range(20, 30)] + \
+                   [("block" + str(n), 2 * n, None, 10, "unknown", True, [n, n, n, 0, 0, 1]) for n in range(40, 50)]
+            results.store_block("blocks.disasm_blk", "done", rows)
+            results.close()
+
+            winners_file = tmp_dir + "/winners.csv"
+            for n in range(40, 50):
+                store_portfolio_winner(winners_file, ["block" + str(n), n, n, n, 0, 0, 1,
+                                                      "oms+symmetry-breaking", "sat", 10])
+
+            model_file = tmp_dir + "/model.json"
+            train_block_predictor([tmp_dir + "/results.db"], winners_file).save(model_file)
+            predictor = BlockPredictor.load(model_file)
+
+        self.assertIsNone(predictor.predict_timeout(caller_sfs_block(5), 10))
+        self.assertEqual(3, predictor.predict_timeout(caller_sfs_block(25), 10))
+        self.assertEqual(10, predictor.predict_timeout(caller_sfs_block(45), 10))
+        self.assertEqual({'symmetry-breaking': True}, predictor.predict_encoding_flags(caller_sfs_block(25)))
+
+    def test_sub_blocks_skipped_by_the_lower_bound_are_not_samples(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results = BatchResults(tmp_dir + "/results.db")
+            # Medium sub blocks are improved quickly. Bigger ones were never sent to the solver
+            rows = [("block" + str(n), 2 * n, n, 1.2, "sat", False, [n, n, n, 0, 0, 1]) for n in range(20, 30)] + \
+                   [("block" + str(n), 2 * n, None, 0, "lower_bound", False, [n, n, n, 0, 0, 1]) for n in range(30, 45)]
+            results.store_block("blocks.disasm_blk", "done", rows)
+            results.close()
+
+            predictor = train_block_predictor([tmp_dir + "/results.db"], tmp_dir + "/winners.csv")
+
+        self.assertEqual(3, predictor.predict_timeout(caller_sfs_block(35), 10))
+
+    def test_predictor_without_training_data(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            predictor = train_block_predictor([tmp_dir + "/results.db"], tmp_dir + "/winners.csv")
+
+        self.assertEqual(10, predictor.predict_timeout(caller_sfs_block(5), 10))
+        self.assertEqual({}, predictor.predict_encoding_flags(caller_sfs_block(5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import time
+import unittest
+
+import gasol_asm
+from gasol_asm import optimize_sub_blocks_with_budget
+from verification.solver_solution_verify import SolverResult
+
+
+class TestBudget(unittest.TestCase):
+
+    def test_sub_blocks_are_not_solved_after_the_budget(self):
+        solved_sub_blocks = []
+
+        # Each sub block takes half a second to be solved, and no solution is found
+        def solve_sub_block(block_name, sfs_block, timeout, gas_upper_bound, encoding_dir=None):
+            solved_sub_blocks.append(block_name)
+            time.sleep(0.5)
+            return SolverResult()
+
+        sfs_block = {'src_ws': ["s(0)"], 'tgt_ws': [], 'user_instrs': [], 'current_cost': 2, 'max_progr_len': 1}
+        tasks = [("block" + str(i), sfs_block, 10) for i in range(20)]
+
+        previous_solve_sub_block = gasol_asm.solve_sub_block
+        gasol_asm.solve_sub_block = solve_sub_block
+        try:
+            start = time.time()
+            solutions = optimize_sub_blocks_with_budget(tasks, 2)
+            elapsed_time = time.time() - start
+        finally:
+            gasol_asm.solve_sub_block = previous_solve_sub_block
+
+        self.assertLessEqual(elapsed_time, 2)
+        self.assertLess(len(solved_sub_blocks), len(tasks))
+        # Sub blocks that were not solved keep their original instructions
+        self.assertEqual([(None, block_name, False) for block_name, _, _ in tasks],
+                         [(solution, block_name, is_optimal)
+                          for (solution, block_name, _, _, _), is_optimal in solutions])
+
+
+if __name__ == '__main__':
+    unittest.main()
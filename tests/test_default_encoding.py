@@ -0,0 +1,70 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+
+import unittest
+
+from default_encoding import infer_gas_lower_bound, infer_length_upper_bound, extract_sfs_features, \
+    activate_default_encoding, instruction_order_min_length, infer_dependency_depth
+
+
+class TestDefaultEncoding(unittest.TestCase):
+
+    def test_gas_lower_bound_with_stack_operations(self):
+        # s(0) must be removed and 9 and 10 must be pushed
+        self.assertEqual(8, infer_gas_lower_bound(["s(0)"], [9, 10], []))
+
+    def test_gas_lower_bound_with_missing_element(self):
+        # ADD(s(0), s(0)): s(0) is needed twice, so it must be duplicated
+        add = {'id': 'ADD_0', 'opcode': '01', 'disasm': 'ADD', 'inpt_sk': ["s(0)", "s(0)"], 'outpt_sk': ["s(1)"],
+               'gas': 3, 'commutative': True, 'storage': False, 'size': 1}
+        self.assertEqual(6, infer_gas_lower_bound(["s(0)"], ["s(1)"], [add]))
+
+    def test_gas_lower_bound_considers_repeated_instructions(self):
+        # CALLER can be executed twice instead of duplicating its output
+        caller = {'id': 'CALLER_0', 'opcode': '33', 'disasm': 'CALLER', 'inpt_sk': [], 'outpt_sk': ["s(0)"],
+                  'gas': 2, 'commutative': False, 'storage': False, 'size': 1}
+        self.assertEqual(4, infer_gas_lower_bound([], ["s(0)", "s(0)"], [caller]))
+
+    def test_length_upper_bound(self):
+        # Sequences with ADD and two other instructions cost at least 7, so they are not cheaper than 7
+        add = {'id': 'ADD_0', 'opcode': '01', 'disasm': 'ADD', 'inpt_sk': ["s(0)", "s(1)"], 'outpt_sk': ["s(2)"],
+               'gas': 3, 'commutative': True, 'storage': False, 'size': 1}
+        self.assertEqual(2, infer_length_upper_bound(7, [add]))
+        self.assertEqual(3, infer_length_upper_bound(8, [add]))
+        self.assertEqual(0, infer_length_upper_bound(3, [add]))
+
+    def test_sfs_features(self):
+        # ADD(SLOAD(s(0)), CALLER): the dependency depth is 2
+        add = {'id': 'ADD_0', 'opcode': '01', 'disasm': 'ADD', 'inpt_sk': ["s(1)", "s(2)"], 'outpt_sk': ["s(3)"],
+               'gas': 3, 'commutative': True, 'storage': False, 'size': 1}
+        sload = {'id': 'SLOAD_0', 'opcode': '54', 'disasm': 'SLOAD', 'inpt_sk': ["s(0)"], 'outpt_sk': ["s(1)"],
+                 'gas': 700, 'commutative': False, 'storage': False, 'size': 1}
+        caller = {'id': 'CALLER_0', 'opcode': '33', 'disasm': 'CALLER', 'inpt_sk': [], 'outpt_sk': ["s(2)"],
+                  'gas': 2, 'commutative': False, 'storage': False, 'size': 1}
+        sfs_block = {'src_ws': ["s(0)"], 'tgt_ws': ["s(3)"], 'user_instrs': [add, sload, caller],
+                     'init_progr_len': 4, 'max_sk_sz': 2, 'current_cost': 708}
+        self.assertEqual([3, 4, 2, 0.333, 1, 2], extract_sfs_features(sfs_block))
+
+    def test_dependency_depth_of_long_chains(self):
+        # NOT(NOT(...NOT(s(0)))): longer than the recursion limit
+        n_instrs = sys.getrecursionlimit() + 100
+        instrs = [{'id': 'NOT_' + str(i), 'opcode': '19', 'disasm': 'NOT', 'inpt_sk': ["s(" + str(i) + ")"],
+                   'outpt_sk': ["s(" + str(i + 1) + ")"], 'gas': 3, 'commutative': False, 'storage': False,
+                   'size': 1} for i in range(n_instrs)]
+        self.assertEqual(n_instrs, infer_dependency_depth(instrs))
+        self.assertEqual(0, infer_dependency_depth([]))
+
+    def test_instruction_order_in_large_blocks(self):
+        caller = {'id': 'CALLER_0', 'opcode': '33', 'disasm': 'CALLER', 'inpt_sk': [], 'outpt_sk': ["s(0)"],
+                  'gas': 2, 'commutative': False, 'storage': False, 'size': 1}
+        for b0 in [instruction_order_min_length - 1, instruction_order_min_length]:
+            flags = activate_default_encoding([], ["s(0)"], [caller], b0, {'instruction-order': False})
+            with self.subTest(b0=b0):
+                self.assertEqual(b0 >= instruction_order_min_length, flags['instruction-order'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+
+import re
+import unittest
+
+from encoding_files import initialize_dir_and_streams
+from encoding_utils import move, u, x, generate_instruction_order_structures
+from smtlib_utils import add_and, add_eq
+
+
+# Replaces the names of the shared terms in term by their definitions in the encoding
+def expand_definitions(term, encoding):
+    definitions = dict(re.findall(r"\(define-fun (\S+) \(\) Bool (.*)\)$", encoding, re.MULTILINE))
+    while any(name in term for name in definitions):
+        for name, definition in definitions.items():
+            term = re.sub(re.escape(name) + r"(?=[\s)]|$)", definition, term)
+    return term
+
+
+class TestEncodingUtils(unittest.TestCase):
+
+    def test_shared_move_contains_every_position(self):
+        for alpha, beta, delta in [(0, 14, 1), (1, 6, 0), (3, 3, -2), (5, 12, -1)]:
+            encoding_stream = initialize_dir_and_streams("oms", in_memory=True)
+            term = move(4, alpha, beta, delta)
+
+            atoms = re.findall(r"\(and \(= u[^\s)]+ u[^\s)]+\) \(= x[^\s)]+ x[^\s)]+\)\)",
+                               expand_definitions(term, encoding_stream.getvalue()))
+            expected_atoms = [add_and(add_eq(u(i + delta, 5), u(i, 4)), add_eq(x(i + delta, 5), x(i, 4)))
+                              for i in range(alpha, beta + 1)]
+            with self.subTest(alpha=alpha, beta=beta, delta=delta):
+                self.assertEqual(expected_atoms, atoms)
+
+    def test_shared_move_is_defined_once(self):
+        encoding_stream = initialize_dir_and_streams("oms", in_memory=True)
+        self.assertEqual(move(2, 0, 6, 1), move(2, 0, 6, 1))
+        definitions = re.findall(r"\(define-fun (\S+)", encoding_stream.getvalue())
+        self.assertEqual(len(set(definitions)), len(definitions))
+        self.assertEqual("true", move(2, 3, 2, 0))
+
+    def test_instruction_order_structures(self):
+        # MUL(ADD(SLOAD(CALLER), CALLER), 5), with CALLER also in the final stack
+        user_instr = [{'id': "CALLER_0", 'inpt_sk': [], 'outpt_sk': ["s(1)"]},
+                      {'id': "SLOAD_0", 'inpt_sk': ["s(1)"], 'outpt_sk': ["s(2)"]},
+                      {'id': "ADD_0", 'inpt_sk': ["s(2)", "s(1)"], 'outpt_sk': ["s(3)"]},
+                      {'id': "MUL_0", 'inpt_sk': ["s(3)", 5], 'outpt_sk': ["s(4)"]},
+                      {'id': "MSTORE_0", 'inpt_sk': ["s(0)", "s(1)"], 'outpt_sk': []}]
+        dependency_graph, first_position_appears, first_position_cannot_appear = \
+            generate_instruction_order_structures(8, user_instr, ["MUL_0", "CALLER_0"], True)
+
+        self.assertEqual({'CALLER_0': [], 'SLOAD_0': [("CALLER_0", -1)],
+                          'ADD_0': [("SLOAD_0", -1), ("CALLER_0", -1)], 'MUL_0': [("ADD_0", -1), ("PUSH", 5)],
+                          'MSTORE_0': [("CALLER_0", -1)]}, dependency_graph)
+        # CALLER is needed twice by ADD, but it can be duplicated
+        self.assertEqual({'PUSH': 0, 'CALLER_0': 0, 'SLOAD_0': 1, 'ADD_0': 3, 'MUL_0': 5, 'MSTORE_0': 1},
+                         first_position_appears)
+        self.assertEqual({'PUSH': 8, 'MUL_0': 8, 'ADD_0': 7, 'SLOAD_0': 6, 'CALLER_0': 5},
+                         first_position_cannot_appear)
+
+    def test_instruction_order_structures_of_long_chains(self):
+        # NOT(NOT(...NOT(s(0))))
+        n = 3000
+        user_instr = [{'id': "NOT_" + str(i), 'inpt_sk': ["s(" + str(i) + ")"], 'outpt_sk': ["s(" + str(i + 1) + ")"]}
+                      for i in range(n)]
+        _, first_position_appears, first_position_cannot_appear = \
+            generate_instruction_order_structures(n, user_instr, ["NOT_" + str(n - 1)], True)
+        self.assertEqual(n - 1, first_position_appears["NOT_" + str(n - 1)])
+        self.assertEqual(1, first_position_cannot_appear["NOT_0"])
+
+
+if __name__ == '__main__':
+    unittest.main()
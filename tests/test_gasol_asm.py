@@ -6,9 +6,26 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 import unittest
 
 import json
-from gasol_asm import filter_optimized_blocks_by_intra_block_optimization
+from gasol_asm import filter_optimized_blocks_by_intra_block_optimization, log_block_id, \
+    compare_asm_block_asm_format, compute_sfs_dict_from_asm_block, sub_block_stack_heights
+from sfs_generator.asm_block import AsmBlock
 from sfs_generator.asm_bytecode import AsmBytecode
 
+
+def asm_block_from_instructions(instructions):
+    block = AsmBlock("C", 3, False)
+    for disasm, value in instructions:
+        block.addInstructions(AsmBytecode(-1, -1, -1, disasm, value))
+    block.compute_stack_size()
+    return block
+
+
+def asm_block_with_second_sub_block(sub_block):
+    return asm_block_from_instructions([("tag", "1"), ("JUMPDEST", None), ("PUSH", "1"), ("DUP2", None), ("ADD", None),
+                                        ("PUSH", "0"), ("SSTORE", None)] + sub_block +
+                                       [("PUSH [tag]", "2"), ("JUMP", None)])
+
+
 class TestGasolASM(unittest.TestCase):
     def test_intra_block_optimization_1(self):
         asm_blocks = [ [AsmBytecode(-1,-1,-1,"POP", -1)], [AsmBytecode(-1,-1,-1,"POP", -1)], "Error",
@@ -20,6 +37,12 @@ class TestGasolASM(unittest.TestCase):
         expected_result =  [None, None, 'b', 'c', None, None, None, None]
         self.assertEqual(expected_result, filter_optimized_blocks_by_intra_block_optimization(asm_sub_blocks, optimized_blocks))
 
+    def test_log_block_id(self):
+        # Sub blocks from the same block are verified in the same query
+        self.assertEqual("MerkleDistributor_block12", log_block_id("MerkleDistributor_block12.3"))
+        self.assertEqual("MerkleDistributor_block12", log_block_id("MerkleDistributor_block12"))
+        self.assertEqual("MerkleProof_initial_block0", log_block_id("MerkleProof_initial_block0.1"))
+
     def test_log_generation_1(self):
         asm_path1 = "tests/files/0x363c421901B7BDCa0f2a17dA03948D676bE350E4_optimized.json_solc"
         with open(asm_path1) as f:
@@ -40,6 +63,38 @@ class TestGasolASM(unittest.TestCase):
 
         self.assertDictEqual(asm_json1, asm_json2)
 
+    def test_verification_of_changed_sub_blocks(self):
+        old_block = asm_block_with_second_sub_block([("PUSH", "2"), ("DUP2", None), ("MUL", None), ("SWAP1", None),
+                                                     ("POP", None)])
+        self.assertEqual([1, 1], sub_block_stack_heights(old_block))
+        old_sfs_dict = compute_sfs_dict_from_asm_block(old_block, "C")
+
+        # Unchanged sub blocks are accepted without computing their sfs
+        self.assertTrue(compare_asm_block_asm_format(old_block, old_block.copy(), "C", {}))
+
+        new_block = asm_block_with_second_sub_block([("DUP1", None), ("PUSH", "2"), ("MUL", None), ("SWAP1", None),
+                                                     ("POP", None)])
+        self.assertTrue(compare_asm_block_asm_format(old_block, new_block, "C", old_sfs_dict))
+        self.assertTrue(compare_asm_block_asm_format(old_block, new_block, "C"))
+
+        wrong_block = asm_block_with_second_sub_block([("DUP1", None), ("PUSH", "3"), ("MUL", None), ("SWAP1", None),
+                                                       ("POP", None)])
+        self.assertFalse(compare_asm_block_asm_format(old_block, wrong_block, "C", old_sfs_dict))
+        self.assertFalse(compare_asm_block_asm_format(old_block, wrong_block, "C"))
+
+    def test_changed_sub_block_invalidates_the_next_one(self):
+        def asm_block_with_first_sub_block(sub_block):
+            return asm_block_from_instructions([("tag", "1"), ("JUMPDEST", None)] + sub_block +
+                                               [("SSTORE", None), ("POP", None), ("PUSH [tag]", "2"), ("JUMP", None)])
+
+        old_block = asm_block_with_first_sub_block([("PUSH", "1"), ("DUP2", None), ("SWAP1", None)])
+        old_sfs_dict = compute_sfs_dict_from_asm_block(old_block, "C")
+
+        # The unchanged POP after SSTORE removes an element that is no longer duplicated by the first sub block
+        wrong_block = asm_block_with_first_sub_block([("PUSH", "1")])
+        self.assertFalse(compare_asm_block_asm_format(old_block, wrong_block, "C", old_sfs_dict))
+        self.assertFalse(compare_asm_block_asm_format(old_block, wrong_block, "C"))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,108 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/solution_generation")
+
+import importlib.util
+import unittest
+
+from gasol_asm import compute_sfs_dict_from_asm_block, generate_optimized_sequence_from_solution
+from gasol_encoder import execute_syrup_backend_z3, generate_theta_dict_from_sequence
+from greedy_scheduler import generate_greedy_solution
+from sfs_generator.parser_asm import parse_asm
+from verification.solver_solution_verify import check_solver_output_is_correct, generate_solution_dict
+
+
+# Symbolic representation of a stack element: instructions are represented by their disasm and their operands
+def symbolic_term(term, instructions):
+    if term not in instructions:
+        return term
+
+    instr = instructions[term]
+    operands = [symbolic_term(operand, instructions) for operand in instr['inpt_sk']]
+    if instr['commutative']:
+        operands.sort(key=str)
+    return instr['disasm'], str(instr.get('value')), tuple(operands)
+
+
+# Executes the sequence (following the format of the log file) from the initial stack of the sfs and returns the
+# symbolic representation of the resulting stack
+def execute_sequence(sfs_block, sequence):
+    instructions = {instr['outpt_sk'][0]: instr for instr in sfs_block['user_instrs']}
+    theta_instr = {theta: instr for instr, theta in
+                   generate_theta_dict_from_sequence(sfs_block['max_sk_sz'], sfs_block['user_instrs'])[0].items()}
+    instr_by_id = {instr['id']: instr for instr in sfs_block['user_instrs']}
+
+    stack = [symbolic_term(term, instructions) for term in sfs_block['src_ws']]
+    for elem in sequence:
+        instr = "PUSH" if elem <= 0 else theta_instr[elem]
+        if instr == "NOP":
+            break
+        elif instr == "PUSH":
+            stack.insert(0, -elem)
+        elif instr == "POP":
+            stack.pop(0)
+        elif instr.startswith("DUP"):
+            stack.insert(0, stack[int(instr[3:]) - 1])
+        elif instr.startswith("SWAP"):
+            k = int(instr[4:])
+            stack[0], stack[k] = stack[k], stack[0]
+        else:
+            user_instr = instr_by_id[instr]
+            operands = stack[:len(user_instr['inpt_sk'])]
+            del stack[:len(user_instr['inpt_sk'])]
+            if user_instr['commutative']:
+                operands.sort(key=str)
+            stack.insert(0, (user_instr['disasm'], str(user_instr.get('value')), tuple(operands)))
+        assert len(stack) <= sfs_block['max_sk_sz']
+    return stack
+
+
+class TestGreedyScheduler(unittest.TestCase):
+
+    def test_greedy_solutions_produce_target_stack(self):
+        asm = parse_asm("examples/jsons-solc/0x363c421901B7BDCa0f2a17dA03948D676bE350E4.json_solc")
+        found_solutions = 0
+        for c in asm.getContracts():
+            if not c.has_asm_field():
+                continue
+            contract_name = (c.getContractName().split("/")[-1]).split(":")[-1]
+            blocks = c.getInitCode() + [block for identifier in c.getDataIds() for block in c.getRunCodeOf(identifier)]
+
+            for block in blocks:
+                for block_name, sfs_block in compute_sfs_dict_from_asm_block(block, contract_name).items():
+                    solution, cost = generate_greedy_solution(sfs_block)
+                    if solution is None:
+                        continue
+
+                    found_solutions += 1
+                    instructions = {instr['outpt_sk'][0]: instr for instr in sfs_block['user_instrs']}
+                    with self.subTest(block=block_name):
+                        self.assertLessEqual(len(solution), sfs_block['init_progr_len'])
+                        self.assertEqual([symbolic_term(term, instructions) for term in sfs_block['tgt_ws']],
+                                         execute_sequence(sfs_block, solution))
+                        self.assertEqual(cost, generate_optimized_sequence_from_solution(sfs_block, solution)[1])
+
+        self.assertGreater(found_solutions, 0)
+
+    @unittest.skipIf(importlib.util.find_spec("z3") is None, "z3 Python API is not installed")
+    def test_upper_bound_keeps_optimal_solution(self):
+        # s(0) + s(0) on top of 1: PUSH1 0x1 SWAP1 DUP1 ADD is the original sequence
+        sfs_block = {'src_ws': ["s(0)"], 'tgt_ws': ["s(1)", 1], 'max_sk_sz': 3, 'vars': ["s(0)", "s(1)"],
+                     'current_cost': 12, 'init_progr_len': 4, 'max_progr_len': 4,
+                     'user_instrs': [{'id': 'ADD_0', 'opcode': '01', 'disasm': 'ADD', 'inpt_sk': ["s(0)", "s(0)"],
+                                      'outpt_sk': ["s(1)"], 'gas': 3, 'commutative': True, 'size': 1}]}
+        greedy_solution, greedy_cost = generate_greedy_solution(sfs_block)
+        self.assertEqual(sfs_block['current_cost'], greedy_cost)
+
+        solver_output = execute_syrup_backend_z3(sfs_block, "block0", timeout=10, gas_upper_bound=greedy_cost).solve()
+        self.assertTrue(check_solver_output_is_correct(solver_output))
+        solution = generate_solution_dict(solver_output)
+        self.assertEqual(execute_sequence(sfs_block, greedy_solution), execute_sequence(sfs_block, solution))
+        self.assertLessEqual(generate_optimized_sequence_from_solution(sfs_block, solution)[1], greedy_cost)
+
+
+if __name__ == '__main__':
+    unittest.main()
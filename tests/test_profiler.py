@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import tempfile
+import unittest
+
+from global_params import profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def tearDown(self):
+        profiler.events_dir = None
+
+    def test_phases_are_not_measured_if_disabled(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with profiler.phase("sfs"):
+                pass
+            self.assertEqual([], profiler.load_events(tmp_dir))
+
+    def test_phases_are_tagged_with_the_context(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profiler.start(tmp_dir + "/profile", {'file': "input.json_solc"})
+            profiler.set_context(contract="C", block="block3")
+            with profiler.phase("sfs"):
+                with profiler.phase("simplification"):
+                    pass
+            with profiler.phase("solver", sub_block="block3.1"):
+                pass
+            profiler.set_context(contract=None, block=None)
+            with profiler.phase("rebuild"):
+                pass
+
+            events = profiler.load_events(tmp_dir + "/profile")
+
+        self.assertEqual(["sfs", "simplification", "solver", "rebuild"], [event['phase'] for event in events])
+        self.assertTrue(all(event['file'] == "input.json_solc" for event in events))
+        self.assertEqual("block3.1", events[2]['sub_block'])
+        self.assertTrue(events[0]['wall'] >= events[1]['wall'])
+
+        profile = profiler.aggregate_events(events)
+        self.assertEqual(["sfs", "simplification", "solver", "rebuild"], list(profile['phases']))
+        self.assertEqual(["input.json_solc"], list(profile['files']))
+        self.assertEqual(["C"], list(profile['contracts']))
+        self.assertEqual(["C_block3"], list(profile['blocks']))
+        self.assertEqual(1, profile['blocks']["C_block3"]['solver']['count'])
+
+    def test_blocks_of_sub_blocks_without_contract(self):
+        events = [{'phase': "solver", 'sub_block': "block7.2", 'start': 0, 'wall': 1.5, 'cpu': 0.5},
+                  {'phase': "solver", 'sub_block': "block7.0", 'start': 2, 'wall': 0.5, 'cpu': 0.5}]
+        self.assertEqual({'block7': {'solver': {'wall': 2, 'cpu': 1, 'count': 2}}},
+                         profiler.aggregate_events(events)['blocks'])
+
+    def test_chrome_trace(self):
+        events = [{'phase': "encoding", 'file': "a", 'contract': "C", 'block': "block1", 'start': 1.5, 'wall': 0.25,
+                   'cpu': 0.2, 'pid': 10, 'tid': 20}]
+        self.assertEqual({'traceEvents': [{'name': "encoding", 'cat': "gasol", 'ph': "X", 'ts': 1500000, 'dur': 250000,
+                                           'pid': 10, 'tid': 20,
+                                           'args': {'file': "a", 'contract': "C", 'block': "block1", 'cpu': 0.2}}],
+                          'displayTimeUnit': "ms"}, profiler.chrome_trace(events))
+
+
+if __name__ == '__main__':
+    unittest.main()
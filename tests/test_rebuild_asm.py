@@ -5,8 +5,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
 import unittest
 
-from sfs_generator.parser_asm import parse_asm
-from sfs_generator.rebuild_asm import rebuild_asm
+import sfs_generator.parser_asm as parser_asm
+from sfs_generator.parser_asm import parse_asm, parse_asm_incrementally
+from sfs_generator.rebuild_asm import rebuild_asm, write_asm_incrementally
+import io
 import json
 import glob
 
@@ -23,6 +25,24 @@ class TestRebuildASM(unittest.TestCase):
             with self.subTest(msg="Failed at " + input_path):
                 self.assertDictEqual(data, final_json)
 
+    def test_incremental_rebuild_with_json_solc_examples(self):
+        project_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+        # Small chunks, so that contracts are split among several reads
+        chunk_size = parser_asm.chunk_size
+        parser_asm.chunk_size = 1000
+        try:
+            for input_path in glob.glob(project_path + "/examples/jsons-solc/*.json_solc"):
+                asm, contracts = parse_asm_incrementally(input_path)
+                output = io.StringIO()
+                write_asm_incrementally(output, asm, contracts)
+
+                with open(input_path) as f:
+                    data = json.load(f)
+                with self.subTest(msg="Failed at " + input_path):
+                    self.assertDictEqual(data, json.loads(output.getvalue()))
+        finally:
+            parser_asm.chunk_size = chunk_size
+
 
 if __name__ == '__main__':
     unittest.main()
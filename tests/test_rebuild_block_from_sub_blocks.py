@@ -23,6 +23,27 @@ class TestRebuildBlockFromSubBlocks(unittest.TestCase):
                 with self.subTest(msg="Failed at " + input_path):
                     self.assertDictEqual(prev_contract_dict, new_contract_dict)
 
+    def test_replacing_code_of_copy_does_not_modify_contract(self):
+        project_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+        for input_path in glob.glob(project_path + "/examples/jsons-solc/*.json_solc"):
+            asm = parse_asm(input_path)
+            for c in asm.getContracts():
+                prev_contract_dict = rebuild_asm_contract(c)
+                new_contract = c.copy()
+                new_contract.setInitCode([])
+
+                for identifier in c.getDataIds():
+                    new_run_code = []
+                    for block in c.getRunCodeOf(identifier):
+                        new_block = block.copy()
+                        new_block.setInstructions([])
+                        new_run_code.append(new_block)
+
+                    new_contract.setRunCode(identifier, new_run_code)
+
+                with self.subTest(msg="Failed at " + input_path):
+                    self.assertDictEqual(prev_contract_dict, rebuild_asm_contract(c))
+
     def test_copy_blocks_leads_to_same_asm(self):
         project_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
         for input_path in glob.glob(project_path + "/examples/jsons-solc/*.json_solc"):
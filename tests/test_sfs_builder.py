@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from gasol_asm import compute_original_sfs_with_simplifications, preprocess_instructions
+from sfs_generator.parser_asm import parse_asm
+
+
+class TestSFSBuilder(unittest.TestCase):
+
+    def test_concurrent_sfs_generation(self):
+        asm = parse_asm("examples/jsons-solc/0x363c421901B7BDCa0f2a17dA03948D676bE350E4.json_solc")
+        blocks = []
+        for c in asm.getContracts():
+            if c.has_asm_field():
+                contract_name = (c.getContractName().split("/")[-1]).split(":")[-1]
+                blocks += [(contract_name, block) for block in c.getInitCode()]
+                for identifier in c.getDataIds():
+                    blocks += [(contract_name, block) for block in c.getRunCodeOf(identifier)]
+
+        def compute_sfs(contract_name_and_block):
+            contract_name, block = contract_name_and_block
+            instructions = preprocess_instructions(block.getInstructions())
+            return compute_original_sfs_with_simplifications(instructions, block.getSourceStack(), contract_name,
+                                                             block.getBlockId(), block.get_is_init_block())
+
+        sequential_sfs = list(map(compute_sfs, blocks))
+        with ThreadPoolExecutor(4) as executor:
+            concurrent_sfs = list(executor.map(compute_sfs, blocks))
+
+        self.assertEqual(sequential_sfs, concurrent_sfs)
+
+
+if __name__ == '__main__':
+    unittest.main()
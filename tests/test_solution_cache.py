@@ -0,0 +1,78 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import sqlite3
+import unittest
+import tempfile
+
+from solution_generation.solution_cache import SolutionCache, canonical_block_signature
+
+
+def generate_sfs(first_var, second_var, output_var):
+    return {'src_ws': [first_var, second_var], 'tgt_ws': [output_var], 'max_sk_sz': 3, 'vars': [],
+            'user_instrs': [{'id': 'ADD_0', 'opcode': '01', 'disasm': 'ADD', 'inpt_sk': [first_var, second_var],
+                             'outpt_sk': [output_var], 'gas': 3, 'commutative': True, 'storage': False, 'size': 1}]}
+
+
+class TestSolutionCache(unittest.TestCase):
+
+    def test_signature_does_not_depend_on_variable_names(self):
+        self.assertEqual(canonical_block_signature(generate_sfs("s(0)", "s(1)", "s(2)")),
+                         canonical_block_signature(generate_sfs("s(5)", "s(3)", "s(7)")))
+
+    def test_signature_depends_on_stack_order(self):
+        sfs = generate_sfs("s(0)", "s(1)", "s(2)")
+        swapped_sfs = generate_sfs("s(0)", "s(1)", "s(2)")
+        swapped_sfs['src_ws'] = ["s(1)", "s(0)"]
+        self.assertNotEqual(canonical_block_signature(sfs), canonical_block_signature(swapped_sfs))
+
+    def test_least_recently_used_solutions_are_evicted(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = tmp_dir + "/solutions.db"
+            first_sfs, second_sfs = generate_sfs("s(0)", "s(1)", "s(2)"), generate_sfs("s(0)", "s(1)", "s(2)")
+            second_sfs['max_sk_sz'] = 4
+
+            cache = SolutionCache(cache_file, 1)
+            cache.store_solution(first_sfs, [7, 2], True)
+            cache.store_solution(second_sfs, [7, 8, 2], True)
+            cache.close()
+
+            cache = SolutionCache(cache_file, 1)
+            self.assertEqual((None, False), cache.get_solution(first_sfs))
+            renamed_sfs = generate_sfs("s(4)", "s(5)", "s(9)")
+            renamed_sfs['max_sk_sz'] = 4
+            self.assertEqual(([7, 8, 2], True), cache.get_solution(renamed_sfs))
+            self.assertEqual((1, 1), (cache.hits, cache.misses))
+            cache.close()
+
+    def test_non_optimal_solutions_are_not_hits(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sfs = generate_sfs("s(0)", "s(1)", "s(2)")
+            cache = SolutionCache(tmp_dir + "/solutions.db", 10)
+            cache.store_solution(sfs, [7, 8, 2], False)
+            self.assertEqual(([7, 8, 2], False), cache.get_solution(sfs))
+
+            cache.store_solution(sfs, [7, 2], True)
+            self.assertEqual(([7, 2], True), cache.get_solution(sfs))
+            self.assertEqual((1, 1), (cache.hits, cache.misses))
+            cache.close()
+
+    def test_solutions_of_previous_caches_are_not_optimal(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = tmp_dir + "/solutions.db"
+            sfs = generate_sfs("s(0)", "s(1)", "s(2)")
+            connection = sqlite3.connect(cache_file)
+            connection.execute("CREATE TABLE solutions (signature TEXT PRIMARY KEY, solution TEXT, last_used INTEGER)")
+            connection.execute("INSERT INTO solutions VALUES (?, ?, ?)", (canonical_block_signature(sfs), "[7, 2]", 0))
+            connection.commit()
+            connection.close()
+
+            cache = SolutionCache(cache_file, 10)
+            self.assertEqual(([7, 2], False), cache.get_solution(sfs))
+            cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/solution_generation")
+
+import tempfile
+import unittest
+
+import solver_pool
+from solver_pool import SolverSession
+
+# Solver that answers sat to check-sat and never answers once the logic STUCK is set
+fake_solver = """
+import sys
+import time
+
+for line in sys.stdin:
+    line = line.strip()
+    if line == "(set-logic STUCK)":
+        time.sleep(60)
+    elif line == "(check-sat)":
+        print("sat", flush=True)
+    elif line.startswith("(echo"):
+        print(line[len("(echo "):-1], flush=True)
+"""
+
+
+class TestSolverPool(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        solver_file = self.tmp_dir.name + "/solver.py"
+        with open(solver_file, "w") as f:
+            f.write(fake_solver)
+
+        self.previous_solver, self.previous_margin = solver_pool.get_solver_to_execute, solver_pool.timeout_margin
+        solver_pool.get_solver_to_execute = lambda *args: sys.executable + " " + solver_file
+        solver_pool.timeout_margin = 0
+
+    def tearDown(self):
+        solver_pool.get_solver_to_execute, solver_pool.timeout_margin = self.previous_solver, self.previous_margin
+        self.tmp_dir.cleanup()
+
+    def test_header_is_not_kept_if_the_solver_is_restarted(self):
+        session = SolverSession("oms")
+        queries = []
+        query = session.query
+        session.query = lambda commands, tout: queries.append(commands) or query(commands, tout)
+        try:
+            self.assertEqual("", session.solve("(set-logic STUCK)\n(check-sat)", 1))
+            # The process that replaced the stuck one has no header
+            self.assertEqual([], session.header)
+
+            queries.clear()
+            self.assertEqual("sat\n", session.solve("(set-logic QF_LIA)\n(check-sat)", 1))
+            self.assertEqual(["(set-logic QF_LIA)"], session.header)
+            self.assertEqual([["(reset)", "(set-logic QF_LIA)"], ["(push 1)", "(check-sat)", "(pop 1)"]], queries)
+
+            # The header is already declared
+            queries.clear()
+            self.assertEqual("sat\n", session.solve("(set-logic QF_LIA)\n(check-sat)", 1))
+            self.assertEqual([["(push 1)", "(check-sat)", "(pop 1)"]], queries)
+        finally:
+            session.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/solution_generation")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/verification")
+
+import csv
+import tempfile
+import unittest
+
+from gasol_asm import parse_portfolio
+from solver_portfolio import store_portfolio_winner, winners_fields
+
+
+class TestSolverPortfolio(unittest.TestCase):
+
+    def test_parse_portfolio(self):
+        self.assertEqual([("oms", "oms", {}), ("z3", "z3", {}),
+                          ("oms+symmetry-breaking+at-most", "oms", {'symmetry-breaking': True, 'at-most': True})],
+                         parse_portfolio("oms,z3,oms+symmetry-breaking+at-most"))
+        self.assertRaises(ValueError, parse_portfolio, "oms,cvc5")
+        self.assertRaises(ValueError, parse_portfolio, "oms+initial-solution")
+
+    def test_winners_are_appended_with_a_single_header(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            winners_file = tmp_dir + "/portfolio/winners.csv"
+            store_portfolio_winner(winners_file, ["block0", 3, 4, 3, 0.333, 0, 2, "oms", "sat", 0.1])
+            store_portfolio_winner(winners_file, ["block1", 5, 9, 5, 0, 1, 3, "none", "unknown", 10.0])
+
+            with open(winners_file) as f:
+                rows = list(csv.reader(f))
+            self.assertEqual([winners_fields, ["block0", "3", "4", "3", "0.333", "0", "2", "oms", "sat", "0.1"],
+                              ["block1", "5", "9", "5", "0", "1", "3", "none", "unknown", "10.0"]], rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import unittest
+
+from verification.solver_solution_verify import SolverResult, parse_solver_output, generate_solution_dict, \
+    check_solver_output_is_correct
+
+
+class TestSolverSolutionVerify(unittest.TestCase):
+
+    def test_parse_oms_output(self):
+        solver_result = parse_solver_output("sat\n(objectives\n (gas 12)\n)\n((t_0 0))\n((a_0 4))\n((t_1 5))\n"
+                                            "((a_1 0))\n((t_2 2))\n((a_2 0))\n((t_3 2))\n((a_3 0))\n")
+        self.assertEqual("sat", solver_result.status)
+        self.assertEqual({'gas': 12}, solver_result.objectives)
+        self.assertEqual({0: 0, 1: 5, 2: 2, 3: 2}, solver_result.theta)
+        self.assertEqual({0: 4, 1: 0, 2: 0, 3: 0}, solver_result.pushed_values)
+        self.assertTrue(check_solver_output_is_correct(solver_result))
+        # The sequence ends at the first NOP
+        self.assertEqual([-4, 5, 2], generate_solution_dict(solver_result))
+
+    def test_values_in_any_order(self):
+        solver_result = parse_solver_output("optimal\n((a_1 255) (t_1 0))\n((t_0 7) (a_0 0))\n")
+        self.assertEqual("optimal", solver_result.status)
+        self.assertEqual([7, -255], generate_solution_dict(solver_result))
+
+    def test_no_solution(self):
+        self.assertFalse(parse_solver_output("unsat\n(error \"model is not available\")\n").is_correct())
+        self.assertEqual("unknown", parse_solver_output("unknown\n").status)
+        self.assertEqual("error", parse_solver_output("").status)
+        self.assertFalse(SolverResult().is_correct())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+
+import importlib.util
+import unittest
+
+from gasol_encoder import execute_syrup_backend, execute_syrup_backend_z3, generate_theta_dict_from_sequence
+from verification.solver_solution_verify import check_solver_output_is_correct, generate_solution_dict
+
+
+# ADD(CALLER, 0x1) on top of ADDRESS: both CALLER and ADDRESS have no operands, so SWAP1 is never needed
+sfs_block = {'src_ws': ["s(0)"], 'tgt_ws': ["s(3)", "s(2)", "s(0)"], 'max_sk_sz': 5,
+             'vars': ["s(0)", "s(1)", "s(2)", "s(3)"], 'current_cost': 16, 'init_progr_len': 6, 'max_progr_len': 6,
+             'user_instrs': [{'id': 'CALLER_0', 'opcode': '33', 'disasm': 'CALLER', 'inpt_sk': [],
+                              'outpt_sk': ["s(1)"], 'gas': 2, 'commutative': False, 'storage': False, 'size': 1},
+                             {'id': 'ADDRESS_0', 'opcode': '30', 'disasm': 'ADDRESS', 'inpt_sk': [],
+                              'outpt_sk': ["s(2)"], 'gas': 2, 'commutative': False, 'storage': False, 'size': 1},
+                             {'id': 'ADD_0', 'opcode': '01', 'disasm': 'ADD', 'inpt_sk': [1, "s(1)"],
+                              'outpt_sk': ["s(3)"], 'gas': 3, 'commutative': True, 'storage': False, 'size': 1}]}
+
+
+class TestSymmetryBreaking(unittest.TestCase):
+
+    def test_constraints_are_only_added_with_flag(self):
+        encoding = execute_syrup_backend(None, sfs_block, block_name="block0", in_memory=True)
+        encoding_with_flag = execute_syrup_backend(None, sfs_block, block_name="block0", in_memory=True,
+                                                   encoding_flags={'symmetry-breaking': True})
+        self.assertNotIn("; Independent instructions are not reordered using SWAP1", encoding)
+        self.assertIn("; Independent instructions are not reordered using SWAP1", encoding_with_flag)
+
+    @unittest.skipIf(importlib.util.find_spec("z3") is None, "z3 Python API is not installed")
+    def test_optimal_solution_is_kept(self):
+        _, instruction_theta_dict, _, _, _ = generate_theta_dict_from_sequence(sfs_block['max_sk_sz'],
+                                                                               sfs_block['user_instrs'])
+        solutions = []
+        for flag in [False, True]:
+            solver_output = execute_syrup_backend_z3(sfs_block, "block0", timeout=10,
+                                                     encoding_flags={'symmetry-breaking': flag}).solve()
+            self.assertTrue(check_solver_output_is_correct(solver_output))
+            # Pushed values are represented as non positive numbers
+            solutions.append(["PUSH" if theta <= 0 else instruction_theta_dict[theta]
+                              for theta in generate_solution_dict(solver_output)[:-1]])
+
+        # ADDRESS PUSH CALLER ADD: every instruction appears once and no stack operation is needed
+        self.assertEqual(4, len(solutions[0]))
+        self.assertEqual(len(solutions[0]), len(solutions[1]))
+        self.assertNotIn("SWAP1", solutions[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/smt_encoding")
+
+import importlib.util
+import unittest
+
+from gasol_encoder import execute_syrup_backend, execute_syrup_backend_z3, generate_theta_dict_from_sequence
+from verification.solver_solution_verify import check_solver_output_is_correct, generate_solution_dict
+
+
+# ADD(s(0), s(1)) with the stack [s(1), s(0)], i.e. the arguments must be swapped or ADD must be used as commutative
+sfs_block = {'src_ws': ["s(1)", "s(0)"], 'tgt_ws': ["s(2)", "s(0)"], 'max_sk_sz': 4, 'vars': ["s(0)", "s(1)", "s(2)"],
+             'current_cost': 12, 'init_progr_len': 4, 'max_progr_len': 4,
+             'user_instrs': [{'id': 'ADD_0', 'opcode': '01', 'disasm': 'ADD', 'inpt_sk': ["s(0)", "s(1)"],
+                              'outpt_sk': ["s(2)"], 'gas': 3, 'commutative': True, 'storage': False, 'size': 1}]}
+
+
+@unittest.skipIf(importlib.util.find_spec("z3") is None, "z3 Python API is not installed")
+class TestZ3Target(unittest.TestCase):
+
+    def test_text_encoding_is_not_modified(self):
+        first_encoding = execute_syrup_backend(None, sfs_block, block_name="block0", in_memory=True)
+        execute_syrup_backend_z3(sfs_block, "block0")
+        self.assertEqual(first_encoding, execute_syrup_backend(None, sfs_block, block_name="block0", in_memory=True))
+
+    def test_optimal_solution_from_python_api(self):
+        solver_output = execute_syrup_backend_z3(sfs_block, "block0", timeout=10).solve()
+        self.assertTrue(check_solver_output_is_correct(solver_output))
+
+        _, instruction_theta_dict, _, _, _ = generate_theta_dict_from_sequence(sfs_block['max_sk_sz'],
+                                                                               sfs_block['user_instrs'])
+        # DUP2 ADD: DUP2 duplicates s(0), and ADD consumes s(0) and s(1)
+        self.assertEqual(["DUP2", "ADD", "NOP"],
+                         [instruction_theta_dict[theta] for theta in generate_solution_dict(solver_output)])
+
+
+if __name__ == '__main__':
+    unittest.main()
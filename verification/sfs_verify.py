@@ -103,6 +103,36 @@ def compare_variables(var_origin, var_opt, src_origin, src_opt, user_def_origin,
     return True
 
 
+# Returns the target stack of the sfs as a list of terms. Elements computed by an instruction are represented as
+# tuples with the name of the instruction, its value (for instructions such as PUSHTAG) and the terms of its
+# operands, which are sorted if the instruction is commutative. Integers and elements of the source stack are
+# represented as they appear in the sfs
+def target_stack_terms(json_sfs):
+    instructions = {instr["outpt_sk"][0]: instr for instr in json_sfs["user_instrs"] if instr["outpt_sk"]}
+    terms = {}
+
+    def term(var):
+        if is_integer(var) or var not in instructions:
+            return var
+
+        if var not in terms:
+            instr = instructions[var]
+            operands = [term(elem) for elem in instr["inpt_sk"]]
+            if instr["commutative"]:
+                operands.sort(key=repr)
+            terms[var] = (instr["disasm"], repr(instr.get("value")), tuple(operands))
+        return terms[var]
+
+    return [term(var) for var in json_sfs["tgt_ws"]]
+
+
+# Stricter version of are_equals: both sfs must have the same source stack and their target stacks must contain
+# the same terms, regardless of the names of the stack variables
+def have_same_terms(json_orig, json_opt):
+    return json_orig["src_ws"] == json_opt["src_ws"] and \
+        target_stack_terms(json_orig) == target_stack_terms(json_opt)
+
+
 # Given two lists of sfs_dict (possibly, corresponding to the sub blocks from the same block)
 # compares the equivalence between them.
 def verify_block_from_list_of_sfs(old_sfs_dict, new_sfs_dict):
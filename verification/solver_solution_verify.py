@@ -23,33 +23,75 @@ def generate_dict_with_instructions(theta_sequence, pushed_values):
     return json_dict
 
 
-# Generates a dict containing info to transform into a json
-def generate_solution_dict(solver_output):
-    pushed_values_decimal = {}
-    theta_sol = {}
-    pattern1 = re.compile("t_([0-9]*) ([0-9]*)")
-    pattern2 = re.compile("a_([0-9]*) ([-]*[0-9]*)")
+# Answers to the check-sat command: sat, unsat, unknown or optimal (barcelogic)
+solver_statuses = ["sat", "unsat", "unknown", "optimal"]
+
+# Value of a variable t_j (theta value of the instruction at position j) or a_j (value pushed at position j)
+value_pattern = re.compile(r"\b([ta])_([0-9]+) (-?[0-9]+)")
+
+# Value of an objective given by (get-objectives), e.g. (gas 12)
+objective_pattern = re.compile(r"\(([^ ()]+) (-?[0-9]+)\)")
+
+
+# Answer given by a solver for the encoding of a sub block: the answer to check-sat ("error" if there is none, for
+# instance if the solver has been stopped or has failed), the value of each objective and, for each position of
+# the sequence, the theta value of the instruction (t_j) and the pushed value (a_j). The output of the solver does
+# not tell whether the solution is optimal, as it answers sat once the timeout is reached, so optimal is set by
+# whoever runs the solver (see set_optimality).
+class SolverResult:
+
+    def __init__(self, status="error", objectives=None, theta=None, pushed_values=None):
+        self.status = status
+        self.objectives = objectives if objectives is not None else {}
+        self.theta = theta if theta is not None else {}
+        self.pushed_values = pushed_values if pushed_values is not None else {}
+        self.optimal = False
+
+    # Sat for OMS, Z3 and optimal for barcelogic
+    def is_correct(self):
+        return self.status in ["sat", "optimal"]
+
+
+# The solver only answers before the timeout once it has proven the solution is optimal
+def set_optimality(solver_result, solve_time, tout):
+    solver_result.optimal = solver_result.status == "optimal" or (solver_result.is_correct() and solve_time < tout)
+    return solver_result
+
+
+# Reads the raw output of a solver in a single pass, so that it is parsed only once for all the information needed
+def parse_solver_output(solver_output):
+    result = SolverResult()
 
     for line in solver_output.splitlines():
-        for match in re.finditer(pattern1, line):
-            instruction_position = int(match.group(1))
-            instruction_theta = match.group(2)
-            theta_sol[instruction_position] = int(instruction_theta)
-
-        for match in re.finditer(pattern2, line):
-            instruction_position = int(match.group(1))
-            pushed_value = match.group(2)
-            pushed_values_decimal[instruction_position] = pushed_value
-    return generate_dict_with_instructions(theta_sol, pushed_values_decimal)
-
-
-def check_solver_output_is_correct(solver_output):
-    # Sat for OMS, Z3 and optimal for barcelogic.
-    pattern1 = re.compile("sat|optimal")
-    pattern2 = re.compile("unsat")
-    for line in solver_output.splitlines():
-        for _ in re.finditer(pattern2, line):
-            return False
-        for _ in re.finditer(pattern1, line):
-            return True
-    return False
+        line = line.strip()
+        if line in solver_statuses:
+            if result.status == "error":
+                result.status = line
+            continue
+
+        found_value = False
+        for match in value_pattern.finditer(line):
+            values = result.theta if match.group(1) == "t" else result.pushed_values
+            values[int(match.group(2))] = int(match.group(3))
+            found_value = True
+
+        if not found_value:
+            match = objective_pattern.fullmatch(line)
+            if match is not None:
+                result.objectives[match.group(1)] = int(match.group(2))
+
+    return result
+
+
+# Generates a dict containing info to transform into a json from the result of the solver
+def generate_solution_dict(solver_result):
+    return generate_dict_with_instructions(solver_result.theta, solver_result.pushed_values)
+
+
+def check_solver_output_is_correct(solver_result):
+    return solver_result.is_correct()
+
+
+# Returns the answer given by the solver to the check-sat command (see SolverResult).
+def get_solver_status(solver_output):
+    return parse_solver_output(solver_output).status